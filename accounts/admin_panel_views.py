@@ -5,6 +5,7 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.dateparse import parse_date
 
+from booking.db_router import replica_reads
 from bookings.models import Booking
 from rooms.models import Room
 
@@ -23,6 +24,7 @@ def admin_required(view_func):
     return _wrapped
 
 
+@replica_reads
 @admin_required
 def panel_dashboard_view(request):
     context = {
@@ -33,6 +35,7 @@ def panel_dashboard_view(request):
     return render(request, "accounts/admin_panel/dashboard.html", context)
 
 
+@replica_reads
 @admin_required
 def panel_rooms_view(request):
     rooms = Room.objects.select_related("hotel", "room_type").order_by("-created_at")
@@ -67,6 +70,7 @@ def panel_room_delete_view(request, room_id: int):
     return redirect("panel_rooms")
 
 
+@replica_reads
 @admin_required
 def panel_bookings_view(request):
     created_date = (request.GET.get("created_date") or "").strip()
@@ -118,6 +122,7 @@ def panel_booking_delete_view(request, booking_id: int):
     return redirect("panel_bookings")
 
 
+@replica_reads
 @admin_required
 def panel_accounts_view(request):
     account_type_filter = (request.GET.get("account_type") or "all").strip().lower()
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from accounts.search import rebuild_hotel_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the hotel name/location search index from hotel profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias whose index to rebuild.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        indexed = rebuild_hotel_index(using=options["database"])
+        if indexed is None:
+            raise CommandError(f"Database '{options['database']}' has no hotel search index.")
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"Indexed {indexed} hotels in {elapsed:.2f}s.")
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.search import search_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show room search cache hit/miss counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zero the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = search_cache_stats(reset=options["reset"])
+        self.stdout.write(
+            f"Search cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_ratio']:.1%} hit ratio, TTL {settings.ROOM_SEARCH_CACHE_TIMEOUT}s)."
+        )
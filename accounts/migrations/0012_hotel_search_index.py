@@ -0,0 +1,42 @@
+from django.db import migrations
+
+HOTEL_SEARCH_TABLE = "accounts_hotel_search"
+
+
+def build_hotel_search_index(apps, schema_editor):
+    # The table is SQLite-only; other backends search Profile directly.
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    profile_model = apps.get_model("accounts", "Profile")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {HOTEL_SEARCH_TABLE} USING fts5("
+            "full_name, location, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        cursor.executemany(
+            f"INSERT INTO {HOTEL_SEARCH_TABLE} (rowid, full_name, location) VALUES (%s, %s, %s)",
+            list(
+                profile_model.objects.filter(account_type="hotel").values_list(
+                    "id", "full_name", "location"
+                )
+            ),
+        )
+
+
+def drop_hotel_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {HOTEL_SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0011_profile_hotel_license_image"),
+    ]
+
+    operations = [
+        migrations.RunPython(build_hotel_search_index, reverse_code=drop_hotel_search_index),
+    ]
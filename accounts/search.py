@@ -0,0 +1,284 @@
+"""Hotel name/location text index and result cache used by room search.
+
+On SQLite the index is an FTS5 table keyed by profile id, so a search
+matches hotels by token and prefix, and ranks them, in the room query itself
+without scanning profiles.
+Other backends fall back to ``icontains`` lookups on ``Profile``.
+
+Each cached page carries the versions of the tags it depends on:
+``hotel:<id>`` for each hotel on the page, ``text`` for text searches,
+``ratings`` for pages ordered by rating, and a coarse bucket for the rooms
+that could join, leave or move across the page: ``nights:<monday>`` for
+each week of a dated stay, or ``open`` for undated searches. Taking rooms
+only bumps that hotel's tag unless a night sells out; any change to which
+rooms are listed on which nights bumps those nights' buckets.
+
+A version is a fresh random value, never a counter, so a tag evicted from
+the cache cannot come back with a version an old entry recorded; an entry
+whose tag is missing is a miss.
+"""
+import datetime
+import hashlib
+import json
+import re
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Profile
+
+HOTEL_SEARCH_TABLE = "accounts_hotel_search"
+INDEXED_FIELDS = {"full_name", "location", "account_type"}
+
+_search_tables: dict[str, bool] = {}
+
+
+def hotel_search_enabled(using: str) -> bool:
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    # Only a positive answer is cached, so the index is picked up once migrated.
+    if not _search_tables.get(using):
+        _search_tables[using] = HOTEL_SEARCH_TABLE in connection.introspection.table_names()
+    return _search_tables[using]
+
+
+def index_hotel(profile: Profile, *, using: str | None = None) -> bool:
+    """Re-index ``profile``; return whether it is, or just stopped being, a listed hotel."""
+    is_hotel = profile.account_type == Profile.AccountType.HOTEL
+    using = using or router.db_for_write(Profile, instance=profile)
+    if not hotel_search_enabled(using):
+        return is_hotel
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {HOTEL_SEARCH_TABLE} WHERE rowid = %s", [profile.pk])
+        was_hotel = cursor.rowcount > 0
+        if is_hotel:
+            cursor.execute(
+                f"INSERT INTO {HOTEL_SEARCH_TABLE} (rowid, full_name, location) VALUES (%s, %s, %s)",
+                [profile.pk, profile.full_name, profile.location],
+            )
+    return is_hotel or was_hotel
+
+
+def unindex_hotel(profile_id: int, *, using: str):
+    if not hotel_search_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {HOTEL_SEARCH_TABLE} WHERE rowid = %s", [profile_id])
+
+
+def rebuild_hotel_index(*, using: str | None = None) -> int | None:
+    """Re-index every hotel from ``Profile``; return how many, or ``None`` without an index.
+
+    Profile writes that skip ``save()`` (``QuerySet.update()``, raw SQL, a
+    restored dump) leave the index stale until this runs.
+    """
+    using = using or router.db_for_write(Profile)
+    if not hotel_search_enabled(using):
+        return None
+    hotels = list(
+        Profile.objects.using(using)
+        .filter(account_type=Profile.AccountType.HOTEL)
+        .values_list("id", "full_name", "location")
+    )
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {HOTEL_SEARCH_TABLE}")
+        cursor.executemany(
+            f"INSERT INTO {HOTEL_SEARCH_TABLE} (rowid, full_name, location) VALUES (%s, %s, %s)",
+            hotels,
+        )
+    # Only text searches read the index.
+    invalidate_hotel_searches([], text_changed=True)
+    return len(hotels)
+
+
+def search_terms(value: str) -> list[str]:
+    return re.findall(r"\w+", value.lower())
+
+
+def match_expression(terms: list[str], column: str | None = None) -> str:
+    # Every term must match, each as a quoted token prefix.
+    expression = " AND ".join(f'"{term}"*' for term in terms)
+    if column:
+        return f"{column} : ({expression})"
+    return expression
+
+
+class HotelTextScore(Func):
+    """A hotel's FTS5 ``bm25`` rank for ``match`` over the best match's, in ``(0, 1]``.
+
+    The rank is looked up by rowid for each row and the best rank is an
+    uncorrelated subquery run once, so the SQL stays the same size however
+    many hotels match.
+    """
+
+    output_field = FloatField()
+
+    def __init__(self, hotel, match: str):
+        super().__init__(hotel, Value(match), Value(match))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        hotel_sql, hotel_params = compiler.compile(self.source_expressions[0])
+        match_sql, match_params = compiler.compile(self.source_expressions[1])
+        best_sql, best_params = compiler.compile(self.source_expressions[2])
+        ranks = f"SELECT bm25({HOTEL_SEARCH_TABLE}) FROM {HOTEL_SEARCH_TABLE} WHERE {HOTEL_SEARCH_TABLE} MATCH"
+        # bm25 is negative, lower meaning a better match.
+        sql = (
+            f"(({ranks} {match_sql} AND rowid = {hotel_sql}) / "
+            f"({ranks} {best_sql} ORDER BY bm25({HOTEL_SEARCH_TABLE}) LIMIT 1))"
+        )
+        return sql, (*match_params, *hotel_params, *best_params)
+
+
+def hotel_text_search(
+    *, text: str = "", hotel_name: str = "", hotel_field: str = "hotel_id", using: str | None = None
+):
+    """Return ``(hotel_ids, score)`` for hotels matching ``text`` (name or location) and ``hotel_name``.
+
+    ``hotel_ids`` is a subquery of the matching hotel ids to filter
+    ``hotel_field`` on, and ``score`` an expression scoring that field's
+    hotel in ``(0, 1]``, best match first; the ``icontains`` fallback scores
+    every match 1. Returns ``None`` when neither value has a searchable term.
+    """
+    text_terms = search_terms(text)
+    name_terms = search_terms(hotel_name)
+    if not text_terms and not name_terms:
+        return None
+
+    using = using or router.db_for_read(Profile)
+    if hotel_search_enabled(using):
+        expressions = []
+        if text_terms:
+            expressions.append(f"({match_expression(text_terms)})")
+        if name_terms:
+            expressions.append(f"({match_expression(name_terms, 'full_name')})")
+        match = " AND ".join(expressions)
+        hotel_ids = RawSQL(f"SELECT rowid FROM {HOTEL_SEARCH_TABLE} WHERE {HOTEL_SEARCH_TABLE} MATCH %s", [match])
+        return hotel_ids, HotelTextScore(F(hotel_field), match)
+
+    hotels = Profile.objects.using(using).filter(account_type=Profile.AccountType.HOTEL)
+    for term in text_terms:
+        hotels = hotels.filter(Q(location__icontains=term) | Q(full_name__icontains=term))
+    for term in name_terms:
+        hotels = hotels.filter(full_name__icontains=term)
+    return hotels.values("id"), Value(1.0, output_field=FloatField())
+
+
+SEARCH_CACHE_PREFIX = "accounts:room-search"
+OPEN_ROOMS_TAG = "open"
+TEXT_TAG = "text"
+RATINGS_TAG = "ratings"
+
+
+def search_cache_key(**params) -> str:
+    normalized = json.dumps(params, sort_keys=True, default=str)
+    return f"{SEARCH_CACHE_PREFIX}:result:{hashlib.sha1(normalized.encode()).hexdigest()}"
+
+
+def night_tags(nights) -> set[str]:
+    """Bucket ``nights`` by week, so a long stay records a handful of tags."""
+    return {f"nights:{night - datetime.timedelta(days=night.weekday())}" for night in nights}
+
+
+def search_tags(hotel_ids, *, text: bool, nights=None, rating_order: bool = False) -> list[str]:
+    tags = {f"hotel:{hotel_id}" for hotel_id in hotel_ids}
+    tags |= night_tags(nights) if nights else {OPEN_ROOMS_TAG}
+    if text:
+        tags.add(TEXT_TAG)
+    if rating_order:
+        tags.add(RATINGS_TAG)
+    return sorted(tags)
+
+
+def _tag_key(tag: str) -> str:
+    return f"{SEARCH_CACHE_PREFIX}:tag:{tag}"
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex
+
+
+def _count(name: str):
+    key = f"{SEARCH_CACHE_PREFIX}:stats:{name}"
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_cached_search(key: str):
+    """Return the cached result for ``key`` unless one of its tags has moved on or is gone."""
+    entry = cache.get(key)
+    if entry is not None:
+        versions = cache.get_many([_tag_key(tag) for tag in entry["tags"]])
+        if all(versions.get(_tag_key(tag)) == version for tag, version in entry["tags"].items()):
+            _count("hits")
+            return entry["result"]
+    _count("misses")
+    return None
+
+
+def cache_search(key: str, result, *, hotel_ids, text: bool, nights=None, rating_order: bool = False):
+    """Cache ``result``, a page listing rooms of ``hotel_ids`` free on ``nights``."""
+    tags = search_tags(hotel_ids, text=text, nights=nights, rating_order=rating_order)
+    tag_keys = {tag: _tag_key(tag) for tag in tags}
+    for tag_key in tag_keys.values():
+        cache.add(tag_key, _new_version(), None)
+    versions = cache.get_many(list(tag_keys.values()))
+    if len(versions) != len(tag_keys):
+        # A tag was evicted in between; its version is unknown, so skip caching.
+        return
+    cache.set(
+        key,
+        {
+            "tags": {tag: versions[tag_key] for tag, tag_key in tag_keys.items()},
+            "result": result,
+        },
+        settings.ROOM_SEARCH_CACHE_TIMEOUT,
+    )
+
+
+def _bump(tag_keys: list[str]):
+    cache.set_many({tag_key: _new_version() for tag_key in tag_keys}, None)
+
+
+def invalidate_hotel_searches(
+    hotel_ids, *, text_changed: bool = False, changed_nights=None, ratings_changed: bool = False
+):
+    """Drop cached searches that list rooms of ``hotel_ids``.
+
+    Pass ``changed_nights`` when rooms were opened, closed, re-priced or
+    removed on those nights, so pages listing other hotels' rooms that may
+    now shift are dropped as well; ``ratings_changed`` does the same for
+    pages ordered by rating.
+    """
+    tags = [f"hotel:{hotel_id}" for hotel_id in set(hotel_ids) if hotel_id]
+    if changed_nights is not None:
+        tags += [OPEN_ROOMS_TAG, *night_tags(changed_nights)]
+    if text_changed:
+        tags.append(TEXT_TAG)
+    if ratings_changed:
+        tags.append(RATINGS_TAG)
+    if not tags:
+        return
+    tag_keys = [_tag_key(tag) for tag in tags]
+    # Bump now and again on commit, so results cached from pre-commit data
+    # by another request do not survive the write.
+    _bump(tag_keys)
+    transaction.on_commit(lambda: _bump(tag_keys))
+
+
+def search_cache_stats(*, reset: bool = False) -> dict:
+    keys = {name: f"{SEARCH_CACHE_PREFIX}:stats:{name}" for name in ("hits", "misses")}
+    values = cache.get_many(list(keys.values()))
+    stats = {name: values.get(key, 0) for name, key in keys.items()}
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+    if reset:
+        cache.delete_many(list(keys.values()))
+    return stats
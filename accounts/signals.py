@@ -1,7 +1,8 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 
 from .models import Profile
+from .search import INDEXED_FIELDS, index_hotel, invalidate_hotel_searches, unindex_hotel
 
 
 def ensure_profile_exists(sender, instance, created, **kwargs):
@@ -15,6 +16,21 @@ def ensure_profile_exists(sender, instance, created, **kwargs):
         )
 
 
+def sync_hotel_search(sender, instance, update_fields=None, using=None, **kwargs):
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    if index_hotel(instance, using=using):
+        invalidate_hotel_searches([instance.pk], text_changed=True)
+
+
+def remove_hotel_search(sender, instance, using=None, **kwargs):
+    unindex_hotel(instance.pk, using=using)
+    if instance.account_type == Profile.AccountType.HOTEL:
+        invalidate_hotel_searches([instance.pk], text_changed=True)
+
+
 def connect_signals():
     user_model = get_user_model()
     post_save.connect(ensure_profile_exists, sender=user_model)
+    post_save.connect(sync_hotel_search, sender=Profile)
+    post_delete.connect(remove_hotel_search, sender=Profile)
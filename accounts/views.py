@@ -1,28 +1,42 @@
 import datetime
 
+from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model, login, logout
 from django.contrib.auth.decorators import login_required
-from django.db.models import Avg, Count, Max, Q
+from django.core.paginator import Page, Paginator
+from django.db import DEFAULT_DB_ALIAS, router
+from django.db.models import Count, F, FloatField, Max, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.shortcuts import redirect, render
 from django.urls import reverse
 
+from booking.db_router import replica_reads
 from bookings.forms import BookingReviewForm
-from bookings.models import Booking, BookingNotification, BookingReview
+from bookings.models import Booking, BookingNotification, BookingReview, HotelRatingSummary
 
 from .forms import LoginForm, ProfileImageForm, ProfileUpdateForm, SignupForm
 from .models import Profile, ProfileFacilityImage
+from .search import cache_search, get_cached_search, hotel_text_search, search_cache_key, search_terms
 from rooms.forms import RoomCreateForm
-from rooms.models import Room
+from rooms.models import Room, RoomNight
+
+SEARCH_RECENT_REVIEWS_PER_HOTEL = 2
+SEARCH_SORTS = ("price", "rating", "relevance")
+# Relevance blends the text score with the hotel's rating, both in [0, 1].
+SEARCH_RELEVANCE_TEXT_WEIGHT = 0.7
 
 
 def get_or_create_profile(user):
-    return Profile.objects.get_or_create(
+    profile, created = Profile.objects.get_or_create(
         user=user,
         defaults={
             "full_name": user.get_full_name() or user.username,
             "account_type": Profile.AccountType.GUEST,
         },
     )
+    # The notification menu reads ``user.profile``; reuse this row for it.
+    user.profile = profile
+    return profile, created
 
 
 def get_home_redirect(account_type):
@@ -107,6 +121,66 @@ def hotel_signup_pending_view(request):
     return render(request, "accounts/hotel_signup_pending.html")
 
 
+def hotel_cards(hotel_ids) -> tuple[dict, dict]:
+    """Return per-hotel rating card data and the recent reviews it refers to."""
+    if not hotel_ids:
+        return {}, {}
+    cards = {
+        hotel_id: {"avg_rating": None, "review_count": 0, "recent_review_ids": []}
+        for hotel_id in hotel_ids
+    }
+    for summary in HotelRatingSummary.objects.filter(hotel_id__in=hotel_ids):
+        cards[summary.hotel_id].update(
+            avg_rating=summary.avg_rating,
+            review_count=summary.review_count,
+        )
+    reviews_by_id = {}
+    for review in BookingReview.objects.recent_per_hotel(
+        hotel_ids,
+        limit=SEARCH_RECENT_REVIEWS_PER_HOTEL,
+    ):
+        cards[review.booking.room.hotel_id]["recent_review_ids"].append(review.id)
+        reviews_by_id[review.id] = review
+    return cards, reviews_by_id
+
+
+def attach_hotel_cards(rooms, cards: dict, reviews_by_id: dict | None = None):
+    if reviews_by_id is None:
+        review_ids = [review_id for card in cards.values() for review_id in card["recent_review_ids"]]
+        reviews_by_id = (
+            BookingReview.objects.select_related("booking", "booking__guest", "booking__room").in_bulk(review_ids)
+            if review_ids
+            else {}
+        )
+    for room in rooms:
+        card = cards.get(room.hotel_id) or {"avg_rating": None, "review_count": 0, "recent_review_ids": []}
+        room.hotel_avg_rating = card["avg_rating"]
+        room.hotel_review_count = card["review_count"]
+        room.hotel_recent_reviews = [
+            reviews_by_id[review_id] for review_id in card["recent_review_ids"] if review_id in reviews_by_id
+        ]
+
+
+def ordered_rooms(query, sort: str, text_score=None):
+    """Order ``query`` by ``sort`` in SQL, ties broken by price and id."""
+    query = query.annotate(
+        hotel_rating=Cast("hotel__rating_summary__rating_sum", FloatField())
+        / NullIf("hotel__rating_summary__review_count", 0)
+    )
+    if sort == "rating":
+        return query.order_by(F("hotel_rating").desc(nulls_last=True), "rate_per_night", "id")
+    if sort == "relevance":
+        if text_score is None:
+            text_score = Value(1.0)
+        rating_score = Coalesce("hotel_rating", Value(0.0)) / 5
+        query = query.annotate(
+            relevance=SEARCH_RELEVANCE_TEXT_WEIGHT * text_score + (1 - SEARCH_RELEVANCE_TEXT_WEIGHT) * rating_score
+        )
+        return query.order_by(F("relevance").desc(), "rate_per_night", "id")
+    return query.order_by("rate_per_night", "id")
+
+
+@replica_reads
 @login_required
 def home_view(request):
     profile, _ = get_or_create_profile(request.user)
@@ -117,6 +191,13 @@ def home_view(request):
         "checkout": request.GET.get("checkout", "").strip(),
         "guests": request.GET.get("guests", "").strip(),
     }
+    sort = request.GET.get("sort", "")
+    if sort not in SEARCH_SORTS:
+        sort = "relevance" if search_params["location"] or search_params["hotel_name"] else "price"
+    try:
+        per_page = min(max(1, int(request.GET.get("per_page", ""))), settings.ROOM_SEARCH_MAX_PAGE_SIZE)
+    except ValueError:
+        per_page = settings.ROOM_SEARCH_PAGE_SIZE
 
     def parse_date(value):
         if not value:
@@ -128,6 +209,7 @@ def home_view(request):
 
     search_performed = any(search_params.values())
     rooms = []
+    page = None
     search_error = None
 
     if search_performed:
@@ -143,79 +225,99 @@ def home_view(request):
         if checkin_date and checkout_date and checkout_date < checkin_date:
             search_error = "Checkout date must be on or after check-in date."
         else:
-            query = (
-                Room.objects.select_related("room_type", "hotel")
-                .prefetch_related("hotel__facility_images")
-                .filter(available_rooms__gt=0)
-                .filter(hotel__account_type=Profile.AccountType.HOTEL)
+            # Each page is cached with its total and its hotels' rating cards,
+            # tagged with the hotels on it; other hotels shifting rooms across
+            # the page bump the coarse night, open-room and rating buckets.
+            search_key = search_cache_key(
+                text=sorted(set(search_terms(search_params["location"]))),
+                hotel_name=sorted(set(search_terms(search_params["hotel_name"]))),
+                checkin=checkin_date,
+                checkout=checkout_date,
+                guests=guests_value,
+                sort=sort,
+                page=request.GET.get("page") or "1",
+                per_page=per_page,
             )
-            if search_params["location"]:
-                query = query.filter(
-                    Q(hotel__location__icontains=search_params["location"])
-                    | Q(hotel__full_name__icontains=search_params["location"])
+            result = get_cached_search(search_key)
+            reviews_by_id = None
+            if result is None:
+                query = Room.objects.filter(hotel__account_type=Profile.AccountType.HOTEL)
+                text_search = hotel_text_search(
+                    text=search_params["location"],
+                    hotel_name=search_params["hotel_name"],
                 )
-            if search_params["hotel_name"]:
-                query = query.filter(hotel__full_name__icontains=search_params["hotel_name"])
-            if guests_value:
-                query = query.filter(capacity__gte=guests_value)
-            if checkin_date:
-                query = query.filter(checkin_date__lte=checkin_date)
-            if checkout_date:
-                query = query.filter(checkout_date__gte=checkout_date)
-
-            rooms = list(query.order_by("rate_per_night", "hotel__full_name"))
-
-            if rooms:
-                hotel_ids = {room.hotel_id for room in rooms}
-                review_stats_qs = (
-                    BookingReview.objects.filter(
-                        booking__room__hotel_id__in=hotel_ids,
-                        booking__status__in=[Booking.Status.CONFIRMED, Booking.Status.COMPLETED],
+                text_score = None
+                if text_search is not None:
+                    matching_hotel_ids, text_score = text_search
+                    query = query.filter(hotel_id__in=matching_hotel_ids)
+                if guests_value:
+                    query = query.filter(capacity__gte=guests_value)
+                stay_nights = None
+                if checkin_date or checkout_date:
+                    stay_nights = Room.night_dates(
+                        checkin_date or checkout_date - datetime.timedelta(days=1),
+                        checkout_date or checkin_date,
                     )
-                    .values("booking__room__hotel_id")
-                    .annotate(avg_rating=Avg("rating"), review_count=Count("id"))
-                )
-                rating_stats_by_hotel = {
-                    row["booking__room__hotel_id"]: row
-                    for row in review_stats_qs
-                }
-
-                reviews_qs = (
-                    BookingReview.objects.select_related("booking", "booking__guest")
-                    .filter(
-                        booking__room__hotel_id__in=hotel_ids,
-                        booking__status__in=[Booking.Status.CONFIRMED, Booking.Status.COMPLETED],
+                    bookable_room_ids = (
+                        RoomNight.objects.filter(
+                            night__range=(stay_nights[0], stay_nights[-1]),
+                            available_rooms__gt=0,
+                        )
+                        .order_by()
+                        .values("room_id")
+                        .annotate(free_nights=Count("id"))
+                        .filter(free_nights=len(stay_nights))
+                        .values("room_id")
                     )
-                    .order_by("-created_at")
+                    query = query.filter(id__in=bookable_room_ids)
+                else:
+                    query = query.filter(available_rooms__gt=0)
+
+                paginator = Paginator(range(query.order_by().count()), per_page)
+                number = paginator.get_page(request.GET.get("page")).number
+                offset = (number - 1) * per_page
+                page_rows = list(
+                    ordered_rooms(query, sort, text_score).values_list("id", "hotel_id")[offset : offset + per_page]
                 )
-                recent_reviews_by_hotel: dict[int, list[BookingReview]] = {
-                    hotel_id: [] for hotel_id in hotel_ids
+                cards, reviews_by_id = hotel_cards({hotel_id for _, hotel_id in page_rows})
+                result = {
+                    "number": number,
+                    "count": paginator.count,
+                    "room_ids": [room_id for room_id, _ in page_rows],
+                    "cards": cards,
                 }
-                for review in reviews_qs:
-                    hotel_id = review.booking.room.hotel_id
-                    if len(recent_reviews_by_hotel[hotel_id]) < 2:
-                        recent_reviews_by_hotel[hotel_id].append(review)
-
-                for room in rooms:
-                    stats = rating_stats_by_hotel.get(room.hotel_id)
-                    room.hotel_avg_rating = (
-                        round(float(stats["avg_rating"]), 1)
-                        if stats and stats["avg_rating"] is not None
-                        else None
-                    )
-                    room.hotel_review_count = (
-                        int(stats["review_count"])
-                        if stats and stats["review_count"] is not None
-                        else 0
+                # A page read from a lagging replica would also be served to
+                # sessions pinned to the primary, so only primary reads are cached.
+                if router.db_for_read(Room) == DEFAULT_DB_ALIAS:
+                    cache_search(
+                        search_key,
+                        result,
+                        hotel_ids=cards,
+                        text=text_search is not None,
+                        nights=stay_nights,
+                        rating_order=sort != "price",
                     )
-                    room.hotel_recent_reviews = recent_reviews_by_hotel.get(room.hotel_id, [])
 
+            rooms_by_id = (
+                Room.objects.select_related("room_type", "hotel")
+                .prefetch_related("hotel__facility_images")
+                .in_bulk(result["room_ids"])
+            )
+            rooms = [rooms_by_id[room_id] for room_id in result["room_ids"] if room_id in rooms_by_id]
+            attach_hotel_cards(rooms, result["cards"], reviews_by_id)
+            page = Page(rooms, result["number"], Paginator(range(result["count"]), per_page))
+
+    page_query = request.GET.copy()
+    page_query.pop("page", None)
     return render(
         request,
         "accounts/guest_home.html",
         {
             "profile": profile,
             "rooms": rooms,
+            "page": page,
+            "page_query": page_query.urlencode(),
+            "search_sort": sort,
             "search_params": search_params,
             "search_performed": search_performed,
             "search_error": search_error,
@@ -223,6 +325,7 @@ def home_view(request):
     )
 
 
+@replica_reads
 @login_required
 def guest_hotel_profile_view(request, hotel_id: int):
     profile, _ = get_or_create_profile(request.user)
@@ -239,7 +342,7 @@ def guest_hotel_profile_view(request, hotel_id: int):
     listed_rooms = (
         Room.objects.filter(hotel=hotel, available_rooms__gt=0)
         .select_related("room_type")
-        .order_by("rate_per_night", "room_type__name")
+        .order_by("rate_per_night", "id")
     )
 
     eligible_booking = (
@@ -258,7 +361,7 @@ def guest_hotel_profile_view(request, hotel_id: int):
             booking__guest=profile,
             booking__room__hotel=hotel,
         )
-        .select_related("booking")
+        .select_related("booking__room")
         .first()
     )
 
@@ -288,8 +391,7 @@ def guest_hotel_profile_view(request, hotel_id: int):
         )
         .order_by("-created_at")
     )
-    review_stats = reviews.aggregate(avg_rating=Avg("rating"), review_count=Count("id"))
-    avg_rating = review_stats["avg_rating"]
+    rating_summary = HotelRatingSummary.for_hotel(hotel.id)
 
     return render(
         request,
@@ -300,8 +402,8 @@ def guest_hotel_profile_view(request, hotel_id: int):
             "facility_images": hotel.facility_images.all(),
             "listed_rooms": listed_rooms,
             "reviews": reviews,
-            "avg_rating": round(float(avg_rating), 1) if avg_rating is not None else None,
-            "review_count": int(review_stats["review_count"] or 0),
+            "avg_rating": rating_summary.avg_rating,
+            "review_count": rating_summary.review_count,
             "review_form": review_form,
             "can_submit_review": can_submit_review,
             "existing_review": existing_review,
@@ -369,16 +471,9 @@ def hotel_profile_view(request):
         BookingNotification.objects.filter(
             id=int(notification_id),
             recipient=profile,
-            is_read=False,
-        ).update(is_read=True)
+        ).mark_read()
 
-    review_stats = BookingReview.objects.filter(
-        booking__room__hotel=profile,
-        booking__status__in=[Booking.Status.CONFIRMED, Booking.Status.COMPLETED],
-    ).aggregate(avg_rating=Avg("rating"), review_count=Count("id"))
-
-    avg_rating = review_stats["avg_rating"]
-    review_count = int(review_stats["review_count"] or 0)
+    rating_summary = HotelRatingSummary.for_hotel(profile.id)
 
     facility_images = profile.facility_images.all()
     facility_limit = 6
@@ -391,8 +486,8 @@ def hotel_profile_view(request):
             "facility_images": facility_images,
             "facility_limit": facility_limit,
             "facility_remaining": facility_remaining,
-            "avg_rating": round(float(avg_rating), 1) if avg_rating is not None else None,
-            "review_count": review_count,
+            "avg_rating": rating_summary.avg_rating,
+            "review_count": rating_summary.review_count,
         },
     )
 
@@ -410,8 +505,7 @@ def hotel_reviews_view(request):
         BookingNotification.objects.filter(
             id=int(notification_id),
             recipient=profile,
-            is_read=False,
-        ).update(is_read=True)
+        ).mark_read()
 
     rating_filter_param = (request.GET.get("rating") or "").strip()
     selected_rating = None
@@ -425,12 +519,8 @@ def hotel_reviews_view(request):
         booking__status__in=[Booking.Status.CONFIRMED, Booking.Status.COMPLETED],
     )
 
-    rating_counts_qs = (
-        base_reviews_qs.values("rating")
-        .annotate(total=Count("id"))
-        .order_by("-rating")
-    )
-    rating_counts = {row["rating"]: row["total"] for row in rating_counts_qs}
+    rating_summary = HotelRatingSummary.for_hotel(profile.id)
+    rating_counts = rating_summary.rating_counts
     rating_filters = [
         {
             "value": rating,
@@ -455,18 +545,14 @@ def hotel_reviews_view(request):
         .order_by("-updated_at")
     )
 
-    review_stats = base_reviews_qs.aggregate(avg_rating=Avg("rating"), review_count=Count("id"))
-
-    avg_rating = review_stats["avg_rating"]
-
     return render(
         request,
         "accounts/hotel_reviews.html",
         {
             "profile": profile,
             "reviews": reviews,
-            "avg_rating": round(float(avg_rating), 1) if avg_rating is not None else None,
-            "review_count": int(review_stats["review_count"] or 0),
+            "avg_rating": rating_summary.avg_rating,
+            "review_count": rating_summary.review_count,
             "selected_rating": selected_rating,
             "rating_filters": rating_filters,
         },
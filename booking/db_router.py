@@ -0,0 +1,93 @@
+"""Read replica routing.
+
+Views decorated with ``replica_reads`` serve their GET and HEAD reads from
+the ``REPLICA_DATABASE_ALIAS`` connection when ``REPLICA_READS_ENABLED`` is on.
+Everything else stays on ``default``: writes, reads inside a transaction
+(so a view reads back its own writes), sessions and users, and every
+request from a session that wrote in the last ``REPLICA_PIN_SECONDS``.
+``PrimaryPinningMiddleware`` sets that pin after each unsafe request, so
+replication lag never hides a user's own booking, cancellation or edit.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_SESSION_KEY = "_primary_pinned_until"
+# Sessions and users decide who is logged in; a lagging copy would log users out.
+PRIMARY_ONLY_APPS = frozenset({"auth", "sessions"})
+SAFE_METHODS = ("GET", "HEAD")
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_available() -> bool:
+    return settings.REPLICA_READS_ENABLED and settings.REPLICA_DATABASE_ALIAS in settings.DATABASES
+
+
+def pinned_to_primary(request) -> bool:
+    session = getattr(request, "session", None)
+    return session is not None and session.get(PIN_SESSION_KEY, 0) > time.time()
+
+
+def pin_to_primary(request):
+    request.session[PIN_SESSION_KEY] = time.time() + settings.REPLICA_PIN_SECONDS
+
+
+def replica_reads(view_func):
+    """Serve ``view_func``'s reads from the replica, unless the request must see its own writes."""
+
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or not replica_available() or pinned_to_primary(request):
+            return view_func(request, *args, **kwargs)
+        token = _replica_reads.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    return _wrapped
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return settings.REPLICA_DATABASE_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, schema included.
+        return db != settings.REPLICA_DATABASE_ALIAS
+
+
+class PrimaryPinningMiddleware:
+    """Pin a session to the primary for ``REPLICA_PIN_SECONDS`` after each unsafe request.
+
+    Must come after ``SessionMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 500
+            and replica_available()
+            and hasattr(request, "session")
+        ):
+            pin_to_primary(request)
+        return response
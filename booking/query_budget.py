@@ -0,0 +1,115 @@
+"""Per-request SQL recording, N+1 detection and per-view query budgets.
+
+``QueryBudgetMiddleware`` records every statement a request runs, groups
+them by shape (literals and ``IN`` lists collapsed) and reports shapes that
+repeat ``QUERY_BUDGET_REPEAT_THRESHOLD`` times or more, the signature of a
+lazy load inside a loop. Views named in ``QUERY_BUDGETS`` also get a ceiling
+on their total query count. Violations are logged, or raised as
+``QueryBudgetExceeded`` when ``QUERY_BUDGET_STRICT`` is on (as in tests).
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+# Transaction bookkeeping repeats by design and never indicates a lazy load.
+_IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT", "BEGIN", "COMMIT")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql: str) -> str:
+    """Reduce ``sql`` to its shape, so the same query with other values compares equal."""
+    shape = _STRING.sub("?", sql)
+    shape = shape.replace("%s", "?")
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+class QueryRecorder:
+    """Collect the statements run on every connection while the recorder is active."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def repeated_shapes(self, threshold: int) -> dict[str, int]:
+        shapes = Counter(
+            fingerprint(sql)
+            for sql in self.statements
+            if not sql.lstrip().upper().startswith(_IGNORED_PREFIXES)
+        )
+        return {shape: count for shape, count in shapes.items() if count >= threshold}
+
+
+def query_report(recorder: QueryRecorder, url_name: str | None) -> dict:
+    budget = settings.QUERY_BUDGETS.get(url_name) if url_name else None
+    return {
+        "url_name": url_name,
+        "count": len(recorder.statements),
+        "budget": budget,
+        "repeated": recorder.repeated_shapes(settings.QUERY_BUDGET_REPEAT_THRESHOLD),
+    }
+
+
+def budget_violations(report: dict) -> list[str]:
+    violations = []
+    if report["budget"] is not None and report["count"] > report["budget"]:
+        violations.append(f"{report['count']} queries exceed the budget of {report['budget']}")
+    for shape, count in report["repeated"].items():
+        violations.append(f"{count} queries share the shape: {shape}")
+    return violations
+
+
+class QueryBudgetMiddleware:
+    """Record each request's queries and flag budget overruns and repeated shapes.
+
+    The report is attached to the response as ``query_report``. Queries run
+    while a streaming response is consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_BUDGET_ENABLED:
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        report = query_report(recorder, match.view_name if match else None)
+        response.query_report = report
+
+        violations = budget_violations(report)
+        if violations:
+            message = f"{request.method} {request.path} ({report['url_name']}): " + "; ".join(violations)
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning("Query budget: %s", message)
+        return response
@@ -1,4 +1,5 @@
 """Django settings for booking project."""
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,11 +24,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "booking.query_budget.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "booking.db_router.PrimaryPinningMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -53,13 +56,77 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "booking.wsgi.application"
 
+# "production" runs SQLite in WAL mode with tuned pragmas and takes the write
+# lock up front in booking write paths; "default" keeps SQLite's stock
+# rollback journal (useful as a benchmark baseline).
+SQLITE_PROFILE = os.environ.get("BOOKING_SQLITE_PROFILE", "production")
+SQLITE_BUSY_TIMEOUT = 20  # seconds a connection waits for a lock before "database is locked"
+SQLITE_PRAGMAS = {
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -20000,  # KiB
+        "mmap_size": 128 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "default": {
+        "journal_mode": "DELETE",
+    },
+}
+SQLITE_IMMEDIATE_WRITES = SQLITE_PROFILE == "production"
+# Funnel booking mutations through one writer thread that commits them in
+# groups (bookings.writer). Off unless BOOKING_SINGLE_WRITER=1.
+BOOKING_SINGLE_WRITER = os.environ.get("BOOKING_SINGLE_WRITER") == "1"
+BOOKING_WRITER_MAX_BATCH = 32
+BOOKING_WRITER_MAX_WAIT = 0.002  # seconds the writer waits to fill a group
+BOOKING_WRITER_TIMEOUT = 30  # seconds a request waits for its mutation
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS[SQLITE_PROFILE].items()
+            ),
+            "timeout": SQLITE_BUSY_TIMEOUT,
+        },
     }
 }
 
+# Read replica (booking.db_router). Locally the replica is a second SQLite
+# file refreshed by `manage.py sync_replica`; set BOOKING_DB_REPLICA to its
+# path to route views marked @replica_reads to it. Tests mirror the primary.
+REPLICA_DATABASE_ALIAS = "replica"
+REPLICA_READS_ENABLED = bool(os.environ.get("BOOKING_DB_REPLICA"))
+REPLICA_PIN_SECONDS = 5  # how long a session reads from the primary after it writes
+DATABASES[REPLICA_DATABASE_ALIAS] = {
+    **DATABASES["default"],
+    "NAME": os.environ.get("BOOKING_DB_REPLICA") or BASE_DIR / "db-replica.sqlite3",
+    "TEST": {"MIRROR": "default"},
+}
+DATABASE_ROUTERS = ["booking.db_router.ReplicaRouter"]
+
+# Cached menus and searches are invalidated by whichever process writes
+# (web workers, sweep_bookings), so the cache must be shared between them.
+# BOOKING_REDIS_URL selects Redis (needs the redis package); otherwise a file
+# cache in BOOKING_CACHE_DIR serves every process on the host.
+if os.environ.get("BOOKING_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["BOOKING_REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("BOOKING_CACHE_DIR") or BASE_DIR / ".cache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -91,3 +158,40 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "no-reply@booking.local"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+BOOKING_HISTORY_PAGE_SIZE = 20
+ROOM_SEARCH_CACHE_TIMEOUT = 300
+ROOM_SEARCH_PAGE_SIZE = 12
+ROOM_SEARCH_MAX_PAGE_SIZE = 48
+BOOKING_NOTIFICATIONS_CACHE_TIMEOUT = 300
+
+# Server-sent notification stream (seconds unless noted).
+BOOKING_NOTIFICATION_STREAM_KEEPALIVE = 15
+BOOKING_NOTIFICATION_STREAM_MAX_AGE = 300
+# Under WSGI a request waits this long for a change before answering.
+BOOKING_NOTIFICATION_STREAM_LONG_POLL = 25
+BOOKING_NOTIFICATION_STREAM_RETRY_MS = 3000
+
+# Read notifications older than this are purged or archived by purge_notifications.
+BOOKING_NOTIFICATION_RETENTION_DAYS = 90
+
+# Per-request query recording (booking.query_budget). Budgets are keyed by URL name.
+QUERY_BUDGET_ENABLED = True
+QUERY_BUDGET_STRICT = False
+# The test runner turns QUERY_BUDGET_STRICT on for the whole suite.
+TEST_RUNNER = "booking.test_runner.StrictQueryBudgetRunner"
+QUERY_BUDGET_REPEAT_THRESHOLD = 3
+QUERY_BUDGETS = {
+    "home": 16,
+    # A review POST writes the review, the hotel's rating summary, its
+    # re-raised notification and the inbox counter in one transaction.
+    "guest_hotel_profile": 16,
+    "booking_checkout": 30,
+    "booking_history": 10,
+    "hotel_booking_history": 10,
+    "hotel_home": 12,
+    "hotel_reviews": 10,
+    "panel_bookings": 6,
+    "panel_rooms": 6,
+    "panel_accounts": 6,
+}
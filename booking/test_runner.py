@@ -0,0 +1,33 @@
+import shutil
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class StrictQueryBudgetRunner(DiscoverRunner):
+    """Run the suite with ``QUERY_BUDGET_STRICT`` on, so any budget overrun fails its test.
+
+    The suite also gets a file cache of its own in a temporary directory,
+    still shared with the commands tests run in subprocesses, so clearing
+    it never touches the app's cache.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_dir = tempfile.mkdtemp(prefix="booking-test-cache-")
+        self._test_settings = override_settings(
+            QUERY_BUDGET_STRICT=True,
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": self._cache_dir,
+                }
+            },
+        )
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._test_settings.disable()
+        shutil.rmtree(self._cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -1,6 +1,12 @@
 from django.contrib import admin
 
-from .models import Booking, BookingNotification
+from .models import (
+    ArchivedBookingNotification,
+    Booking,
+    BookingNotification,
+    HotelRatingSummary,
+    NotificationInbox,
+)
 
 
 @admin.register(Booking)
@@ -23,3 +29,22 @@ class BookingNotificationAdmin(admin.ModelAdmin):
     list_display = ("id", "recipient", "booking", "status", "is_read", "created_at")
     list_filter = ("status", "is_read")
     search_fields = ("message",)
+
+
+@admin.register(NotificationInbox)
+class NotificationInboxAdmin(admin.ModelAdmin):
+    list_display = ("recipient", "unread_count", "read_through_id", "last_notification_id")
+    readonly_fields = ("read_through_id", "last_notification_id", "unread_count")
+
+
+@admin.register(ArchivedBookingNotification)
+class ArchivedBookingNotificationAdmin(admin.ModelAdmin):
+    list_display = ("original_id", "recipient_id", "booking_id", "status", "created_at", "archived_at")
+    list_filter = ("status",)
+    search_fields = ("message",)
+
+
+@admin.register(HotelRatingSummary)
+class HotelRatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ("hotel", "review_count", "rating_sum", "rating_1", "rating_2", "rating_3", "rating_4", "rating_5")
+    readonly_fields = ("review_count", "rating_sum", "rating_1", "rating_2", "rating_3", "rating_4", "rating_5")
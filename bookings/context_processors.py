@@ -1,53 +1,27 @@
-from django.urls import reverse
-
-from accounts.models import Profile
+from django.utils.functional import SimpleLazyObject
 
 from .models import BookingNotification
 
 
-def booking_notifications(request):
-    user = getattr(request, "user", None)
+def notification_menu(user):
     if not user or not user.is_authenticated:
-        return {
-            "booking_notifications": [],
-            "booking_notifications_unread_count": 0,
-        }
+        return {"notifications": [], "unread_count": 0, "last_notification_id": 0}
 
     profile = getattr(user, "profile", None)
     if profile is None:
-        return {
-            "booking_notifications": [],
-            "booking_notifications_unread_count": 0,
-        }
+        return {"notifications": [], "unread_count": 0, "last_notification_id": 0}
 
-    notifications_qs = BookingNotification.objects.filter(
-        recipient=profile,
-        is_read=False,
-    ).select_related("booking")
-    history_url_name = (
-        "hotel_booking_history"
-        if profile.account_type == Profile.AccountType.HOTEL
-        else "booking_history"
-    )
-    notifications = list(notifications_qs[:8])
-    for notification in notifications:
-        if (
-            profile.account_type == Profile.AccountType.HOTEL
-            and notification.status
-            in {
-                BookingNotification.Type.REVIEW_ADDED,
-                BookingNotification.Type.REVIEW_UPDATED,
-            }
-        ):
-            notification.history_url = (
-                f"{reverse('hotel_reviews')}?notification={notification.id}"
-            )
-        else:
-            notification.history_url = (
-                f"{reverse(history_url_name)}?state=all&notification={notification.id}#booking-{notification.booking_id}"
-            )
+    menu = BookingNotification.unread_menu(profile.id)
+    for notification in menu["notifications"]:
+        notification.history_url = notification.history_url_for(profile.account_type)
+    return menu
 
+
+def booking_notifications(request):
+    # Nothing is loaded unless a template actually renders the menu.
+    menu = SimpleLazyObject(lambda: notification_menu(getattr(request, "user", None)))
     return {
-        "booking_notifications": notifications,
-        "booking_notifications_unread_count": notifications_qs.count(),
+        "booking_notifications": SimpleLazyObject(lambda: menu["notifications"]),
+        "booking_notifications_unread_count": SimpleLazyObject(lambda: menu["unread_count"]),
+        "booking_notifications_last_id": SimpleLazyObject(lambda: menu["last_notification_id"]),
     }
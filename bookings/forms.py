@@ -16,13 +16,34 @@ class BookingCheckoutForm(forms.Form):
     guest_name = forms.CharField(max_length=150)
     guest_email = forms.EmailField()
     guest_phone = forms.CharField(max_length=30, required=False)
+    checkin_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}, format="%Y-%m-%d"),
+    )
+    checkout_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}, format="%Y-%m-%d"),
+    )
     rooms_count = forms.IntegerField(min_value=1, initial=1)
     payment_option = forms.ChoiceField(choices=PAYMENT_OPTION_CHOICES)
     payment_method = forms.ChoiceField(choices=PAYMENT_METHOD_CHOICES, required=False)
 
-    def __init__(self, *args, fixed_email: str = "", max_rooms_available: int | None = None, **kwargs):
+    def __init__(
+        self,
+        *args,
+        fixed_email: str = "",
+        max_rooms_available: int | None = None,
+        stay_window=None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.max_rooms_available = max_rooms_available if (max_rooms_available or 0) > 0 else None
+        self.stay_window = stay_window
+
+        if stay_window is not None:
+            for field_name in ("checkin_date", "checkout_date"):
+                self.fields[field_name].widget.attrs["min"] = stay_window[0].isoformat()
+                self.fields[field_name].widget.attrs["max"] = stay_window[1].isoformat()
 
         if fixed_email:
             normalized_email = fixed_email.strip().lower()
@@ -54,6 +75,20 @@ class BookingCheckoutForm(forms.Form):
         if payment_option == Booking.PaymentOption.PAY_NOW and not cleaned_data.get("payment_method"):
             self.add_error("payment_method", "Please choose how you want to pay now.")
 
+        if self.stay_window is not None:
+            window_checkin, window_checkout = self.stay_window
+            checkin_date = cleaned_data.get("checkin_date") or window_checkin
+            checkout_date = cleaned_data.get("checkout_date") or window_checkout
+            if checkout_date < checkin_date:
+                self.add_error("checkout_date", "Checkout date must be on or after check-in date.")
+            elif checkin_date < window_checkin or checkout_date > window_checkout:
+                self.add_error(
+                    None,
+                    f"This room is only offered from {window_checkin} to {window_checkout}.",
+                )
+            cleaned_data["checkin_date"] = checkin_date
+            cleaned_data["checkout_date"] = checkout_date
+
         return cleaned_data
 
 
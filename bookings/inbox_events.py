@@ -0,0 +1,66 @@
+"""In-process wake-ups for open notification streams.
+
+Every change to a ``NotificationInbox`` calls ``publish_inbox_change()`` with its recipients once it
+commits (see ``BookingNotification.invalidate_menus``). A stream holds an
+``InboxSubscription`` and waits on it instead of polling the database.
+Changes committed by another process (``sweep_bookings``, another worker)
+are not published here, so a waiting stream still re-reads its inbox when
+the wait times out.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from contextlib import suppress
+
+_subscriptions: dict[int, set] = defaultdict(set)
+_subscriptions_lock = threading.Lock()
+
+
+def publish_inbox_change(recipient_ids):
+	"""Wake every stream subscribed to one of ``recipient_ids``."""
+	with _subscriptions_lock:
+		subscriptions = [
+			subscription
+			for recipient_id in recipient_ids
+			for subscription in _subscriptions.get(recipient_id, ())
+		]
+	for subscription in subscriptions:
+		subscription.notify()
+
+
+class InboxSubscription:
+	"""Collect wake-ups for one recipient while a stream is open.
+
+	A change published between two ``wait()`` calls is kept, so a stream
+	that is busy sending events never misses one.
+	"""
+
+	def __init__(self, recipient_id: int):
+		self.recipient_id = recipient_id
+		self._loop = None
+		self._changed = asyncio.Event()
+
+	def __enter__(self):
+		self._loop = asyncio.get_running_loop()
+		with _subscriptions_lock:
+			_subscriptions[self.recipient_id].add(self)
+		return self
+
+	def __exit__(self, *exc_info):
+		with _subscriptions_lock:
+			subscriptions = _subscriptions[self.recipient_id]
+			subscriptions.discard(self)
+			if not subscriptions:
+				del _subscriptions[self.recipient_id]
+
+	def notify(self):
+		self._loop.call_soon_threadsafe(self._changed.set)
+
+	async def wait(self, timeout: float) -> bool:
+		"""Wait up to ``timeout`` seconds for a change; return whether one came."""
+		# Before Python 3.11 this is not the builtin TimeoutError.
+		with suppress(asyncio.TimeoutError):
+			await asyncio.wait_for(self._changed.wait(), timeout)
+		changed = self._changed.is_set()
+		self._changed.clear()
+		return changed
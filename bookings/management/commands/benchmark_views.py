@@ -0,0 +1,163 @@
+import datetime
+import json
+import math
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
+from booking.query_budget import QueryRecorder
+from bookings.models import Booking, BookingNotification, BookingReview
+from rooms.models import Room
+
+
+def percentile(samples: list[float], percent: float) -> float:
+	"""Nearest-rank percentile of ``samples``."""
+	ordered = sorted(samples)
+	return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def benchmark_targets(prefix: str) -> list[dict]:
+	"""Return the views to drive, as the busiest seeded guest, hotel and the admin."""
+	user_model = get_user_model()
+	admin = user_model.objects.filter(username=f"{prefix}-admin").first()
+	seeded_profiles = Profile.objects.filter(user__username__startswith=f"{prefix}-")
+	guest = (
+		seeded_profiles.filter(account_type=Profile.AccountType.GUEST)
+		.annotate(bookings_count=Count("bookings"))
+		.order_by("-bookings_count", "id")
+		.select_related("user")
+		.first()
+	)
+	hotel = (
+		seeded_profiles.filter(account_type=Profile.AccountType.HOTEL)
+		.annotate(bookings_count=Count("rooms__bookings"))
+		.order_by("-bookings_count", "id")
+		.select_related("user")
+		.first()
+	)
+	if admin is None or guest is None or hotel is None:
+		raise CommandError(f"No dataset with prefix '{prefix}'; run seed_benchmark_data first.")
+
+	stay_start = timezone.localdate() + datetime.timedelta(days=14)
+	stay = {"checkin": stay_start.isoformat(), "checkout": (stay_start + datetime.timedelta(days=2)).isoformat()}
+	return [
+		{"name": "home_search", "user": guest.user, "url": reverse("home"), "params": {"location": hotel.location}},
+		{
+			"name": "home_search_dates",
+			"user": guest.user,
+			"url": reverse("home"),
+			"params": {"location": hotel.location, "guests": 2, **stay},
+		},
+		{"name": "home_search_by_rating", "user": guest.user, "url": reverse("home"), "params": {"guests": 1, "sort": "rating"}},
+		{"name": "guest_hotel_profile", "user": guest.user, "url": reverse("guest_hotel_profile", args=[hotel.id])},
+		{"name": "booking_history", "user": guest.user, "url": reverse("booking_history")},
+		{"name": "hotel_home", "user": hotel.user, "url": reverse("hotel_home")},
+		{"name": "hotel_booking_history", "user": hotel.user, "url": reverse("hotel_booking_history")},
+		{"name": "hotel_reviews", "user": hotel.user, "url": reverse("hotel_reviews")},
+		{"name": "panel_dashboard", "user": admin, "url": reverse("panel_dashboard")},
+		{"name": "panel_bookings", "user": admin, "url": reverse("panel_bookings")},
+		{"name": "panel_rooms", "user": admin, "url": reverse("panel_rooms")},
+		{"name": "panel_accounts", "user": admin, "url": reverse("panel_accounts")},
+	]
+
+
+def run_benchmark(targets: list[dict], *, iterations: int, warmup: int, cold_cache: bool) -> list[dict]:
+	results = []
+	for target in targets:
+		client = Client()
+		client.force_login(target["user"])
+		params = target.get("params", {})
+		for _ in range(warmup):
+			client.get(target["url"], params)
+
+		timings, query_counts, status_code, repeated = [], [], None, {}
+		for _ in range(iterations):
+			if cold_cache:
+				cache.clear()
+			with QueryRecorder() as recorder:
+				started = time.perf_counter()
+				response = client.get(target["url"], params)
+				timings.append((time.perf_counter() - started) * 1000)
+			query_counts.append(len(recorder.statements))
+			status_code = response.status_code
+			repeated = recorder.repeated_shapes(settings.QUERY_BUDGET_REPEAT_THRESHOLD)
+		results.append(
+			{
+				"view": target["name"],
+				"url": target["url"],
+				"params": params,
+				"status": status_code,
+				"p50_ms": round(percentile(timings, 50), 2),
+				"p95_ms": round(percentile(timings, 95), 2),
+				"mean_ms": round(sum(timings) / len(timings), 2),
+				"queries": max(query_counts),
+				"repeated_query_shapes": len(repeated),
+			}
+		)
+	return results
+
+
+class Command(BaseCommand):
+	help = "Drive key views through the test client and record latency percentiles and query counts."
+
+	def add_arguments(self, parser):
+		parser.add_argument("--prefix", default="bench", help="Prefix of the seeded dataset (default: bench).")
+		parser.add_argument("--iterations", type=int, default=20, help="Timed requests per view (default: 20).")
+		parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per view first (default: 2).")
+		parser.add_argument(
+			"--cold-cache",
+			action="store_true",
+			help="Clear the cache before every timed request.",
+		)
+		parser.add_argument(
+			"--output",
+			default="benchmark-results.json",
+			help="JSON file the results are written to (default: benchmark-results.json).",
+		)
+
+	def handle(self, *args, **options):
+		if options["iterations"] < 1:
+			raise CommandError("--iterations must be at least 1.")
+
+		with override_settings(ALLOWED_HOSTS=["*"]):
+			views = run_benchmark(
+				benchmark_targets(options["prefix"]),
+				iterations=options["iterations"],
+				warmup=options["warmup"],
+				cold_cache=options["cold_cache"],
+			)
+
+		report = {
+			"generated_at": timezone.now().isoformat(),
+			"database": connection.vendor,
+			"iterations": options["iterations"],
+			"cold_cache": options["cold_cache"],
+			"dataset": {
+				"hotels": Profile.objects.filter(account_type=Profile.AccountType.HOTEL).count(),
+				"rooms": Room.objects.count(),
+				"bookings": Booking.objects.count(),
+				"reviews": BookingReview.objects.count(),
+				"notifications": BookingNotification.objects.count(),
+			},
+			"views": views,
+		}
+		output = Path(options["output"])
+		output.write_text(json.dumps(report, indent=2) + "\n")
+
+		for view in views:
+			self.stdout.write(
+				f"{view['view']:<24} {view['status']}  p50 {view['p50_ms']:>8.2f}ms  "
+				f"p95 {view['p95_ms']:>8.2f}ms  {view['queries']:>3} queries"
+			)
+		self.stdout.write(f"Wrote {len(views)} view results to {output}.")
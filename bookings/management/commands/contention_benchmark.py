@@ -0,0 +1,328 @@
+import datetime
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection
+from django.db.models import Sum
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
+from bookings.models import Booking
+from bookings.transactions import retry_stats
+from bookings.writer import writer_stats
+from rooms.models import Room, RoomType
+
+ACTIVE_STATUSES = (Booking.Status.PENDING, Booking.Status.CONFIRMED)
+
+
+def contention_fixture(*, prefix: str, workers: int, inventory: int, nights: int):
+	"""Create one hotel room with ``inventory`` rooms and a guest account per worker."""
+	user_model = get_user_model()
+	hotel_user = user_model.objects.create_user(username=f"{prefix}-hotel")
+	hotel = hotel_user.profile
+	hotel.full_name = "Contention Hotel"
+	hotel.account_type = Profile.AccountType.HOTEL
+	hotel.save(update_fields=["full_name", "account_type"])
+	checkin_date = timezone.localdate() + datetime.timedelta(days=1)
+	room = Room.objects.create(
+		hotel=hotel,
+		room_type=RoomType.objects.get_or_create(name="Standard")[0],
+		capacity=2,
+		rate_per_night="100.00",
+		available_rooms=inventory,
+		checkin_date=checkin_date,
+		checkout_date=checkin_date + datetime.timedelta(days=nights),
+	)
+	guests = [
+		user_model.objects.create_user(username=f"{prefix}-guest-{index}", email=f"{prefix}-guest-{index}@example.com")
+		for index in range(workers)
+	]
+	return room, guests
+
+
+def remove_fixture(prefix: str, room: Room):
+	Booking.objects.filter(room=room).delete()
+	room.delete()
+	get_user_model().objects.filter(username__startswith=f"{prefix}-").delete()
+
+
+def inventory_violations(room: Room, inventory: int) -> list[str]:
+	"""Check that every night's free rooms plus the rooms held by live bookings equal ``inventory``.
+
+	The room's headline count is caught up first, as ``sweep_bookings`` would.
+	"""
+	Room.refresh_available_rooms([room.id])
+	room.refresh_from_db()
+	active = Booking.objects.filter(room=room, status__in=ACTIVE_STATUSES)
+	held = Counter()
+	for booking in active:
+		for night in booking.nights:
+			held[night] += booking.rooms_count
+	violations = []
+	total_held = active.aggregate(total=Sum("rooms_count"))["total"] or 0
+	if total_held + room.available_rooms != inventory:
+		violations.append(f"{total_held} booked + {room.available_rooms} available != {inventory}")
+	for room_night in room.nights.all():
+		if held[room_night.night] + room_night.available_rooms != inventory:
+			violations.append(
+				f"{room_night.night}: {held[room_night.night]} booked + {room_night.available_rooms} available "
+				f"!= {inventory}"
+			)
+	return violations
+
+
+def logged_in_client(user) -> Client:
+	client = Client(raise_request_exception=False)
+	client.force_login(user)
+	return client
+
+
+def checkout_flows(
+	client: Client,
+	user,
+	room: Room,
+	*,
+	flows: int,
+	cancel_share: float,
+	pay_share: float,
+	seed: int,
+) -> Counter:
+	"""Book one room ``flows`` times, then cancel, pay or keep each booking."""
+	outcomes = Counter()
+	rng = random.Random(seed)
+	checkout_data = {
+		"guest_name": user.username,
+		"guest_phone": "1234567890",
+		"rooms_count": 1,
+		"checkin_date": room.checkin_date.isoformat(),
+		"checkout_date": room.checkout_date.isoformat(),
+		"payment_option": Booking.PaymentOption.PAY_LATER,
+	}
+
+	def request(name, url, data=None):
+		outcomes["requests"] += 1
+		response = client.post(url, data or {})
+		if response.status_code >= 500:
+			outcomes["errors"] += 1
+			outcomes[f"{name}_errors"] += 1
+		return response
+
+	try:
+		for _ in range(flows):
+			response = request("checkout", reverse("booking_checkout", args=[room.id]), checkout_data)
+			if response.status_code != 302:
+				if response.status_code < 500:
+					outcomes["sold_out"] += 1
+				continue
+			outcomes["booked"] += 1
+			roll = rng.random()
+			try:
+				booking_id = (
+					Booking.objects.filter(guest__user=user, room=room, status=Booking.Status.PENDING)
+					.order_by("-id")
+					.values_list("id", flat=True)
+					.first()
+				)
+			except OperationalError:
+				outcomes["lookup_errors"] += 1
+				continue
+			if booking_id is None:
+				continue
+			if roll < cancel_share:
+				request("cancel", reverse("booking_cancel", args=[booking_id]))
+				outcomes["canceled"] += 1
+			elif roll < cancel_share + pay_share:
+				request("pay_now", reverse("booking_pay_now", args=[booking_id]))
+				outcomes["paid"] += 1
+	finally:
+		close_old_connections()
+		connection.close()
+	return outcomes
+
+
+def read_pages(client: Client, room: Room, stop: threading.Event) -> Counter:
+	"""Load the guest's history and the hotel page until ``stop`` is set."""
+	outcomes = Counter()
+	urls = [reverse("booking_history"), reverse("guest_hotel_profile", args=[room.hotel_id])]
+	try:
+		while not stop.is_set():
+			for url in urls:
+				outcomes["reads"] += 1
+				if client.get(url).status_code >= 500:
+					outcomes["read_errors"] += 1
+	finally:
+		close_old_connections()
+		connection.close()
+	return outcomes
+
+
+def run_contention(
+	*,
+	prefix: str = "contention",
+	workers: int = 8,
+	flows: int = 5,
+	inventory: int = 10,
+	nights: int = 2,
+	cancel_share: float = 0.3,
+	pay_share: float = 0.3,
+	seed: int = 42,
+	readers: int = 0,
+	keep: bool = False,
+) -> dict:
+	"""Fire ``workers`` threads of checkout/cancel/pay-now flows at one room and report the outcome.
+
+	``readers`` more threads keep loading read-only pages while the writers
+	run, to measure how much the writes hold up reads.
+	"""
+	room, guests = contention_fixture(prefix=prefix, workers=workers + readers, inventory=inventory, nights=nights)
+	clients = [logged_in_client(guest) for guest in guests]
+	stop_reading = threading.Event()
+	retry_stats(reset=True)
+	writer_stats(reset=True)
+	request_logger = logging.getLogger("django.request")
+	request_logger_disabled = request_logger.disabled
+	# Lock errors are counted below; their tracebacks would drown the report.
+	request_logger.disabled = True
+	try:
+		started = time.perf_counter()
+		with override_settings(ALLOWED_HOSTS=["*"]), ThreadPoolExecutor(max_workers=workers + readers) as executor:
+			reading = [
+				executor.submit(read_pages, client, room, stop_reading) for client in clients[workers:]
+			]
+			writing = [
+				executor.submit(
+					checkout_flows,
+					clients[index],
+					guests[index],
+					room,
+					flows=flows,
+					cancel_share=cancel_share,
+					pay_share=pay_share,
+					seed=seed + index,
+				)
+				for index in range(workers)
+			]
+			results = [future.result() for future in writing]
+			elapsed = time.perf_counter() - started
+			stop_reading.set()
+			results += [future.result() for future in reading]
+	finally:
+		stop_reading.set()
+		request_logger.disabled = request_logger_disabled
+
+	outcomes = sum(results, Counter())
+	violations = inventory_violations(room, inventory)
+	retries = retry_stats(reset=True)
+	writer = writer_stats(reset=True)
+	if not keep:
+		remove_fixture(prefix, room)
+	return {
+		"backend": connection.vendor,
+		"database": str(settings.DATABASES[connection.alias]["NAME"]),
+		"sqlite_profile": settings.SQLITE_PROFILE if connection.vendor == "sqlite" else None,
+		"single_writer": settings.BOOKING_SINGLE_WRITER,
+		"workers": workers,
+		"readers": readers,
+		"flows_per_worker": flows,
+		"inventory": inventory,
+		"elapsed_s": round(elapsed, 3),
+		"bookings": outcomes["booked"],
+		"bookings_per_s": round(outcomes["booked"] / elapsed, 2) if elapsed else 0.0,
+		"sold_out": outcomes["sold_out"],
+		"canceled": outcomes["canceled"],
+		"paid": outcomes["paid"],
+		"requests": outcomes["requests"],
+		"errors": outcomes["errors"],
+		"error_rate": round(outcomes["errors"] / outcomes["requests"], 4) if outcomes["requests"] else 0.0,
+		"errors_by_flow": {
+			name: outcomes[f"{name}_errors"] for name in ("checkout", "cancel", "pay_now")
+		},
+		"lookup_errors": outcomes["lookup_errors"],
+		"retries": retries["retries"],
+		"exhausted_retries": retries["exhausted"],
+		"reads": outcomes["reads"],
+		"reads_per_s": round(outcomes["reads"] / elapsed, 2) if elapsed else 0.0,
+		"read_errors": outcomes["read_errors"],
+		"writer_groups": writer["groups"],
+		"writer_largest_group": writer["largest_group"],
+		"invariant_violations": violations,
+	}
+
+
+class Command(BaseCommand):
+	help = "Run parallel checkout/cancel/pay-now flows against one room and check it is never overbooked."
+
+	def add_arguments(self, parser):
+		parser.add_argument("--workers", type=int, default=8, help="Parallel guest threads (default: 8).")
+		parser.add_argument("--flows", type=int, default=5, help="Checkout flows per worker (default: 5).")
+		parser.add_argument("--inventory", type=int, default=10, help="Rooms on offer (default: 10).")
+		parser.add_argument("--nights", type=int, default=2, help="Nights per stay (default: 2).")
+		parser.add_argument(
+			"--readers",
+			type=int,
+			default=0,
+			help="Extra threads loading read-only pages during the run (default: 0).",
+		)
+		parser.add_argument(
+			"--cancel-share",
+			type=float,
+			default=0.3,
+			help="Share of bookings the guest cancels straight away (default: 0.3).",
+		)
+		parser.add_argument(
+			"--pay-share",
+			type=float,
+			default=0.3,
+			help="Share of bookings the guest pays now (default: 0.3).",
+		)
+		parser.add_argument("--seed", type=int, default=42, help="Seed for each worker's choices.")
+		parser.add_argument("--prefix", default="contention", help="Username prefix of the fixture accounts.")
+		parser.add_argument("--keep", action="store_true", help="Leave the fixture room and bookings in place.")
+		parser.add_argument(
+			"--output",
+			default="contention-results.json",
+			help="JSON file the results are written to (default: contention-results.json).",
+		)
+
+	def handle(self, *args, **options):
+		if options["workers"] < 1 or options["flows"] < 1 or options["inventory"] < 1 or options["nights"] < 1:
+			raise CommandError("--workers, --flows, --inventory and --nights must be at least 1.")
+		if get_user_model().objects.filter(username__startswith=f"{options['prefix']}-").exists():
+			raise CommandError(f"Accounts with prefix '{options['prefix']}' exist; pick another --prefix.")
+
+		result = run_contention(
+			prefix=options["prefix"],
+			workers=options["workers"],
+			flows=options["flows"],
+			inventory=options["inventory"],
+			nights=options["nights"],
+			cancel_share=options["cancel_share"],
+			pay_share=options["pay_share"],
+			seed=options["seed"],
+			readers=options["readers"],
+			keep=options["keep"],
+		)
+		output = Path(options["output"])
+		output.write_text(json.dumps(result, indent=2) + "\n")
+
+		self.stdout.write(
+			f"{result['backend']}: {result['bookings']} bookings in {result['elapsed_s']:.2f}s "
+			f"({result['bookings_per_s']:.1f}/s), {result['retries']} retries, "
+			f"{result['errors']}/{result['requests']} errors ({result['error_rate']:.1%}), "
+			f"{result['reads']} reads ({result['reads_per_s']:.1f}/s, {result['read_errors']} errors)."
+		)
+		if result["invariant_violations"]:
+			raise CommandError("Inventory invariant broken: " + "; ".join(result["invariant_violations"]))
+		self.stdout.write(f"Inventory invariant held. Wrote results to {output}.")
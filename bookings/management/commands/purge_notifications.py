@@ -0,0 +1,124 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.models import ArchivedBookingNotification, BookingNotification
+
+
+def purge_notification_batch(*, cutoff, batch_size: int, archive: bool) -> int:
+	with transaction.atomic():
+		batch = list(
+			BookingNotification.objects.filter(created_at__lt=cutoff)
+			.read()
+			.order_by("id")
+			.values("id", "recipient_id", "booking_id", "status", "message", "created_at")[:batch_size]
+		)
+		if not batch:
+			return 0
+		if archive:
+			ArchivedBookingNotification.objects.bulk_create(
+				[
+					ArchivedBookingNotification(
+						original_id=row["id"],
+						recipient_id=row["recipient_id"],
+						booking_id=row["booking_id"],
+						status=row["status"],
+						message=row["message"],
+						created_at=row["created_at"],
+					)
+					for row in batch
+				],
+				ignore_conflicts=True,
+			)
+		BookingNotification.objects.filter(id__in=[row["id"] for row in batch]).delete()
+	return len(batch)
+
+
+def purge_read_notifications(
+	*,
+	older_than: timedelta,
+	archive: bool = False,
+	batch_size: int = 1000,
+	max_batches: int | None = None,
+	pause: float = 0.0,
+	now=None,
+) -> dict:
+	"""Delete (or archive) read notifications older than ``older_than`` in chunks.
+
+	Unread notifications are never touched, so inbox counters stay exact.
+	Each chunk commits on its own and ``pause`` leaves the write lock free
+	between chunks on a busy database.
+	"""
+	cutoff = (now or timezone.now()) - older_than
+	totals = {"processed": 0, "batches": 0}
+	while max_batches is None or totals["batches"] < max_batches:
+		processed = purge_notification_batch(cutoff=cutoff, batch_size=batch_size, archive=archive)
+		if processed:
+			totals["processed"] += processed
+			totals["batches"] += 1
+		if processed < batch_size:
+			break
+		if pause:
+			time.sleep(pause)
+	return totals
+
+
+class Command(BaseCommand):
+	help = "Delete or archive read booking notifications past the retention window."
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--days",
+			type=int,
+			default=settings.BOOKING_NOTIFICATION_RETENTION_DAYS,
+			help="Keep read notifications newer than this many days "
+			f"(default: {settings.BOOKING_NOTIFICATION_RETENTION_DAYS}).",
+		)
+		parser.add_argument(
+			"--archive",
+			action="store_true",
+			help="Copy purged rows into the archive table before deleting them.",
+		)
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=1000,
+			help="Notifications handled per transaction (default: 1000).",
+		)
+		parser.add_argument(
+			"--max-batches",
+			type=int,
+			default=None,
+			help="Stop after this many batches; the rest wait for the next run.",
+		)
+		parser.add_argument(
+			"--pause",
+			type=float,
+			default=0.0,
+			help="Seconds to sleep between batches so other writers can take the lock.",
+		)
+
+	def handle(self, *args, **options):
+		if options["days"] < 0:
+			raise CommandError("--days must not be negative.")
+		if options["batch_size"] < 1:
+			raise CommandError("--batch-size must be at least 1.")
+
+		started = time.monotonic()
+		totals = purge_read_notifications(
+			older_than=timedelta(days=options["days"]),
+			archive=options["archive"],
+			batch_size=options["batch_size"],
+			max_batches=options["max_batches"],
+			pause=options["pause"],
+		)
+		elapsed = time.monotonic() - started
+		action = "archived" if options["archive"] else "deleted"
+		self.stdout.write(
+			f"Purge finished in {elapsed:.2f}s: {totals['processed']} notifications {action} "
+			f"in {totals['batches']} batches."
+		)
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings.models import HotelRatingSummary
+
+
+class Command(BaseCommand):
+	help = "Recompute hotel rating summaries from booking reviews."
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--hotel",
+			type=int,
+			action="append",
+			dest="hotel_ids",
+			help="Only rebuild this hotel profile id (repeatable).",
+		)
+
+	def handle(self, *args, **options):
+		started = time.monotonic()
+		rebuilt = HotelRatingSummary.rebuild(hotel_ids=options["hotel_ids"])
+		elapsed = time.monotonic() - started
+		self.stdout.write(f"Rebuilt {rebuilt} hotel rating summaries in {elapsed:.2f}s.")
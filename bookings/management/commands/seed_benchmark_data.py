@@ -0,0 +1,257 @@
+import datetime
+import random
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+from accounts.search import index_hotel
+from bookings.models import Booking, BookingNotification, BookingReview, HotelRatingSummary, NotificationInbox
+from rooms.models import Room, RoomNight, RoomType
+
+BATCH_SIZE = 500
+BENCHMARK_PASSWORD = "bench-pass-1234"
+CITIES = ("Yangon", "Mandalay", "Bagan", "Chiang Mai", "Bangkok", "Hanoi", "Da Nang", "Siem Reap")
+HOTEL_WORDS = ("Grand", "River", "Garden", "Palace", "Lotus", "Harbor", "Golden", "Royal")
+ROOM_TYPES = ("Standard", "Deluxe", "Suite", "Family")
+ROOM_WINDOW_PAST_DAYS = 60
+ROOM_WINDOW_FUTURE_DAYS = 120
+ROOM_INVENTORY = 50
+REVIEW_SHARE = 0.6
+READ_NOTIFICATION_SHARE = 0.7
+
+
+def seeded_users(prefix: str):
+	return get_user_model().objects.filter(username__startswith=f"{prefix}-")
+
+
+def flush_dataset(prefix: str):
+	"""Remove a dataset seeded with ``prefix``; bookings first, since they protect rooms."""
+	profiles = Profile.objects.filter(user__in=seeded_users(prefix))
+	hotel_ids = list(profiles.filter(account_type=Profile.AccountType.HOTEL).values_list("id", flat=True))
+	with transaction.atomic():
+		Booking.objects.filter(guest__in=profiles).delete()
+		Booking.objects.filter(hotel_id__in=hotel_ids).delete()
+		seeded_users(prefix).delete()
+
+
+def stay_for(status: str, rng: random.Random, today: datetime.date) -> tuple[datetime.date, datetime.date]:
+	# Completed stays are in the past and live ones ahead, as the sweeper would leave them.
+	if status == Booking.Status.COMPLETED:
+		checkin = today - datetime.timedelta(days=rng.randint(3, ROOM_WINDOW_PAST_DAYS - 1))
+	elif status in (Booking.Status.PENDING, Booking.Status.CONFIRMED):
+		checkin = today + datetime.timedelta(days=rng.randint(1, ROOM_WINDOW_FUTURE_DAYS - 10))
+	else:
+		checkin = today + datetime.timedelta(
+			days=rng.randint(-ROOM_WINDOW_PAST_DAYS + 1, ROOM_WINDOW_FUTURE_DAYS - 10)
+		)
+	return checkin, checkin + datetime.timedelta(days=rng.randint(1, 5))
+
+
+def seed_dataset(*, prefix: str, hotels: int, rooms_per_hotel: int, guests: int, bookings: int, seed: int) -> dict:
+	"""Create a deterministic dataset and return the row counts written.
+
+	Rows go in with ``bulk_create``, so the derived tables (room nights,
+	notifications, inboxes, rating summaries, search index) are filled in
+	explicitly instead of through the per-row save hooks.
+	"""
+	rng = random.Random(seed)
+	now = timezone.now()
+	today = timezone.localdate()
+	user_model = get_user_model()
+	password = make_password(BENCHMARK_PASSWORD)
+
+	with transaction.atomic():
+		users = user_model.objects.bulk_create(
+			[user_model(username=f"{prefix}-admin", password=password, is_staff=True)]
+			+ [
+				user_model(username=f"{prefix}-hotel-{index}", email=f"{prefix}-hotel-{index}@example.com", password=password)
+				for index in range(hotels)
+			]
+			+ [
+				user_model(username=f"{prefix}-guest-{index}", email=f"{prefix}-guest-{index}@example.com", password=password)
+				for index in range(guests)
+			],
+			batch_size=BATCH_SIZE,
+		)
+		# SQLite and PostgreSQL return primary keys from bulk_create.
+		profiles = Profile.objects.bulk_create(
+			[Profile(user=users[0], full_name="Benchmark Admin", account_type=Profile.AccountType.ADMIN)]
+			+ [
+				Profile(
+					user=user,
+					full_name=f"{rng.choice(HOTEL_WORDS)} {rng.choice(HOTEL_WORDS)} Hotel {index}",
+					account_type=Profile.AccountType.HOTEL,
+					location=rng.choice(CITIES),
+				)
+				for index, user in enumerate(users[1 : hotels + 1])
+			]
+			+ [
+				Profile(user=user, full_name=f"Guest {index}", account_type=Profile.AccountType.GUEST)
+				for index, user in enumerate(users[hotels + 1 :])
+			],
+			batch_size=BATCH_SIZE,
+		)
+		hotel_profiles = profiles[1 : hotels + 1]
+		guest_profiles = profiles[hotels + 1 :]
+		for hotel in hotel_profiles:
+			index_hotel(hotel)
+
+		room_types = [RoomType.objects.get_or_create(name=name)[0] for name in ROOM_TYPES]
+		window = (
+			today - datetime.timedelta(days=ROOM_WINDOW_PAST_DAYS),
+			today + datetime.timedelta(days=ROOM_WINDOW_FUTURE_DAYS),
+		)
+		rooms = Room.objects.bulk_create(
+			[
+				Room(
+					hotel=hotel,
+					room_type=rng.choice(room_types),
+					capacity=rng.randint(1, 4),
+					rate_per_night=f"{rng.randint(30, 400)}.00",
+					available_rooms=ROOM_INVENTORY,
+					checkin_date=window[0],
+					checkout_date=window[1],
+				)
+				for hotel in hotel_profiles
+				for _ in range(rooms_per_hotel)
+			],
+			batch_size=BATCH_SIZE,
+		)
+
+		statuses = list(Booking.Status.values)
+		booking_rows = []
+		created_at = []
+		reserved = Counter()
+		for _ in range(bookings if rooms and guest_profiles else 0):
+			room = rng.choice(rooms)
+			guest = rng.choice(guest_profiles)
+			status = rng.choice(statuses)
+			checkin, checkout = stay_for(status, rng, today)
+			booking = Booking(
+				guest=guest,
+				room=room,
+				guest_name=guest.full_name,
+				guest_email=f"{guest.full_name.lower().replace(' ', '-')}@example.com",
+				payment_option=(
+					Booking.PaymentOption.PAY_LATER if status == Booking.Status.PENDING else rng.choice(Booking.PaymentOption.values)
+				),
+				status=status,
+				checkin_date=checkin,
+				checkout_date=checkout,
+			)
+			# Pending bookings stay inside their payment window.
+			age = rng.randint(0, 60 * 6 if status == Booking.Status.PENDING else 60 * 24 * 90)
+			created_at.append(now - datetime.timedelta(minutes=age))
+			if status in (Booking.Status.PENDING, Booking.Status.CONFIRMED):
+				for night in booking.nights:
+					reserved[room.id, night] += booking.rooms_count
+			booking_rows.append(booking)
+		booking_rows = Booking.objects.bulk_create(booking_rows, batch_size=BATCH_SIZE)
+		# created_at is auto_now_add, so the spread-out timestamps are written afterwards.
+		for booking, booked_at in zip(booking_rows, created_at):
+			booking.created_at = booked_at
+			booking.assign_deadlines()
+		Booking.objects.bulk_update(
+			booking_rows,
+			["created_at", "payment_due_at", "completes_on"],
+			batch_size=BATCH_SIZE,
+		)
+
+		RoomNight.objects.bulk_create(
+			[
+				RoomNight(
+					room=room,
+					night=night,
+					available_rooms=max(ROOM_INVENTORY - reserved[room.id, night], 0),
+				)
+				for room in rooms
+				for night in Room.night_dates(room.checkin_date, room.checkout_date)
+			],
+			batch_size=BATCH_SIZE,
+		)
+		Room.refresh_available_rooms([room.id for room in rooms])
+
+		reviews = BookingReview.objects.bulk_create(
+			[
+				BookingReview(
+					booking=booking,
+					rating=rng.choices((1, 2, 3, 4, 5), weights=(1, 1, 3, 5, 6))[0],
+					comment=f"Stay review {booking.id}",
+				)
+				for booking in booking_rows
+				if booking.status == Booking.Status.COMPLETED and rng.random() < REVIEW_SHARE
+			],
+			batch_size=BATCH_SIZE,
+		)
+		HotelRatingSummary.rebuild(hotel_ids=[hotel.id for hotel in hotel_profiles])
+
+		hotel_by_room = {room.id: room.hotel_id for room in rooms}
+		notifications = []
+		for booking in booking_rows:
+			for notification in Booking.build_status_notifications(
+				booking_id=booking.id,
+				guest_id=booking.guest_id,
+				hotel_id=hotel_by_room[booking.room_id],
+				status=booking.status,
+			):
+				notification.is_read = rng.random() < READ_NOTIFICATION_SHARE
+				notifications.append(notification)
+		BookingNotification.objects.bulk_create(notifications, batch_size=BATCH_SIZE, ignore_conflicts=True)
+		recipient_ids = [profile.id for profile in profiles]
+		for start in range(0, len(recipient_ids), BATCH_SIZE):
+			NotificationInbox.refresh(recipient_ids[start : start + BATCH_SIZE])
+
+	return {
+		"hotels": len(hotel_profiles),
+		"rooms": len(rooms),
+		"guests": len(guest_profiles),
+		"bookings": len(booking_rows),
+		"reviews": len(reviews),
+		"notifications": len(notifications),
+	}
+
+
+class Command(BaseCommand):
+	help = "Seed a deterministic dataset of hotels, rooms, guests, bookings, reviews and notifications."
+
+	def add_arguments(self, parser):
+		parser.add_argument("--prefix", default="bench", help="Username prefix of seeded accounts (default: bench).")
+		parser.add_argument("--hotels", type=int, default=50, help="Hotel accounts to create (default: 50).")
+		parser.add_argument("--rooms-per-hotel", type=int, default=5, help="Rooms per hotel (default: 5).")
+		parser.add_argument("--guests", type=int, default=1000, help="Guest accounts to create (default: 1000).")
+		parser.add_argument("--bookings", type=int, default=10000, help="Bookings to create (default: 10000).")
+		parser.add_argument("--seed", type=int, default=42, help="Random seed; equal seeds give equal data.")
+		parser.add_argument(
+			"--flush",
+			action="store_true",
+			help="Delete a dataset previously seeded with the same prefix first.",
+		)
+
+	def handle(self, *args, **options):
+		for option in ("hotels", "rooms_per_hotel", "guests", "bookings"):
+			if options[option] < 0:
+				raise CommandError(f"--{option.replace('_', '-')} must not be negative.")
+		prefix = options["prefix"]
+		if options["flush"]:
+			flush_dataset(prefix)
+		elif seeded_users(prefix).exists():
+			raise CommandError(f"A dataset with prefix '{prefix}' exists; pass --flush to replace it.")
+
+		started = time.monotonic()
+		counts = seed_dataset(
+			prefix=prefix,
+			hotels=options["hotels"],
+			rooms_per_hotel=options["rooms_per_hotel"],
+			guests=options["guests"],
+			bookings=options["bookings"],
+			seed=options["seed"],
+		)
+		elapsed = time.monotonic() - started
+		summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+		self.stdout.write(f"Seeded {summary} in {elapsed:.2f}s (password: {BENCHMARK_PASSWORD}).")
@@ -0,0 +1,97 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from bookings.models import Booking
+from bookings.writer import run_write
+from rooms.models import Room
+
+
+def expire_overdue_batch(*, now, batch_size: int) -> int:
+	batch_ids = list(
+		Booking.objects.overdue(now=now).order_by("payment_due_at").values_list("id", flat=True)[:batch_size]
+	)
+	return run_write(lambda: Booking.objects.filter(id__in=batch_ids).expire_overdue(now=now).count())
+
+
+def complete_past_checkout_batch(*, now, batch_size: int) -> int:
+	batch_ids = list(
+		Booking.objects.past_checkout(now=now)
+		.order_by("completes_on")
+		.values_list("id", flat=True)[:batch_size]
+	)
+	return run_write(lambda: Booking.objects.filter(id__in=batch_ids).complete_past_checkout(now=now).count())
+
+
+def sweep_booking_lifecycle(*, now=None, batch_size: int = 500, max_batches: int | None = None) -> dict:
+	"""Expire unpaid bookings and complete finished stays in bounded batches.
+
+	Each batch is its own short transaction so a large backlog never holds
+	the write lock for long. Room headline counts are then checked against
+	the ledger in one more write, catching up any that drifted.
+	"""
+	now = now or timezone.now()
+	totals = {"expired": 0, "completed": 0}
+	for key, run_batch in (
+		("expired", expire_overdue_batch),
+		("completed", complete_past_checkout_batch),
+	):
+		batches = 0
+		while max_batches is None or batches < max_batches:
+			handled = run_batch(now=now, batch_size=batch_size)
+			totals[key] += handled
+			batches += 1
+			if handled < batch_size:
+				break
+	totals["rooms_refreshed"] = run_write(Room.refresh_available_rooms)
+	return totals
+
+
+class Command(BaseCommand):
+	help = "Expire overdue pay-later bookings, complete stays past checkout and refresh room counts."
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--once",
+			action="store_true",
+			help="Run a single sweep and exit instead of looping.",
+		)
+		parser.add_argument(
+			"--interval",
+			type=float,
+			default=60.0,
+			help="Seconds to wait between sweeps (default: 60).",
+		)
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=500,
+			help="Bookings transitioned per transaction (default: 500).",
+		)
+		parser.add_argument(
+			"--max-batches",
+			type=int,
+			default=None,
+			help="Cap the batches per transition in one sweep; the rest wait for the next sweep.",
+		)
+
+	def handle(self, *args, **options):
+		try:
+			while True:
+				started = time.monotonic()
+				totals = sweep_booking_lifecycle(
+					batch_size=options["batch_size"],
+					max_batches=options["max_batches"],
+				)
+				elapsed = time.monotonic() - started
+				self.stdout.write(
+					f"Sweep finished in {elapsed:.2f}s: "
+					f"{totals['expired']} expired, {totals['completed']} completed, "
+					f"{totals['rooms_refreshed']} room counts refreshed."
+				)
+				if options["once"]:
+					return
+				time.sleep(options["interval"])
+		except KeyboardInterrupt:
+			self.stdout.write("Booking sweeper stopped.")
@@ -0,0 +1,44 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def copy_database(source: str, target: str):
+	"""Copy the SQLite database at ``source`` over ``target`` with the online backup API."""
+	primary, replica = sqlite3.connect(source), sqlite3.connect(target)
+	try:
+		primary.backup(replica)
+	finally:
+		primary.close()
+		replica.close()
+
+
+class Command(BaseCommand):
+	help = "Refresh the SQLite read replica from the primary database, once or on an interval."
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--interval",
+			type=float,
+			default=None,
+			help="Copy every this many seconds, simulating replication lag, instead of once.",
+		)
+
+	def handle(self, *args, **options):
+		primary = settings.DATABASES["default"]
+		replica = settings.DATABASES.get(settings.REPLICA_DATABASE_ALIAS)
+		if replica is None or "sqlite3" not in primary["ENGINE"] or "sqlite3" not in replica["ENGINE"]:
+			raise CommandError("sync_replica copies between SQLite files; use the server's replication otherwise.")
+
+		try:
+			while True:
+				started = time.monotonic()
+				copy_database(str(primary["NAME"]), str(replica["NAME"]))
+				self.stdout.write(f"Copied {primary['NAME']} to {replica['NAME']} in {time.monotonic() - started:.2f}s.")
+				if options["interval"] is None:
+					return
+				time.sleep(options["interval"])
+		except KeyboardInterrupt:
+			self.stdout.write("Replica sync stopped.")
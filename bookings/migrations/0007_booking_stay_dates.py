@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_room_window_to_bookings(apps, schema_editor):
+    booking_model = apps.get_model("bookings", "Booking")
+    room_model = apps.get_model("rooms", "Room")
+    room_window = room_model.objects.filter(id=OuterRef("room_id"))
+    booking_model.objects.filter(checkin_date__isnull=True).update(
+        checkin_date=Subquery(room_window.values("checkin_date")[:1]),
+        checkout_date=Subquery(room_window.values("checkout_date")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_bookingreview'),
+        ('rooms', '0003_roomnight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='checkin_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='checkout_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_room_window_to_bookings, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='booking',
+            name='checkin_date',
+            field=models.DateField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='checkout_date',
+            field=models.DateField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='bookingnotification',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('completed', 'Completed'), ('canceled', 'Canceled'), ('expired', 'Expired'), ('review_added', 'Review added'), ('review_updated', 'Review updated')], max_length=20),
+        ),
+    ]
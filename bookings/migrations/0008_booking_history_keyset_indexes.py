@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_profile_hotel_license_image'),
+        ('bookings', '0007_booking_stay_dates'),
+        ('rooms', '0004_available_rooms_non_negative'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['guest', '-created_at', '-id'], name='booking_guest_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['room', '-created_at', '-id'], name='booking_room_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_profile_hotel_license_image'),
+        ('bookings', '0008_booking_history_keyset_indexes'),
+        ('rooms', '0004_available_rooms_non_negative'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='completes_on',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='payment_due_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('payment_option', 'pay_later'), ('status', 'pending')), fields=['payment_due_at'], name='booking_payment_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'confirmed')), fields=['completes_on'], name='booking_completes_on_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:16
+
+from datetime import timedelta
+
+from django.db import migrations, transaction
+from django.db.models import F, Max
+
+BATCH_SIZE = 1000
+PENDING_PAYMENT_EXPIRY_HOURS = 12
+
+
+def backfill_booking_deadlines(apps, schema_editor):
+    booking_model = apps.get_model("bookings", "Booking")
+    last_id = booking_model.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    for batch_start in range(0, last_id + 1, BATCH_SIZE):
+        batch = booking_model.objects.filter(
+            id__gte=batch_start,
+            id__lt=batch_start + BATCH_SIZE,
+        )
+        with transaction.atomic():
+            batch.filter(status="pending", payment_option="pay_later").update(
+                payment_due_at=F("created_at") + timedelta(hours=PENDING_PAYMENT_EXPIRY_HOURS)
+            )
+            batch.filter(status="confirmed").update(completes_on=F("checkout_date"))
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own so a large table is never locked for the whole backfill.
+    atomic = False
+
+    dependencies = [
+        ('bookings', '0009_booking_deadlines'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_booking_deadlines, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def build_notification_inboxes(apps, schema_editor):
+    notification_model = apps.get_model("bookings", "BookingNotification")
+    inbox_model = apps.get_model("bookings", "NotificationInbox")
+    inboxes = [
+        inbox_model(
+            recipient_id=row["recipient_id"],
+            last_notification_id=row["last_id"],
+            unread_count=row["unread"],
+        )
+        for row in notification_model.objects.order_by()
+        .values("recipient_id")
+        .annotate(last_id=Max("id"), unread=Count("id", filter=Q(is_read=False)))
+    ]
+    inbox_model.objects.bulk_create(inboxes, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_profile_hotel_license_image'),
+        ('bookings', '0010_backfill_booking_deadlines'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationInbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_through_id', models.PositiveBigIntegerField(default=0)),
+                ('last_notification_id', models.PositiveBigIntegerField(default=0)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='bookingnotification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['recipient', 'id'], name='notification_unread_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationinbox',
+            name='recipient',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification_inbox', to='accounts.profile'),
+        ),
+        migrations.RunPython(build_notification_inboxes, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_profile_hotel_license_image'),
+        ('bookings', '0011_notification_inbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBookingNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('recipient_id', models.BigIntegerField(db_index=True)),
+                ('booking_id', models.BigIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('completed', 'Completed'), ('canceled', 'Canceled'), ('expired', 'Expired'), ('review_added', 'Review added'), ('review_updated', 'Review updated')], max_length=20)),
+                ('message', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='bookingnotification',
+            index=models.Index(fields=['created_at'], name='notification_created_idx'),
+        ),
+    ]
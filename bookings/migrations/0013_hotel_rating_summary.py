@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def build_rating_summaries(apps, schema_editor):
+    review_model = apps.get_model("bookings", "BookingReview")
+    summary_model = apps.get_model("bookings", "HotelRatingSummary")
+    rows = (
+        review_model.objects.filter(booking__status__in=["confirmed", "completed"])
+        .order_by()
+        .values("booking__room__hotel_id")
+        .annotate(
+            review_count=Count("id"),
+            rating_sum=Sum("rating"),
+            **{f"rating_{rating}": Count("id", filter=Q(rating=rating)) for rating in range(1, 6)},
+        )
+    )
+    summary_model.objects.bulk_create(
+        [summary_model(hotel_id=row.pop("booking__room__hotel_id"), **row) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_hotel_search_index'),
+        ('bookings', '0012_notification_retention'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HotelRatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('hotel', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rating_summary', to='accounts.profile')),
+            ],
+        ),
+        migrations.RunPython(build_rating_summaries, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_hotel_search_index'),
+        ('bookings', '0013_hotel_rating_summary'),
+        ('rooms', '0004_available_rooms_non_negative'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['room', 'status', '-created_at'], name='booking_room_status_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_hotel_search_index'),
+        ('bookings', '0014_booking_room_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='hotel',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='hotel_bookings', to='accounts.profile'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:51
+
+from django.db import migrations, transaction
+from django.db.models import Max, OuterRef, Subquery
+
+BATCH_SIZE = 1000
+
+
+def backfill_booking_hotel(apps, schema_editor):
+    booking_model = apps.get_model("bookings", "Booking")
+    room_model = apps.get_model("rooms", "Room")
+    room_hotel = room_model.objects.filter(id=OuterRef("room_id")).values("hotel_id")
+    last_id = booking_model.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    for batch_start in range(0, last_id + 1, BATCH_SIZE):
+        with transaction.atomic():
+            booking_model.objects.filter(
+                id__gte=batch_start,
+                id__lt=batch_start + BATCH_SIZE,
+                hotel__isnull=True,
+            ).update(hotel_id=Subquery(room_hotel))
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own so a large table is never locked for the whole backfill.
+    atomic = False
+
+    dependencies = [
+        ('bookings', '0015_booking_hotel'),
+        ('rooms', '0004_available_rooms_non_negative'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_booking_hotel, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_hotel_search_index'),
+        ('bookings', '0016_backfill_booking_hotel'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='hotel',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='hotel_bookings', to='accounts.profile'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['hotel', '-created_at', '-id'], name='booking_hotel_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:02
+
+from datetime import timedelta
+
+from django.db import migrations, transaction
+from django.db.models import F, Max
+
+BATCH_SIZE = 1000
+PENDING_PAYMENT_EXPIRY_HOURS = 12
+
+
+def backfill_expired_payment_deadlines(apps, schema_editor):
+    booking_model = apps.get_model("bookings", "Booking")
+    last_id = booking_model.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    for batch_start in range(0, last_id + 1, BATCH_SIZE):
+        with transaction.atomic():
+            booking_model.objects.filter(
+                id__gte=batch_start,
+                id__lt=batch_start + BATCH_SIZE,
+                status="expired",
+                payment_option="pay_later",
+                payment_due_at__isnull=True,
+            ).update(payment_due_at=F("created_at") + timedelta(hours=PENDING_PAYMENT_EXPIRY_HOURS))
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own so a large table is never locked for the whole backfill.
+    atomic = False
+
+    dependencies = [
+        ('bookings', '0017_booking_hotel_recent_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_expired_payment_deadlines, reverse_code=migrations.RunPython.noop),
+    ]
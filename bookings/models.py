@@ -1,14 +1,231 @@
 from datetime import timedelta
 
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, Count, Exists, F, Max, OuterRef, Q, Subquery, Sum, Value, When, Window
+from django.db.models.functions import Coalesce, Greatest, RowNumber
+from django.urls import reverse
 from django.utils import timezone
 
 from accounts.models import Profile
-from rooms.models import Room
+from accounts.search import invalidate_hotel_searches
+from rooms.models import Room, RoomNight
+
+from .inbox_events import publish_inbox_change
+
+
+class BookingQuerySet(models.QuerySet):
+	def bulk_create(self, objs, *args, **kwargs):
+		"""Copy each booking's ``hotel`` from its room, reading only rooms not already loaded."""
+		objs = list(objs)
+		unloaded_room_ids = {
+			booking.room_id
+			for booking in objs
+			if booking.hotel_id is None and not Booking.room.is_cached(booking)
+		}
+		hotel_ids = {}
+		if unloaded_room_ids:
+			hotel_ids = dict(Room.objects.filter(id__in=unloaded_room_ids).values_list("id", "hotel_id"))
+		for booking in objs:
+			if booking.hotel_id is None and Booking.room.is_cached(booking):
+				booking.hotel_id = booking.room.hotel_id
+			elif booking.hotel_id is None:
+				booking.hotel_id = hotel_ids.get(booking.room_id)
+		return super().bulk_create(objs, *args, **kwargs)
+
+	def _overdue_condition(self, now) -> Q:
+		return Q(
+			status=self.model.Status.PENDING,
+			payment_option=self.model.PaymentOption.PAY_LATER,
+			payment_due_at__lte=now,
+		)
+
+	def _past_checkout_condition(self, now) -> Q:
+		return Q(
+			status=self.model.Status.CONFIRMED,
+			completes_on__lte=now.date(),
+		)
+
+	def overdue(self, *, now=None):
+		return self.filter(self._overdue_condition(now or timezone.now()))
+
+	def past_checkout(self, *, now=None):
+		return self.filter(self._past_checkout_condition(now or timezone.now()))
+
+	def with_effective_state(self, *, now=None):
+		"""Annotate ``effective_state``: the status the sweeper would persist right now."""
+		now = now or timezone.now()
+		return self.annotate(
+			effective_state=Case(
+				When(self._overdue_condition(now), then=Value(self.model.Status.EXPIRED.value)),
+				When(self._past_checkout_condition(now), then=Value(self.model.Status.COMPLETED.value)),
+				default=F("status"),
+				output_field=models.CharField(max_length=20),
+			)
+		)
+
+	def effective_state_counts(self, *, now=None) -> dict[str, int]:
+		rows = (
+			self.with_effective_state(now=now)
+			.order_by()
+			.values("effective_state")
+			.annotate(total=Count("id"))
+		)
+		return {row["effective_state"]: row["total"] for row in rows}
+
+	def expire_overdue(self, *, now=None):
+		return self.overdue(now=now).transition(
+			self.model.Status.PENDING,
+			self.model.Status.EXPIRED,
+			release_inventory=True,
+		)
+
+	def complete_past_checkout(self, *, now=None):
+		return self.past_checkout(now=now).transition(
+			self.model.Status.CONFIRMED,
+			self.model.Status.COMPLETED,
+		)
+
+	def cancel(self):
+		return self.transition(
+			self.model.Status.PENDING,
+			self.model.Status.CANCELED,
+			release_inventory=True,
+		)
 
+	def transition(self, from_status: str, to_status: str, *, release_inventory: bool = False):
+		"""Move every matching ``from_status`` booking to ``to_status`` in one UPDATE.
+
+		Returns a queryset over exactly the bookings that changed.
+		"""
+		with transaction.atomic():
+			booking_ids = list(
+				self.filter(status=from_status)
+				.select_for_update()
+				.order_by()
+				.values_list("id", flat=True)
+			)
+			if not booking_ids:
+				return self.none()
+
+			self.model.objects.filter(id__in=booking_ids, status=from_status).update(
+				status=to_status,
+				# An expired booking keeps the deadline it missed.
+				payment_due_at=F("payment_due_at") if to_status == self.model.Status.EXPIRED else None,
+				completes_on=F("checkout_date") if to_status == self.model.Status.CONFIRMED else None,
+			)
+			transitioned = self.model.objects.filter(id__in=booking_ids)
+			if release_inventory:
+				transitioned.release_room_nights()
+			transitioned.create_status_notifications()
+		return transitioned
+
+	def release_room_nights(self):
+		"""Give the booked nights back to the ledger in one grouped UPDATE and refresh the rooms' headlines."""
+		booking_ids = self.order_by().values("id")
+		stays = list(
+			self.model.objects.filter(id__in=booking_ids).values_list(
+				"room_id", "hotel_id", "checkin_date", "checkout_date"
+			)
+		)
+		if not stays:
+			return
+		room_ids, hotel_ids, checkin_dates, checkout_dates = (set(column) for column in zip(*stays))
+		covering_bookings = self.model.objects.filter(
+			Q(checkout_date__gt=OuterRef("night")) | Q(checkin_date=OuterRef("night")),
+			id__in=booking_ids,
+			room_id=OuterRef("room_id"),
+			checkin_date__lte=OuterRef("night"),
+		)
+		released_rooms = (
+			covering_bookings.order_by()
+			.values("room_id")
+			.annotate(total=Sum("rooms_count"))
+			.values("total")
+		)
+		# Bound the ledger rows first so the UPDATE seeks on (room, night).
+		RoomNight.objects.filter(
+			Exists(covering_bookings),
+			room_id__in=room_ids,
+			night__range=(min(checkin_dates), max(checkout_dates)),
+		).update(
+			available_rooms=F("available_rooms") + Subquery(released_rooms)
+		)
+		released_nights = {
+			night
+			for _, _, checkin_date, checkout_date in stays
+			for night in Room.night_dates(checkin_date, checkout_date)
+		}
+		invalidate_hotel_searches(hotel_ids, changed_nights=released_nights)
+		Room.refresh_available_rooms(room_ids)
 
-class Booking(models.Model):
+	def create_status_notifications(self):
+		"""Notify guest and hotel of each booking's current status with one INSERT."""
+		notifications = []
+		for booking_id, guest_id, hotel_id, status in self.order_by().values_list(
+			"id",
+			"guest_id",
+			"hotel_id",
+			"status",
+		):
+			notifications.extend(
+				self.model.build_status_notifications(
+					booking_id=booking_id,
+					guest_id=guest_id,
+					hotel_id=hotel_id,
+					status=status,
+				)
+			)
+		BookingNotification.objects.bulk_create(notifications, ignore_conflicts=True)
+		NotificationInbox.refresh({notification.recipient_id for notification in notifications})
+
+
+class PersistedFieldsMixin:
+	"""Remember the ``TRACKED_FIELDS`` values an instance was loaded or last saved with."""
+
+	TRACKED_FIELDS: tuple[str, ...] = ()
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		instance._persisted_values = {
+			name: value for name, value in zip(field_names, values) if name in cls.TRACKED_FIELDS
+		}
+		return instance
+
+	def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+		super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+		self.remember_persisted_values(fields)
+
+	def remember_persisted_values(self, fields=None):
+		snapshot = getattr(self, "_persisted_values", {})
+		snapshot.update(
+			(name, getattr(self, name))
+			for name in self.TRACKED_FIELDS
+			if fields is None or name in fields
+		)
+		self._persisted_values = snapshot
+
+	def persisted_values(self):
+		"""Return the stored tracked values, reading only those never loaded.
+
+		Returns ``None`` when the row no longer exists.
+		"""
+		snapshot = getattr(self, "_persisted_values", {})
+		missing_fields = [name for name in self.TRACKED_FIELDS if name not in snapshot]
+		if missing_fields:
+			stored = type(self)._base_manager.filter(pk=self.pk).values(*missing_fields).first()
+			if stored is None:
+				return None
+			snapshot.update(stored)
+			self._persisted_values = snapshot
+		return dict(snapshot)
+
+
+class Booking(PersistedFieldsMixin, models.Model):
 	PENDING_PAYMENT_EXPIRY_HOURS = 12
+	TRACKED_FIELDS = ("status",)
 
 	class PaymentOption(models.TextChoices):
 		PAY_NOW = "pay_now", "Pay now"
@@ -23,10 +240,14 @@ class Booking(models.Model):
 
 	guest = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="bookings")
 	room = models.ForeignKey(Room, on_delete=models.PROTECT, related_name="bookings")
+	# The room's hotel, copied so hotel-side history pages read one index range.
+	hotel = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="hotel_bookings", editable=False)
 	guest_name = models.CharField(max_length=150)
 	guest_email = models.EmailField()
 	guest_phone = models.CharField(max_length=30, blank=True, default="")
 	rooms_count = models.PositiveIntegerField(default=1)
+	checkin_date = models.DateField(blank=True)
+	checkout_date = models.DateField(blank=True)
 	payment_option = models.CharField(
 		max_length=20,
 		choices=PaymentOption.choices,
@@ -38,6 +259,28 @@ class Booking(models.Model):
 		default=Status.PENDING,
 	)
 	created_at = models.DateTimeField(auto_now_add=True)
+	payment_due_at = models.DateTimeField(null=True, blank=True, editable=False)
+	completes_on = models.DateField(null=True, blank=True, editable=False)
+
+	objects = BookingQuerySet.as_manager()
+
+	class Meta:
+		indexes = [
+			models.Index(fields=["guest", "-created_at", "-id"], name="booking_guest_recent_idx"),
+			models.Index(fields=["room", "-created_at", "-id"], name="booking_room_recent_idx"),
+			models.Index(fields=["hotel", "-created_at", "-id"], name="booking_hotel_recent_idx"),
+			models.Index(fields=["room", "status", "-created_at"], name="booking_room_status_idx"),
+			models.Index(
+				fields=["payment_due_at"],
+				condition=Q(status="pending", payment_option="pay_later"),
+				name="booking_payment_due_idx",
+			),
+			models.Index(
+				fields=["completes_on"],
+				condition=Q(status="confirmed"),
+				name="booking_completes_on_idx",
+			),
+		]
 
 	STATUS_NOTIFICATION_MESSAGES = {
 		Status.PENDING: "Booking is pending payment.",
@@ -51,40 +294,91 @@ class Booking(models.Model):
 		was_adding = self._state.adding
 		previous_status = None
 		if not was_adding and self.pk:
-			previous_status = (
-				Booking.objects.filter(id=self.pk).values_list("status", flat=True).first()
-			)
+			previous_values = self.persisted_values()
+			previous_status = previous_values["status"] if previous_values else None
 
 		if was_adding:
+			if self.hotel_id is None:
+				self.hotel_id = self.room.hotel_id
+			if self.checkin_date is None:
+				self.checkin_date = self.room.checkin_date
+			if self.checkout_date is None:
+				self.checkout_date = self.room.checkout_date
 			if self.payment_option == self.PaymentOption.PAY_NOW:
 				self.status = self.Status.CONFIRMED
 			else:
 				self.status = self.Status.PENDING
+
+		self.assign_deadlines()
+		update_fields = kwargs.get("update_fields")
+		if update_fields is not None and "status" in update_fields:
+			kwargs["update_fields"] = {*update_fields, "payment_due_at", "completes_on"}
 		super().save(*args, **kwargs)
+		self.remember_persisted_values(kwargs.get("update_fields"))
 
 		if was_adding or previous_status != self.status:
 			self.create_status_notifications()
 
+	def assign_deadlines(self):
+		"""Set the deadline columns the sweeper scans for this booking's status.
+
+		A pay-later booking keeps the payment deadline it was given, also once
+		expired, so history pages show the deadline the sweeper enforced.
+		"""
+		payment_due_at = self.payment_due_at
+		self.payment_due_at = None
+		self.completes_on = None
+		if self.payment_option == self.PaymentOption.PAY_LATER and self.status in {
+			self.Status.PENDING,
+			self.Status.EXPIRED,
+		}:
+			self.payment_due_at = payment_due_at or (self.created_at or timezone.now()) + timedelta(
+				hours=self.PENDING_PAYMENT_EXPIRY_HOURS
+			)
+		elif self.status == self.Status.CONFIRMED:
+			self.completes_on = self.checkout_date
+
+	@property
+	def nights(self):
+		return Room.night_dates(self.checkin_date, self.checkout_date)
+
+	@classmethod
+	def build_status_notifications(cls, *, booking_id, guest_id, hotel_id, status):
+		message = cls.STATUS_NOTIFICATION_MESSAGES.get(status, "Booking status updated.")
+		return [
+			BookingNotification(
+				recipient_id=recipient_id,
+				booking_id=booking_id,
+				status=status,
+				message=message,
+			)
+			for recipient_id in {guest_id, hotel_id}
+		]
+
 	def create_status_notifications(self):
 		if not self.pk or not self.room_id or not self.guest_id:
 			return
 
-		room_hotel_id = Room.objects.filter(id=self.room_id).values_list("hotel_id", flat=True).first()
+		if self.hotel_id is not None:
+			room_hotel_id = self.hotel_id
+		elif Booking.room.is_cached(self):
+			room_hotel_id = self.room.hotel_id
+		else:
+			room_hotel_id = Room.objects.filter(id=self.room_id).values_list("hotel_id", flat=True).first()
 		if room_hotel_id is None:
 			return
 
-		message = self.STATUS_NOTIFICATION_MESSAGES.get(self.status, "Booking status updated.")
-		recipient_ids = {self.guest_id, room_hotel_id}
-
-		for recipient_id in recipient_ids:
-			BookingNotification.objects.get_or_create(
-				recipient_id=recipient_id,
-				booking=self,
+		# Existing (recipient, booking, status) rows are skipped by the unique constraint.
+		BookingNotification.objects.bulk_create(
+			self.build_status_notifications(
+				booking_id=self.pk,
+				guest_id=self.guest_id,
+				hotel_id=room_hotel_id,
 				status=self.status,
-				defaults={
-					"message": message,
-				},
-			)
+			),
+			ignore_conflicts=True,
+		)
+		NotificationInbox.refresh({self.guest_id, room_hotel_id})
 
 	def should_expire_pending_payment(self, *, now=None) -> bool:
 		now = now or timezone.now()
@@ -92,18 +386,18 @@ class Booking(models.Model):
 			return False
 		if self.payment_option != self.PaymentOption.PAY_LATER:
 			return False
-		if not self.created_at:
+		if not self.payment_due_at:
 			return False
-		expiry_time = self.created_at + timedelta(hours=self.PENDING_PAYMENT_EXPIRY_HOURS)
-		return now >= expiry_time
+		return now >= self.payment_due_at
 
 	def should_complete_confirmed_booking(self, *, now=None) -> bool:
 		now = now or timezone.now()
 		if self.status != self.Status.CONFIRMED:
 			return False
-		if not self.room_id or not self.room.checkout_date:
+		checkout_date = self.checkout_date or (self.room.checkout_date if self.room_id else None)
+		if not checkout_date:
 			return False
-		return now.date() >= self.room.checkout_date
+		return now.date() >= checkout_date
 
 	def refresh_status(self, *, now=None, save=True):
 		if self.should_expire_pending_payment(now=now):
@@ -114,13 +408,57 @@ class Booking(models.Model):
 			return self.status
 		if save and self.pk:
 			self.save(update_fields=["status"])
+			if self.status == self.Status.EXPIRED:
+				Booking.objects.filter(id=self.pk).release_room_nights()
 		return self.status
 
 	def __str__(self) -> str:
 		return f"Booking #{self.id} - {self.guest_name}"
 
 
+class BookingNotificationQuerySet(models.QuerySet):
+	def unread(self):
+		"""Notifications that are neither clicked nor under the recipient's read cursor."""
+		read_through = NotificationInbox.objects.filter(recipient_id=OuterRef("recipient_id")).values(
+			"read_through_id"
+		)
+		return self.filter(is_read=False, id__gt=Coalesce(Subquery(read_through), 0))
+
+	def read(self):
+		"""Notifications the recipient clicked or passed with "mark all read"."""
+		read_through = NotificationInbox.objects.filter(recipient_id=OuterRef("recipient_id")).values(
+			"read_through_id"
+		)
+		return self.filter(Q(is_read=True) | Q(id__lte=Coalesce(Subquery(read_through), 0)))
+
+	def unread_counts(self) -> dict[int, int]:
+		return dict(
+			self.unread()
+			.order_by()
+			.values("recipient_id")
+			.annotate(total=Count("id"))
+			.values_list("recipient_id", "total")
+		)
+
+	def mark_read(self) -> int:
+		"""Flag individual notifications read and take them off their recipients' unread counts."""
+		unread_counts = self.unread_counts()
+		if not unread_counts:
+			return 0
+		marked = self.unread().update(is_read=True)
+		NotificationInbox.discount_unread(unread_counts)
+		return marked
+
+	def delete(self):
+		unread_counts = self.unread_counts()
+		deleted = super().delete()
+		NotificationInbox.discount_unread(unread_counts)
+		return deleted
+
+
 class BookingNotification(models.Model):
+	MENU_SIZE = 8
+
 	class Type(models.TextChoices):
 		PENDING = Booking.Status.PENDING, "Pending"
 		CONFIRMED = Booking.Status.CONFIRMED, "Confirmed"
@@ -145,6 +483,8 @@ class BookingNotification(models.Model):
 	is_read = models.BooleanField(default=False)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	objects = BookingNotificationQuerySet.as_manager()
+
 	class Meta:
 		ordering = ("-created_at",)
 		constraints = [
@@ -153,12 +493,217 @@ class BookingNotification(models.Model):
 				name="unique_booking_status_notification_per_recipient",
 			)
 		]
+		indexes = [
+			models.Index(
+				fields=["recipient", "id"],
+				name="notification_unread_idx",
+				condition=Q(is_read=False),
+			),
+			models.Index(fields=["created_at"], name="notification_created_idx"),
+		]
+
+	@staticmethod
+	def menu_cache_key(recipient_id) -> str:
+		return f"bookings:notification-menu:{recipient_id}"
+
+	@classmethod
+	def invalidate_menus(cls, recipient_ids):
+		recipient_ids = [recipient_id for recipient_id in recipient_ids if recipient_id]
+		if not recipient_ids:
+			return
+		keys = [cls.menu_cache_key(recipient_id) for recipient_id in recipient_ids]
+		# Drop now for this request and again on commit, so a menu rebuilt
+		# from pre-commit data by another request does not outlive the write.
+		cache.delete_many(keys)
+
+		def on_commit():
+			cache.delete_many(keys)
+			publish_inbox_change(recipient_ids)
+
+		transaction.on_commit(on_commit)
+
+	@classmethod
+	def unread_menu(cls, recipient_id) -> dict:
+		"""Return the recipient's newest unread notifications and unread count."""
+		cache_key = cls.menu_cache_key(recipient_id)
+		menu = cache.get(cache_key)
+		if menu is None:
+			inbox = NotificationInbox.objects.filter(recipient_id=recipient_id).values(
+				"read_through_id",
+				"last_notification_id",
+				"unread_count",
+			).first() or {"read_through_id": 0, "last_notification_id": 0, "unread_count": 0}
+			notifications = []
+			if inbox["unread_count"]:
+				notifications = list(
+					cls.objects.filter(
+						recipient_id=recipient_id,
+						is_read=False,
+						id__gt=inbox["read_through_id"],
+					).order_by("-id")[: cls.MENU_SIZE]
+				)
+			menu = {
+				"notifications": notifications,
+				"unread_count": inbox["unread_count"],
+				"last_notification_id": inbox["last_notification_id"],
+			}
+			cache.set(cache_key, menu, settings.BOOKING_NOTIFICATIONS_CACHE_TIMEOUT)
+		return menu
+
+	def history_url_for(self, account_type: str) -> str:
+		"""Return the page a recipient of ``account_type`` lands on from this notification."""
+		if account_type == Profile.AccountType.HOTEL and self.status in {
+			self.Type.REVIEW_ADDED,
+			self.Type.REVIEW_UPDATED,
+		}:
+			return f"{reverse('hotel_reviews')}?notification={self.id}"
+		history_url_name = (
+			"hotel_booking_history" if account_type == Profile.AccountType.HOTEL else "booking_history"
+		)
+		return f"{reverse(history_url_name)}?state=all&notification={self.id}#booking-{self.booking_id}"
+
+	def save(self, *args, **kwargs):
+		super().save(*args, **kwargs)
+		NotificationInbox.refresh([self.recipient_id])
+
+	def delete(self, *args, **kwargs):
+		unread_counts = type(self).objects.filter(pk=self.pk).unread_counts()
+		deleted = super().delete(*args, **kwargs)
+		NotificationInbox.discount_unread(unread_counts)
+		return deleted
 
 	def __str__(self) -> str:
 		return f"{self.recipient.full_name}: booking #{self.booking_id} {self.status}"
 
 
-class BookingReview(models.Model):
+class ArchivedBookingNotification(models.Model):
+	"""A read notification moved out of the live table by ``purge_notifications``."""
+
+	original_id = models.BigIntegerField(unique=True)
+	recipient_id = models.BigIntegerField(db_index=True)
+	booking_id = models.BigIntegerField()
+	status = models.CharField(max_length=20, choices=BookingNotification.Type.choices)
+	message = models.CharField(max_length=255)
+	created_at = models.DateTimeField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	def __str__(self) -> str:
+		return f"Archived notification #{self.original_id} for booking #{self.booking_id}"
+
+
+class NotificationInbox(models.Model):
+	"""Per-recipient read cursor and unread counter for booking notifications.
+
+	Notifications with an id at or below ``read_through_id`` count as read, so
+	marking everything read only moves the cursor up to ``last_notification_id``.
+	``refresh`` recounts ``unread_count`` from the unread rows above the cursor
+	whenever notifications are created, so concurrent fan-outs cannot lose or
+	double-count one; reads and deletes take their own rows off it.
+	"""
+
+	recipient = models.OneToOneField(
+		Profile,
+		on_delete=models.CASCADE,
+		related_name="notification_inbox",
+	)
+	read_through_id = models.PositiveBigIntegerField(default=0)
+	last_notification_id = models.PositiveBigIntegerField(default=0)
+	unread_count = models.PositiveIntegerField(default=0)
+
+	@classmethod
+	def _ensure(cls, recipient_ids) -> set:
+		recipient_ids = {recipient_id for recipient_id in recipient_ids if recipient_id}
+		if recipient_ids:
+			cls.objects.bulk_create(
+				[cls(recipient_id=recipient_id) for recipient_id in recipient_ids],
+				ignore_conflicts=True,
+			)
+		return recipient_ids
+
+	@classmethod
+	def discount_unread(cls, unread_counts: dict[int, int]):
+		"""Take ``unread_counts[recipient_id]`` notifications off each inbox's unread count."""
+		if not unread_counts:
+			return
+		discount = Case(
+			*(When(recipient_id=recipient_id, then=Value(count)) for recipient_id, count in unread_counts.items()),
+			default=Value(0),
+		)
+		cls.objects.filter(recipient_id__in=unread_counts).update(
+			unread_count=Greatest(F("unread_count") - discount, 0)
+		)
+		BookingNotification.invalidate_menus(unread_counts)
+
+	@classmethod
+	def refresh(cls, recipient_ids):
+		"""Recount the notifications above each recipient's read cursor.
+
+		The count seeks ``notification_unread_idx``, so it only reads the
+		recipient's unread rows, however many notifications they have.
+		"""
+		recipient_ids = cls._ensure(recipient_ids)
+		if not recipient_ids:
+			return
+		recipient_notifications = BookingNotification.objects.filter(
+			recipient_id=OuterRef("recipient_id")
+		).order_by()
+		unread_total = (
+			recipient_notifications.filter(is_read=False, id__gt=OuterRef("read_through_id"))
+			.values("recipient_id")
+			.annotate(total=Count("id"))
+			.values("total")
+		)
+		last_notification = (
+			recipient_notifications.values("recipient_id").annotate(last_id=Max("id")).values("last_id")
+		)
+		cls.objects.filter(recipient_id__in=recipient_ids).update(
+			unread_count=Coalesce(Subquery(unread_total), 0),
+			last_notification_id=Coalesce(Subquery(last_notification), 0),
+		)
+		BookingNotification.invalidate_menus(recipient_ids)
+
+	@classmethod
+	def mark_all_read(cls, recipient_id) -> int:
+		"""Move the read cursor past every notification with a single-row UPDATE."""
+		marked = cls.objects.filter(recipient_id=recipient_id).update(
+			read_through_id=F("last_notification_id"),
+			unread_count=0,
+		)
+		BookingNotification.invalidate_menus([recipient_id])
+		return marked
+
+	def __str__(self) -> str:
+		return f"{self.recipient.full_name}: {self.unread_count} unread"
+
+
+class BookingReviewQuerySet(models.QuerySet):
+	def published(self):
+		"""Reviews that count toward a hotel's public rating."""
+		return self.filter(booking__status__in=[Booking.Status.CONFIRMED, Booking.Status.COMPLETED])
+
+	def recent_per_hotel(self, hotel_ids, *, limit: int):
+		"""The ``limit`` newest published reviews of each hotel in one query.
+
+		A ``ROW_NUMBER()`` window ranks reviews within each hotel, so only the
+		kept rows leave the database, with booking, guest and room joined.
+		"""
+		return (
+			self.published()
+			.filter(booking__room__hotel_id__in=hotel_ids)
+			.select_related("booking", "booking__guest", "booking__room")
+			.annotate(
+				recent_rank=Window(
+					RowNumber(),
+					partition_by=F("booking__room__hotel_id"),
+					order_by=[F("created_at").desc(), F("id").desc()],
+				)
+			)
+			.filter(recent_rank__lte=limit)
+			.order_by("booking__room__hotel_id", "recent_rank")
+		)
+
+
+class BookingReview(PersistedFieldsMixin, models.Model):
 	class Rating(models.IntegerChoices):
 		ONE = 1, "1"
 		TWO = 2, "2"
@@ -176,6 +721,10 @@ class BookingReview(models.Model):
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	TRACKED_FIELDS = ("rating", "comment")
+
+	objects = BookingReviewQuerySet.as_manager()
+
 	class Meta:
 		ordering = ("-created_at",)
 
@@ -183,28 +732,53 @@ class BookingReview(models.Model):
 		was_adding = self._state.adding
 		previous_values = None
 		if not was_adding and self.pk:
-			previous_values = BookingReview.objects.filter(id=self.pk).values("rating", "comment").first()
+			previous_values = self.persisted_values()
 
-		super().save(*args, **kwargs)
-
-		should_notify_updated_review = (
-			not was_adding
-			and previous_values is not None
-			and (
-				previous_values["rating"] != self.rating
-				or (previous_values["comment"] or "") != (self.comment or "")
-			)
-		)
+		previous_rating = previous_values["rating"] if previous_values else None
+		rating_changed = was_adding or (previous_values is not None and previous_rating != self.rating)
+		notification_type = None
 		if was_adding:
-			self.notify_hotel_review_event(notification_type=BookingNotification.Type.REVIEW_ADDED)
-		elif should_notify_updated_review:
-			self.notify_hotel_review_event(notification_type=BookingNotification.Type.REVIEW_UPDATED)
+			notification_type = BookingNotification.Type.REVIEW_ADDED
+		elif previous_values is not None and (
+			previous_values["rating"] != self.rating
+			or (previous_values["comment"] or "") != (self.comment or "")
+		):
+			notification_type = BookingNotification.Type.REVIEW_UPDATED
+
+		if rating_changed or notification_type:
+			# The review, its hotel's rating summary and the hotel's notification
+			# are written in one transaction, from one read of the booking.
+			with transaction.atomic():
+				super().save(*args, **kwargs)
+				stay = self.stay()
+				if rating_changed:
+					HotelRatingSummary.record_review(
+						self.booking_id,
+						added=self.rating,
+						removed=previous_rating,
+						stay=stay,
+					)
+				if notification_type and stay is not None:
+					self.notify_hotel_review_event(
+						notification_type=notification_type,
+						hotel_id=stay["room__hotel_id"],
+					)
+		else:
+			super().save(*args, **kwargs)
+		self.remember_persisted_values(kwargs.get("update_fields"))
 
-	def notify_hotel_review_event(self, *, notification_type: str):
+	def stay(self) -> dict | None:
+		"""The booking's ``room__hotel_id`` and ``status``, from the loaded booking and room if possible."""
+		if BookingReview.booking.is_cached(self) and Booking.room.is_cached(self.booking):
+			return {"room__hotel_id": self.booking.room.hotel_id, "status": self.booking.status}
+		return Booking.objects.filter(id=self.booking_id).values("room__hotel_id", "status").first()
+
+	def notify_hotel_review_event(self, *, notification_type: str, hotel_id=None):
 		if not self.pk or not self.booking_id:
 			return
 
-		hotel_id = Room.objects.filter(bookings__id=self.booking_id).values_list("hotel_id", flat=True).first()
+		if hotel_id is None:
+			hotel_id = Room.objects.filter(bookings__id=self.booking_id).values_list("hotel_id", flat=True).first()
 		if hotel_id is None:
 			return
 
@@ -213,19 +787,132 @@ class BookingReview(models.Model):
 		else:
 			message = "A guest updated their rating and review."
 
-		notification, _ = BookingNotification.objects.get_or_create(
-			recipient_id=hotel_id,
-			booking_id=self.booking_id,
-			status=notification_type,
-			defaults={
-				"message": message,
-			},
+		# Re-raise as a fresh row so the notification lands above the read cursor.
+		with transaction.atomic(savepoint=False):
+			BookingNotification.objects.filter(
+				recipient_id=hotel_id,
+				booking_id=self.booking_id,
+				status=notification_type,
+			).delete()
+			BookingNotification.objects.create(
+				recipient_id=hotel_id,
+				booking_id=self.booking_id,
+				status=notification_type,
+				message=message,
+			)
+
+	def __str__(self) -> str:
+		return f"Review for booking #{self.booking_id} ({self.rating}/5)"
+
+
+class HotelRatingSummary(models.Model):
+	"""Review count, rating sum and 1-5 histogram for one hotel.
+
+	Only reviews of confirmed or completed bookings are counted, matching the
+	public rating. ``BookingReview`` keeps it current; ``rebuild_rating_summaries``
+	recomputes it from the reviews.
+	"""
+
+	RATED_STATUSES = (Booking.Status.CONFIRMED, Booking.Status.COMPLETED)
+	RATING_FIELDS = {rating: f"rating_{rating}" for rating in BookingReview.Rating.values}
+
+	hotel = models.OneToOneField(
+		Profile,
+		on_delete=models.CASCADE,
+		related_name="rating_summary",
+	)
+	review_count = models.PositiveIntegerField(default=0)
+	rating_sum = models.PositiveIntegerField(default=0)
+	rating_1 = models.PositiveIntegerField(default=0)
+	rating_2 = models.PositiveIntegerField(default=0)
+	rating_3 = models.PositiveIntegerField(default=0)
+	rating_4 = models.PositiveIntegerField(default=0)
+	rating_5 = models.PositiveIntegerField(default=0)
+
+	@classmethod
+	def for_hotel(cls, hotel_id) -> "HotelRatingSummary":
+		return cls.objects.filter(hotel_id=hotel_id).first() or cls(hotel_id=hotel_id)
+
+	@classmethod
+	def record_review(
+		cls,
+		booking_id,
+		*,
+		added: int | None = None,
+		removed: int | None = None,
+		stay: dict | None = None,
+	):
+		"""Apply one review being added, removed or re-rated to its hotel's row.
+
+		``stay`` is the booking's ``room__hotel_id`` and ``status``, when the caller has them.
+		"""
+		booking = stay or Booking.objects.filter(id=booking_id).values("room__hotel_id", "status").first()
+		if booking is None or booking["status"] not in cls.RATED_STATUSES:
+			return
+
+		changes = {}
+		for rating, step in ((added, 1), (removed, -1)):
+			if rating is None:
+				continue
+			for field, delta in (
+				("review_count", step),
+				("rating_sum", step * rating),
+				(cls.RATING_FIELDS[rating], step),
+			):
+				changes[field] = changes.get(field, 0) + delta
+		changes = {field: F(field) + delta for field, delta in changes.items() if delta}
+		if not changes:
+			return
+
+		with transaction.atomic(savepoint=False):
+			cls.objects.bulk_create([cls(hotel_id=booking["room__hotel_id"])], ignore_conflicts=True)
+			cls.objects.filter(hotel_id=booking["room__hotel_id"]).update(**changes)
+		invalidate_hotel_searches([booking["room__hotel_id"]], ratings_changed=True)
+
+	@classmethod
+	def rebuild(cls, hotel_ids=None) -> int:
+		"""Recompute summaries from the reviews and return how many were written."""
+		reviews = BookingReview.objects.filter(booking__status__in=cls.RATED_STATUSES)
+		summaries = cls.objects.all()
+		if hotel_ids is not None:
+			reviews = reviews.filter(booking__room__hotel_id__in=hotel_ids)
+			summaries = summaries.filter(hotel_id__in=hotel_ids)
+		rows = (
+			reviews.order_by()
+			.values("booking__room__hotel_id")
+			.annotate(
+				review_count=Count("id"),
+				rating_sum=Sum("rating"),
+				**{
+					field: Count("id", filter=Q(rating=rating))
+					for rating, field in cls.RATING_FIELDS.items()
+				},
+			)
 		)
+		rebuilt = [cls(hotel_id=row.pop("booking__room__hotel_id"), **row) for row in rows]
+		with transaction.atomic():
+			summaries.exclude(hotel_id__in=[summary.hotel_id for summary in rebuilt]).delete()
+			cls.objects.bulk_create(
+				rebuilt,
+				update_conflicts=True,
+				unique_fields=["hotel"],
+				update_fields=["review_count", "rating_sum", *cls.RATING_FIELDS.values()],
+			)
+		invalidate_hotel_searches(
+			hotel_ids if hotel_ids is not None else [summary.hotel_id for summary in rebuilt],
+			ratings_changed=True,
+		)
+		return len(rebuilt)
 
-		notification.message = message
-		notification.is_read = False
-		notification.created_at = timezone.now()
-		notification.save(update_fields=["message", "is_read", "created_at"])
+	@property
+	def avg_rating(self) -> float | None:
+		if not self.review_count:
+			return None
+		return round(self.rating_sum / self.review_count, 1)
+
+	@property
+	def rating_counts(self) -> dict[int, int]:
+		return {rating: getattr(self, field) for rating, field in self.RATING_FIELDS.items()}
 
 	def __str__(self) -> str:
-		return f"Review for booking #{self.booking_id} ({self.rating}/5)"
+		return f"{self.hotel.full_name}: {self.review_count} reviews"
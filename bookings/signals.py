@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+
+from .models import BookingReview, HotelRatingSummary
+
+
+def remove_review_from_summary(sender, instance, **kwargs):
+    HotelRatingSummary.record_review(instance.booking_id, removed=instance.rating)
+
+
+def connect_signals():
+    post_delete.connect(remove_review_from_summary, sender=BookingReview)
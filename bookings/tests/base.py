@@ -0,0 +1,48 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.models import Profile
+from rooms.models import Room, RoomType
+
+
+class BookingFixtureTestCase(TestCase):
+	"""A guest, a hotel and one of its rooms over the next night, with an empty cache."""
+
+	def setUp(self):
+		cache.clear()
+		user_model = get_user_model()
+		guest_user = user_model.objects.create_user(
+			username="guest_user",
+			email="guest@example.com",
+			password="pass1234",
+		)
+		hotel_user = user_model.objects.create_user(
+			username="hotel_user",
+			email="hotel@example.com",
+			password="pass1234",
+		)
+
+		self.guest_profile = guest_user.profile
+		self.guest_profile.full_name = "Guest User"
+		self.guest_profile.account_type = Profile.AccountType.GUEST
+		self.guest_profile.save(update_fields=["full_name", "account_type"])
+
+		self.hotel_profile = hotel_user.profile
+		self.hotel_profile.full_name = "Hotel User"
+		self.hotel_profile.account_type = Profile.AccountType.HOTEL
+		self.hotel_profile.save(update_fields=["full_name", "account_type"])
+
+		self.room_type = RoomType.objects.create(name="Deluxe")
+		today = datetime.date.today()
+		self.room = Room.objects.create(
+			hotel=self.hotel_profile,
+			room_type=self.room_type,
+			capacity=2,
+			rate_per_night="150.00",
+			available_rooms=2,
+			checkin_date=today + datetime.timedelta(days=1),
+			checkout_date=today + datetime.timedelta(days=2),
+		)
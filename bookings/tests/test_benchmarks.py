@@ -0,0 +1,44 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import Booking, BookingNotification, NotificationInbox
+
+
+class BenchmarkCommandTests(TestCase):
+	def test_seeded_dataset_is_deterministic_and_benchmark_writes_results(self):
+		def seed(*extra):
+			call_command(
+				"seed_benchmark_data",
+				"--hotels", "3", "--rooms-per-hotel", "2", "--guests", "5", "--bookings", "40", *extra,
+				stdout=StringIO(),
+			)
+			return list(
+				Booking.objects.filter(guest__user__username__startswith="bench-")
+				.order_by("id")
+				.values_list("room__hotel__full_name", "room__rate_per_night", "status", "checkin_date")
+			)
+
+		first = seed()
+		self.assertEqual(seed("--flush"), first)
+		self.assertEqual({status for *_, status, _ in first}, set(Booking.Status.values))
+		for inbox in NotificationInbox.objects.filter(recipient__user__username__startswith="bench-"):
+			self.assertEqual(
+				inbox.unread_count,
+				BookingNotification.objects.filter(recipient_id=inbox.recipient_id).unread().count(),
+			)
+
+		with tempfile.TemporaryDirectory() as directory:
+			output = Path(directory) / "results.json"
+			call_command("benchmark_views", "--iterations", "2", "--warmup", "0", "--output", str(output), stdout=StringIO())
+			report = json.loads(output.read_text())
+		views = {view["view"]: view for view in report["views"]}
+		self.assertEqual(report["dataset"]["bookings"], len(first))
+		self.assertIn("booking_history", views)
+		self.assertEqual(views["panel_bookings"]["status"], 200)
+		self.assertLessEqual(views["home_search"]["p50_ms"], views["home_search"]["p95_ms"])
+		self.assertGreater(views["hotel_reviews"]["queries"], 0)
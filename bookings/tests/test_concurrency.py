@@ -0,0 +1,163 @@
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Profile
+from rooms.models import Room, RoomNight, RoomType
+
+from ..management.commands.contention_benchmark import run_contention
+from ..models import Booking
+from ..transactions import run_in_transaction, write_atomic
+from ..writer import get_writer, run_write, stop_writer, writer_stats
+
+
+class ConcurrentCheckoutTests(TransactionTestCase):
+	INITIAL_ROOMS = 10
+	CHECKOUT_ATTEMPTS = 40
+
+	def setUp(self):
+		user_model = get_user_model()
+		guest_user = user_model.objects.create_user(username="guest_user", password="pass1234")
+		hotel_user = user_model.objects.create_user(username="hotel_user", password="pass1234")
+		self.guest_profile = guest_user.profile
+		self.hotel_profile = hotel_user.profile
+		self.hotel_profile.account_type = Profile.AccountType.HOTEL
+		self.hotel_profile.save(update_fields=["account_type"])
+
+		today = datetime.date.today()
+		self.room = Room.objects.create(
+			hotel=self.hotel_profile,
+			room_type=RoomType.objects.create(name="Deluxe"),
+			capacity=2,
+			rate_per_night="150.00",
+			available_rooms=self.INITIAL_ROOMS,
+			checkin_date=today + datetime.timedelta(days=1),
+			checkout_date=today + datetime.timedelta(days=3),
+		)
+
+	def reserve_and_book(self, attempt: int):
+		room = self.room
+		if not room.reserve_nights(1, room.checkin_date, room.checkout_date):
+			return None
+		return Booking.objects.create(
+			guest=self.guest_profile,
+			room=room,
+			guest_name=f"Guest {attempt}",
+			guest_email="guest@example.com",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+
+	def checkout_one_room(self, attempt: int):
+		try:
+			return run_in_transaction(lambda: self.reserve_and_book(attempt), attempts=50) is not None
+		finally:
+			connection.close()
+
+	def test_concurrent_checkouts_never_overbook(self):
+		with ThreadPoolExecutor(max_workers=8) as executor:
+			outcomes = list(executor.map(self.checkout_one_room, range(self.CHECKOUT_ATTEMPTS)))
+
+		booked_rooms = Booking.objects.filter(room=self.room).aggregate(total=Sum("rooms_count"))["total"]
+		# Every attempt either booked a room or was refused for lack of one.
+		self.assertEqual(outcomes.count(True), self.INITIAL_ROOMS)
+		self.assertEqual(outcomes.count(False), self.CHECKOUT_ATTEMPTS - self.INITIAL_ROOMS)
+		self.assertEqual(booked_rooms, self.INITIAL_ROOMS)
+		self.assertFalse(RoomNight.objects.filter(room=self.room).exclude(available_rooms=0).exists())
+
+	def test_contention_harness_keeps_inventory_invariant(self):
+		result = run_contention(workers=4, flows=4, inventory=5, cancel_share=0.5, pay_share=0.25, readers=1)
+
+		self.assertEqual(result["invariant_violations"], [])
+		self.assertEqual(result["requests"], 16 + result["canceled"] + result["paid"])
+		self.assertLessEqual(result["bookings"] - result["canceled"], 5)
+		self.assertGreater(result["bookings"], 0)
+		self.assertFalse(Room.objects.filter(hotel__user__username="contention-hotel").exists())
+		self.assertGreater(result["reads"], 0)
+
+	@skipUnless(settings.SQLITE_PROFILE == "production", "needs the production SQLite profile")
+	def test_production_sqlite_profile_applies_pragmas(self):
+		with connection.cursor() as cursor:
+			cursor.execute("PRAGMA synchronous")
+			synchronous = cursor.fetchone()[0]
+			cursor.execute("PRAGMA temp_store")
+			temp_store = cursor.fetchone()[0]
+		# NORMAL and MEMORY, from the production profile's init command.
+		self.assertEqual((synchronous, temp_store), (1, 2))
+
+	@override_settings(SQLITE_IMMEDIATE_WRITES=True)
+	def test_write_transactions_take_the_sqlite_write_lock_up_front(self):
+		with CaptureQueriesContext(connection) as queries:
+			with write_atomic():
+				self.assertTrue(Room.objects.filter(id=self.room.id).exists())
+			with transaction.atomic():
+				self.assertTrue(Room.objects.filter(id=self.room.id).exists())
+		begins = [query["sql"] for query in queries if query["sql"].startswith("BEGIN")]
+		self.assertEqual(begins, ["BEGIN IMMEDIATE", "BEGIN"])
+
+	@override_settings(BOOKING_SINGLE_WRITER=True, BOOKING_WRITER_MAX_WAIT=0.05)
+	def test_single_writer_commits_concurrent_mutations_in_groups(self):
+		self.addCleanup(stop_writer)
+		writer_stats(reset=True)
+
+		def checkout(attempt: int):
+			def mutation():
+				if attempt == 0:
+					raise ValueError("bad booking")
+				return self.reserve_and_book(attempt)
+
+			try:
+				return run_write(mutation) is not None
+			except ValueError:
+				return "failed"
+			finally:
+				connection.close()
+
+		with ThreadPoolExecutor(max_workers=8) as executor:
+			outcomes = list(executor.map(checkout, range(self.CHECKOUT_ATTEMPTS)))
+
+		stats = writer_stats(reset=True)
+		# The failing mutation rolls back alone; its group's other bookings commit.
+		self.assertEqual(outcomes[0], "failed")
+		self.assertEqual(outcomes.count(True), self.INITIAL_ROOMS)
+		self.assertEqual(Booking.objects.filter(room=self.room).count(), self.INITIAL_ROOMS)
+		self.assertEqual(self.room.available_rooms_for(self.room.checkin_date, self.room.checkout_date), 0)
+		self.assertEqual(stats["mutations"], self.CHECKOUT_ATTEMPTS)
+		self.assertLess(stats["groups"], self.CHECKOUT_ATTEMPTS)
+		self.assertGreater(stats["largest_group"], 1)
+
+	@override_settings(BOOKING_SINGLE_WRITER=True, BOOKING_WRITER_TIMEOUT=0.05)
+	def test_writer_skips_mutations_whose_callers_timed_out(self):
+		self.addCleanup(stop_writer)
+		release = threading.Event()
+		ran = []
+		blocker = get_writer().submit(lambda: release.wait(5))
+		while not blocker.running():
+			time.sleep(0.001)
+
+		with self.assertRaises(FutureTimeoutError):
+			run_write(lambda: ran.append("abandoned"))
+		release.set()
+		self.assertTrue(blocker.result(timeout=5))
+		self.assertEqual(run_write(lambda: ran.append("later") or "done"), "done")
+		self.assertEqual(ran, ["later"])
+
+	@override_settings(BOOKING_SINGLE_WRITER=True)
+	def test_writer_is_restarted_when_its_thread_dies(self):
+		self.addCleanup(stop_writer)
+		dead = get_writer()
+		dead.stop(timeout=5)
+		self.assertFalse(dead.is_alive())
+		stranded = dead.submit(lambda: "stranded")
+
+		self.assertEqual(run_write(lambda: "fresh"), "fresh")
+		self.assertIsNot(get_writer(), dead)
+		self.assertEqual(stranded.result(timeout=5), "stranded")
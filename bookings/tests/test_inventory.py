@@ -0,0 +1,73 @@
+import datetime
+
+from django.urls import reverse
+
+from rooms.models import Room, RoomNight
+
+from ..models import Booking
+from .base import BookingFixtureTestCase
+
+
+class RoomNightInventoryTests(BookingFixtureTestCase):
+	def test_checkout_reserves_only_the_booked_nights(self):
+		self.room.checkout_date = self.room.checkin_date + datetime.timedelta(days=3)
+		self.room.save(update_fields=["checkout_date"])
+		first_night = self.room.checkin_date
+
+		self.client.login(username="guest_user", password="pass1234")
+		response = self.client.post(
+			reverse("booking_checkout", kwargs={"room_id": self.room.id}),
+			{
+				"guest_name": "Guest User",
+				"guest_email": "guest@example.com",
+				"guest_phone": "1234567890",
+				"checkin_date": first_night.isoformat(),
+				"checkout_date": (first_night + datetime.timedelta(days=1)).isoformat(),
+				"rooms_count": 2,
+				"payment_option": Booking.PaymentOption.PAY_LATER,
+			},
+		)
+
+		self.assertEqual(response.status_code, 302)
+		booking = Booking.objects.get(room=self.room)
+		self.assertEqual(booking.nights, [first_night])
+		self.assertEqual(
+			dict(RoomNight.objects.filter(room=self.room).values_list("night", "available_rooms")),
+			{
+				first_night: 0,
+				first_night + datetime.timedelta(days=1): 2,
+				first_night + datetime.timedelta(days=2): 2,
+			},
+		)
+		self.assertEqual(self.room.available_rooms_for(self.room.checkin_date, self.room.checkout_date), 0)
+
+		response = self.client.post(reverse("booking_cancel", kwargs={"booking_id": booking.id}))
+
+		self.assertEqual(response.status_code, 302)
+		self.assertFalse(RoomNight.objects.filter(room=self.room, available_rooms__lt=2).exists())
+		self.assertEqual(self.room.available_rooms_for(self.room.checkin_date, self.room.checkout_date), 2)
+		self.room.refresh_from_db()
+		self.assertEqual(self.room.available_rooms, 2)
+
+	def test_editing_a_partly_booked_room_keeps_each_nights_bookings(self):
+		self.room.available_rooms = 5
+		self.room.checkout_date = self.room.checkin_date + datetime.timedelta(days=2)
+		self.room.save()
+		first_night, second_night = Room.night_dates(self.room.checkin_date, self.room.checkout_date)
+		self.assertTrue(self.room.reserve_nights(3, first_night, second_night))
+
+		room = Room.objects.get(id=self.room.id)
+		self.assertEqual(room.available_rooms, 2)
+		room.available_rooms = 4
+		room.checkout_date += datetime.timedelta(days=1)
+		room.save()
+
+		self.assertEqual(
+			dict(RoomNight.objects.filter(room=room).values_list("night", "available_rooms")),
+			{first_night: 4, second_night: 7, second_night + datetime.timedelta(days=1): 7},
+		)
+		self.assertFalse(room.reserve_nights(5, first_night, second_night))
+
+		room.available_rooms = 0
+		room.save(update_fields=["available_rooms"])
+		self.assertFalse(RoomNight.objects.filter(room=room, available_rooms__gt=0).exists())
@@ -0,0 +1,395 @@
+import asyncio
+import datetime
+import os
+import subprocess
+import sys
+import time
+from io import StringIO
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import (
+	ArchivedBookingNotification,
+	Booking,
+	BookingNotification,
+	BookingReview,
+	NotificationInbox,
+)
+from ..views import notification_events
+from .base import BookingFixtureTestCase
+
+
+class BookingNotificationTests(BookingFixtureTestCase):
+	def test_purge_archives_only_old_read_notifications_in_batches(self):
+		bookings = [
+			Booking.objects.create(
+				guest=self.guest_profile,
+				room=self.room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				guest_phone="1234567890",
+				payment_option=Booking.PaymentOption.PAY_LATER,
+			)
+			for _ in range(3)
+		]
+		NotificationInbox.mark_all_read(self.hotel_profile.id)
+		BookingNotification.objects.filter(recipient=self.guest_profile, booking=bookings[0]).mark_read()
+		BookingNotification.objects.update(created_at=timezone.now() - datetime.timedelta(days=100))
+		recent_read = BookingNotification.objects.create(
+			recipient=self.guest_profile,
+			booking=bookings[0],
+			status=BookingNotification.Type.CONFIRMED,
+			message="Booking is confirmed.",
+			is_read=True,
+		)
+
+		output = StringIO()
+		call_command("purge_notifications", "--archive", "--days", "90", "--batch-size", "3", stdout=output)
+
+		self.assertIn("4 notifications archived in 2 batches", output.getvalue())
+		self.assertEqual(
+			set(BookingNotification.objects.values_list("booking_id", flat=True)),
+			{bookings[0].id, bookings[1].id, bookings[2].id},
+		)
+		self.assertTrue(BookingNotification.objects.filter(id=recent_read.id).exists())
+		self.assertFalse(BookingNotification.objects.filter(recipient=self.hotel_profile).exists())
+		self.assertEqual(ArchivedBookingNotification.objects.count(), 4)
+		self.assertEqual(NotificationInbox.objects.get(recipient=self.guest_profile).unread_count, 2)
+
+	def test_status_change_creates_notifications_for_guest_and_hotel(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+
+		booking.payment_option = Booking.PaymentOption.PAY_NOW
+		booking.status = Booking.Status.CONFIRMED
+		booking.save(update_fields=["payment_option", "status"])
+
+		self.assertEqual(
+			BookingNotification.objects.filter(
+				booking=booking,
+				status=Booking.Status.CONFIRMED,
+			).count(),
+			2,
+		)
+
+	def test_status_notifications_fan_out_in_one_insert_and_skip_duplicates(self):
+		with self.assertNumQueries(4):
+			booking = Booking.objects.create(
+				guest=self.guest_profile,
+				room=self.room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				guest_phone="1234567890",
+				payment_option=Booking.PaymentOption.PAY_LATER,
+			)
+
+		with self.assertNumQueries(3):
+			booking.create_status_notifications()
+
+		self.assertEqual(
+			BookingNotification.objects.filter(booking=booking, status=Booking.Status.PENDING).count(),
+			2,
+		)
+
+	def test_guest_history_marks_notification_as_read(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		notification = BookingNotification.objects.get(
+			recipient=self.guest_profile,
+			booking=booking,
+			status=Booking.Status.PENDING,
+		)
+
+		self.client.login(username="guest_user", password="pass1234")
+		response = self.client.get(
+			f"{reverse('booking_history')}?state=all&notification={notification.id}"
+		)
+
+		self.assertEqual(response.status_code, 200)
+		notification.refresh_from_db()
+		self.assertTrue(notification.is_read)
+
+	def test_notification_menu_is_cached_until_notifications_change(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		self.client.login(username="guest_user", password="pass1234")
+
+		def notification_queries(url):
+			with CaptureQueriesContext(connection) as queries:
+				response = self.client.get(url)
+			self.assertEqual(response.status_code, 200)
+			return response, [
+				query
+				for query in queries
+				if "bookings_bookingnotification" in query["sql"] or "bookings_notificationinbox" in query["sql"]
+			]
+
+		response, queries = notification_queries(reverse("guest_profile"))
+		self.assertEqual(len(queries), 2)
+		self.assertEqual(response.context["booking_notifications_unread_count"], 1)
+
+		response, queries = notification_queries(reverse("guest_profile"))
+		self.assertEqual(queries, [])
+		self.assertEqual(len(response.context["booking_notifications"]), 1)
+
+		notification = BookingNotification.objects.get(recipient=self.guest_profile, booking=booking)
+		response, _ = notification_queries(f"{reverse('booking_history')}?notification={notification.id}")
+		self.assertEqual(response.context["booking_notifications_unread_count"], 0)
+
+		booking.status = Booking.Status.CONFIRMED
+		booking.save(update_fields=["status"])
+		response, queries = notification_queries(reverse("guest_profile"))
+		self.assertEqual(response.context["booking_notifications_unread_count"], 1)
+
+	def test_menu_invalidated_by_another_process_is_rebuilt_here(self):
+		Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		self.client.login(username="guest_user", password="pass1234")
+		self.assertEqual(self.client.get(reverse("guest_profile")).context["booking_notifications_unread_count"], 1)
+
+		# A write that skips this process's invalidation, as sweep_bookings' writes do.
+		BookingNotification.objects.filter(recipient=self.guest_profile).update(is_read=True)
+		NotificationInbox.objects.filter(recipient=self.guest_profile).update(unread_count=0)
+		self.assertEqual(self.client.get(reverse("guest_profile")).context["booking_notifications_unread_count"], 1)
+
+		env = {**os.environ, "DJANGO_SETTINGS_MODULE": "booking.settings"}
+		if "LOCATION" in settings.CACHES["default"] and "filebased" in settings.CACHES["default"]["BACKEND"]:
+			# Point the subprocess at the suite's own cache, not the app's.
+			env.pop("BOOKING_REDIS_URL", None)
+			env["BOOKING_CACHE_DIR"] = str(settings.CACHES["default"]["LOCATION"])
+		subprocess.run(
+			[
+				sys.executable,
+				"-c",
+				"import django; django.setup(); from django.core.cache import cache; "
+				"from bookings.models import BookingNotification; "
+				f"cache.delete(BookingNotification.menu_cache_key({self.guest_profile.id}))",
+			],
+			cwd=settings.BASE_DIR,
+			env=env,
+			check=True,
+		)
+		self.assertEqual(self.client.get(reverse("guest_profile")).context["booking_notifications_unread_count"], 0)
+
+	def test_mark_all_read_moves_cursor_and_keeps_unread_count_on_inbox(self):
+		bookings = [
+			Booking.objects.create(
+				guest=self.guest_profile,
+				room=self.room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				guest_phone="1234567890",
+				payment_option=Booking.PaymentOption.PAY_LATER,
+			)
+			for _ in range(3)
+		]
+		inbox = NotificationInbox.objects.get(recipient=self.hotel_profile)
+		self.assertEqual(inbox.unread_count, 3)
+
+		BookingNotification.objects.filter(recipient=self.hotel_profile, booking=bookings[0]).mark_read()
+		inbox.refresh_from_db()
+		self.assertEqual(inbox.unread_count, 2)
+
+		self.client.login(username="hotel_user", password="pass1234")
+		with self.assertNumQueries(1):
+			NotificationInbox.mark_all_read(self.hotel_profile.id)
+		inbox.refresh_from_db()
+		self.assertEqual(inbox.unread_count, 0)
+		self.assertFalse(BookingNotification.objects.filter(recipient=self.hotel_profile).unread().exists())
+
+		bookings[1].status = Booking.Status.CONFIRMED
+		bookings[1].save(update_fields=["status"])
+		inbox.refresh_from_db()
+		self.assertEqual(inbox.unread_count, 1)
+
+		response = self.client.post(
+			reverse("notifications_mark_all_read"),
+			{"next": reverse("hotel_booking_history")},
+		)
+		self.assertRedirects(response, reverse("hotel_booking_history"), fetch_redirect_response=False)
+		self.assertEqual(NotificationInbox.objects.get(recipient=self.hotel_profile).unread_count, 0)
+		self.assertEqual(NotificationInbox.objects.get(recipient=self.guest_profile).unread_count, 4)
+
+	def test_unread_count_is_recounted_from_the_unread_index(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+
+		def unread_count():
+			return NotificationInbox.objects.get(recipient=self.hotel_profile).unread_count
+
+		with CaptureQueriesContext(connection) as queries:
+			review = BookingReview.objects.create(booking=booking, rating=4, comment="Good")
+			for comment in ("Very good", "Excellent"):
+				review.comment = comment
+				review.save()
+		self.assertEqual(unread_count(), 3)
+		recounts = [
+			query["sql"]
+			for query in queries
+			if query["sql"].startswith('UPDATE "bookings_notificationinbox"') and '"last_notification_id" =' in query["sql"]
+		]
+		self.assertTrue(recounts)
+		for sql in recounts:
+			# The recount only reads unread rows above the cursor, which the
+			# partial notification_unread_idx covers.
+			self.assertIn('"read_through_id"', sql)
+			self.assertIn('NOT U0."is_read"', sql)
+
+		BookingNotification.objects.get(recipient=self.hotel_profile, status=Booking.Status.CONFIRMED).delete()
+		self.assertEqual(unread_count(), 2)
+		BookingNotification.objects.filter(recipient=self.hotel_profile).mark_read()
+		BookingNotification.objects.filter(recipient=self.hotel_profile).mark_read()
+		self.assertEqual(unread_count(), 0)
+		BookingNotification.objects.filter(recipient=self.hotel_profile).delete()
+		self.assertEqual(unread_count(), 0)
+
+	@override_settings(BOOKING_NOTIFICATION_STREAM_MAX_AGE=0)
+	def test_notification_stream_resumes_after_last_event_id(self):
+		first_booking, second_booking = [
+			Booking.objects.create(
+				guest=self.guest_profile,
+				room=self.room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				guest_phone="1234567890",
+				payment_option=Booking.PaymentOption.PAY_LATER,
+			)
+			for _ in range(2)
+		]
+		first_id = BookingNotification.objects.get(recipient=self.guest_profile, booking=first_booking).id
+		second_id = BookingNotification.objects.get(recipient=self.guest_profile, booking=second_booking).id
+
+		async def read_stream(headers=None):
+			response = await self.async_client.get(reverse("notifications_stream"), headers=headers or {})
+			body = "".join([chunk.decode() async for chunk in response.streaming_content])
+			return response, body
+
+		async_to_sync(self.async_client.alogin)(username="guest_user", password="pass1234")
+		response, body = async_to_sync(read_stream)({"Last-Event-ID": str(first_id)})
+		self.assertEqual(response["Content-Type"], "text/event-stream")
+		self.assertIn(f"id: {second_id}\nevent: notification\n", body)
+		self.assertNotIn(f"id: {first_id}\n", body)
+		self.assertIn('event: unread\ndata: {"unread_count": 2}', body)
+
+		_, body = async_to_sync(read_stream)()
+		self.assertNotIn("event: notification", body)
+		self.assertIn('"unread_count": 2', body)
+
+	@override_settings(BOOKING_NOTIFICATION_STREAM_LONG_POLL=1)
+	def test_wsgi_long_poll_answers_missed_notifications_at_once_and_otherwise_waits(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		notification_id = BookingNotification.objects.get(recipient=self.guest_profile, booking=booking).id
+		self.client.login(username="guest_user", password="pass1234")
+
+		def poll(last_event_id):
+			started = time.monotonic()
+			response = self.client.get(reverse("notifications_stream"), headers={"Last-Event-ID": str(last_event_id)})
+			return response.content.decode(), time.monotonic() - started
+
+		body, elapsed = poll(notification_id - 1)
+		self.assertIn(f"id: {notification_id}\nevent: notification\n", body)
+		self.assertLess(elapsed, 1)
+
+		body, elapsed = poll(notification_id)
+		self.assertNotIn("event: notification", body)
+		self.assertIn('"unread_count": 1', body)
+		self.assertGreaterEqual(elapsed, 1)
+
+	@override_settings(BOOKING_NOTIFICATION_STREAM_KEEPALIVE=30, BOOKING_NOTIFICATION_STREAM_MAX_AGE=30)
+	def test_open_notification_stream_is_woken_by_a_committed_notification(self):
+		def book():
+			with self.captureOnCommitCallbacks(execute=True):
+				return Booking.objects.create(
+					guest=self.guest_profile,
+					room=self.room,
+					guest_name="Guest User",
+					guest_email="guest@example.com",
+					guest_phone="1234567890",
+					payment_option=Booking.PaymentOption.PAY_LATER,
+				)
+
+		async def read_stream():
+			events = notification_events(self.guest_profile, None, long_poll=False)
+			try:
+				self.assertTrue((await anext(events)).startswith("retry:"))
+				self.assertIn('"unread_count": 0', await anext(events))
+				next_event = asyncio.ensure_future(anext(events))
+				await asyncio.sleep(0.1)
+				# Nothing changed, so the stream waits without reading the inbox again.
+				self.assertFalse(next_event.done())
+				booking = await sync_to_async(book)()
+				return booking, await asyncio.wait_for(next_event, timeout=5)
+			finally:
+				await events.aclose()
+
+		booking, event = async_to_sync(read_stream)()
+		notification = BookingNotification.objects.get(recipient=self.guest_profile, booking=booking)
+		self.assertTrue(event.startswith(f"id: {notification.id}\nevent: notification\n"))
+
+	def test_hotel_history_marks_notification_as_read(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		notification = BookingNotification.objects.get(
+			recipient=self.hotel_profile,
+			booking=booking,
+			status=Booking.Status.PENDING,
+		)
+
+		self.client.login(username="hotel_user", password="pass1234")
+		response = self.client.get(
+			f"{reverse('hotel_booking_history')}?state=all&notification={notification.id}"
+		)
+
+		self.assertEqual(response.status_code, 200)
+		notification.refresh_from_db()
+		self.assertTrue(notification.is_read)
@@ -0,0 +1,171 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts import admin_panel_urls
+from accounts import urls as accounts_urls
+from accounts.models import Profile, ProfileFacilityImage
+from booking.query_budget import QueryBudgetExceeded, QueryRecorder, fingerprint
+from rooms.models import Room, RoomType
+
+from .. import urls as bookings_urls
+from ..models import Booking
+
+
+# The notification stream answers after one pass instead of holding its long-poll.
+@override_settings(BOOKING_NOTIFICATION_STREAM_LONG_POLL=0)
+class ViewQueryCountTests(TestCase):
+	"""Pin the query count of every view; the middleware fails any repeated query shape."""
+
+	URLCONFS = (accounts_urls, bookings_urls, admin_panel_urls)
+
+	# (url name, user, method, url kwargs key, expected queries), run in order.
+	VIEW_QUERIES = (
+		("login", None, "get", None, 0),
+		("signup", None, "get", None, 0),
+		("hotel_signup_pending", None, "get", None, 0),
+		("account_password_reset", None, "get", None, 0),
+		("account_password_reset_done", None, "get", None, 0),
+		("account_password_reset_confirm", None, "get", "reset", 1),
+		("account_password_reset_complete", None, "get", None, 0),
+		("home", "guest", "get", None, 5),
+		("guest_hotel_profile", "guest", "get", "hotel", 10),
+		("guest_profile", "guest", "get", None, 3),
+		("profile_image_update", "guest", "post", None, 5),
+		("profile_update", "guest", "post", None, 3),
+		("booking_checkout", "guest", "get", "room", 7),
+		("booking_mock_digital_payment", "guest", "get", "pending", 4),
+		("booking_history", "guest", "get", None, 6),
+		("booking_review", "guest", "post", "completed", 4),
+		("booking_pay_now", "guest", "post", "pending", 10),
+		("booking_cancel", "guest", "post", "cancellable", 18),
+		("notifications_mark_all_read", "guest", "post", None, 4),
+		("notifications_stream", "guest", "get", None, 4),
+		("logout", "guest", "get", None, 4),
+		("hotel_home", "hotel", "get", None, 7),
+		("hotel_profile", "hotel", "get", None, 6),
+		("hotel_reviews", "hotel", "get", None, 5),
+		("hotel_booking_history", "hotel", "get", None, 6),
+		("hotel_booking_cancel", "hotel", "post", "hotel_cancellable", 18),
+		("facility_image_upload", "hotel", "post", None, 5),
+		("facility_image_replace", "hotel", "post", "image", 4),
+		("facility_image_move", "hotel", "post", "image_move", 6),
+		("facility_image_delete", "hotel", "post", "image", 5),
+		("panel_dashboard", "admin", "get", None, 5),
+		("panel_rooms", "admin", "get", None, 3),
+		("panel_room_create", "admin", "get", None, 4),
+		("panel_room_edit", "admin", "get", "room", 5),
+		("panel_bookings", "admin", "get", None, 3),
+		("panel_booking_create", "admin", "get", None, 6),
+		("panel_booking_edit", "admin", "get", "completed", 7),
+		("panel_accounts", "admin", "get", None, 3),
+		("panel_account_create", "admin", "get", None, 2),
+		("panel_account_edit", "admin", "get", "hotel_user", 3),
+		("panel_account_approve_hotel", "admin", "post", "hotel_user", 3),
+		("panel_account_reject_hotel", "admin", "post", "hotel_user", 5),
+		("panel_booking_delete", "admin", "post", "completed", 6),
+		("panel_room_delete", "admin", "post", "unbooked_room", 6),
+		("panel_account_delete", "admin", "post", "guest_user", 20),
+	)
+
+	def setUp(self):
+		cache.clear()
+		user_model = get_user_model()
+		self.users = {
+			"guest": user_model.objects.create_user(username="guest_user", password="pass1234"),
+			"hotel": user_model.objects.create_user(username="hotel_user", password="pass1234"),
+			"admin": user_model.objects.create_user(username="admin_user", password="pass1234", is_staff=True),
+		}
+		guest_profile = self.users["guest"].profile
+		hotel_profile = self.users["hotel"].profile
+		hotel_profile.full_name = "Hotel User"
+		hotel_profile.account_type = Profile.AccountType.HOTEL
+		hotel_profile.save(update_fields=["full_name", "account_type"])
+
+		today = datetime.date.today()
+		room_type = RoomType.objects.create(name="Deluxe")
+		room, unbooked_room = (
+			Room.objects.create(
+				hotel=hotel_profile,
+				room_type=room_type,
+				capacity=2,
+				rate_per_night="150.00",
+				available_rooms=5,
+				checkin_date=today + datetime.timedelta(days=1),
+				checkout_date=today + datetime.timedelta(days=3),
+			)
+			for _ in range(2)
+		)
+
+		def book(payment_option):
+			return Booking.objects.create(
+				guest=guest_profile,
+				room=room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				guest_phone="1234567890",
+				payment_option=payment_option,
+			)
+
+		completed = book(Booking.PaymentOption.PAY_NOW)
+		Booking.objects.filter(id=completed.id).update(
+			status=Booking.Status.COMPLETED,
+			checkin_date=today - datetime.timedelta(days=3),
+			checkout_date=today - datetime.timedelta(days=1),
+			completes_on=today - datetime.timedelta(days=1),
+		)
+		images = [
+			ProfileFacilityImage.objects.create(profile=hotel_profile, image=f"facilities/{order}.jpg", sort_order=order)
+			for order in (1, 2)
+		]
+		self.kwargs = {
+			"hotel": {"hotel_id": hotel_profile.id},
+			"room": {"room_id": room.id},
+			"unbooked_room": {"room_id": unbooked_room.id},
+			"pending": {"booking_id": book(Booking.PaymentOption.PAY_LATER).id},
+			"cancellable": {"booking_id": book(Booking.PaymentOption.PAY_LATER).id},
+			"hotel_cancellable": {"booking_id": book(Booking.PaymentOption.PAY_LATER).id},
+			"completed": {"booking_id": completed.id},
+			"image": {"image_id": images[0].id},
+			"image_move": {"image_id": images[0].id, "direction": "next"},
+			"hotel_user": {"user_id": self.users["hotel"].id},
+			"guest_user": {"user_id": self.users["guest"].id},
+			"reset": {"uidb64": "MQ", "token": "set-password"},
+		}
+
+	def assertViewQueries(self, url_name, user, method, kwargs_key, expected):
+		if user is None:
+			self.client.logout()
+		else:
+			self.client.force_login(self.users[user])
+		url = reverse(url_name, kwargs=self.kwargs[kwargs_key] if kwargs_key else None)
+		data = {"rating": 5, "comment": "Great stay"} if url_name == "booking_review" else {}
+		response = getattr(self.client, method)(url, data)
+		self.assertLess(response.status_code, 400)
+		self.assertEqual(response.query_report["url_name"], url_name)
+		self.assertEqual(response.query_report["count"], expected)
+
+	def test_every_view_has_a_pinned_query_count(self):
+		url_names = {pattern.name for urlconf in self.URLCONFS for pattern in urlconf.urlpatterns}
+		self.assertEqual(url_names, {name for name, *_ in self.VIEW_QUERIES})
+		for url_name, *spec in self.VIEW_QUERIES:
+			with self.subTest(url_name):
+				self.assertViewQueries(url_name, *spec)
+
+	def test_repeated_query_shapes_fail_in_strict_mode(self):
+		self.assertEqual(
+			fingerprint("SELECT * FROM t WHERE id IN (%s, %s) AND name = 'x' LIMIT 21"),
+			"SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?",
+		)
+		with QueryRecorder() as recorder:
+			for profile_id in range(3):
+				list(Profile.objects.filter(id=profile_id))
+		self.assertEqual(list(recorder.repeated_shapes(3).values()), [3])
+
+		self.client.force_login(self.users["guest"])
+		with override_settings(QUERY_BUDGETS={"guest_profile": 3}):
+			with self.assertRaisesMessage(QueryBudgetExceeded, "exceed the budget of 3"):
+				self.client.get(reverse("guest_profile"))
@@ -0,0 +1,129 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Profile
+from rooms.models import Room
+
+from ..management.commands.seed_benchmark_data import seed_dataset
+from ..management.commands.sweep_bookings import sweep_booking_lifecycle
+from ..models import Booking
+
+
+class QueryPlanTests(TestCase):
+	# Walking a table or an index end to end, or sorting rows the index could have ordered.
+	SLOW_STEP = re.compile(r"^SCAN (?!\(subquery-\d+\)|qualify\b|\w+ VIRTUAL TABLE INDEX \d+:M)|TEMP B-TREE")
+	# Slow steps some hot statements need, each with the reason it is bounded.
+	ALLOWED_STEPS = {
+		# An undated listing counts every open room; each page's count is cached.
+		"search_all_count": {"SCAN rooms_room USING INDEX room_open_rate_idx"},
+		# The page walks the open rooms in price order and stops after LIMIT.
+		"search_all_page": {"SCAN rooms_room USING INDEX room_open_rate_idx"},
+		# Matches can span hotels, so only the matched hotels' open rooms are merged and sorted.
+		"search_hotels_page": {"USE TEMP B-TREE FOR ORDER BY"},
+		# Groups only the ledger rows of the stay's nights.
+		"search_dated_count": {"USE TEMP B-TREE FOR GROUP BY"},
+		"search_dated_page": {"USE TEMP B-TREE FOR GROUP BY", "USE TEMP B-TREE FOR ORDER BY"},
+		# The public profile lists every review of the hotel, so the sort reads nothing extra.
+		"hotel_reviews": {"USE TEMP B-TREE FOR ORDER BY"},
+	}
+
+	@classmethod
+	def setUpTestData(cls):
+		seed_dataset(prefix="plan", hotels=4, rooms_per_hotel=3, guests=8, bookings=120, seed=3)
+
+	def setUp(self):
+		cache.clear()
+
+	def statements(self, username: str, method: str, url: str, data=None) -> list[str]:
+		self.client.force_login(get_user_model().objects.get(username=username))
+		with CaptureQueriesContext(connection) as queries:
+			getattr(self.client, method)(url, data or {})
+		return [query["sql"] for query in queries]
+
+	@staticmethod
+	def pick(statements: list[str], prefix: str, *fragments: str) -> str:
+		(sql,) = [sql for sql in statements if sql.startswith(prefix) and all(part in sql for part in fragments)]
+		return sql
+
+	def hot_queries(self) -> dict[str, str]:
+		"""The busiest statements, captured from the views and sweeper that run them."""
+		hotel = Profile.objects.get(user__username="plan-hotel-0")
+		room = Room.objects.filter(hotel=hotel, available_rooms__gt=0).order_by("id").first()
+		stay = {"checkin": room.checkin_date.isoformat(), "checkout": room.checkout_date.isoformat()}
+		bookings, rooms, notifications = '"bookings_booking"', '"rooms_room"', '"bookings_bookingnotification"'
+
+		guest_history = self.statements("plan-guest-0", "get", reverse("booking_history"))
+		hotel_history = self.statements("plan-hotel-0", "get", reverse("hotel_booking_history"))
+		hotel_page = self.statements("plan-guest-0", "get", reverse("guest_hotel_profile", args=[hotel.id]))
+		search_all = self.statements("plan-guest-0", "get", reverse("home"), {"guests": 1})
+		search_hotels = self.statements("plan-guest-0", "get", reverse("home"), {"hotel_name": hotel.full_name, "sort": "price"})
+		search_dated = self.statements("plan-guest-0", "get", reverse("home"), stay)
+		checkout = self.statements(
+			"plan-guest-1",
+			"post",
+			reverse("booking_checkout", kwargs={"room_id": room.id}),
+			{
+				"guest_name": "Plan Guest",
+				"guest_email": "plan@example.com",
+				"guest_phone": "1234567890",
+				"rooms_count": 1,
+				"payment_option": Booking.PaymentOption.PAY_LATER,
+				**stay,
+			},
+		)
+		with CaptureQueriesContext(connection) as sweep, transaction.atomic():
+			sweep_booking_lifecycle(batch_size=5, max_batches=1)
+			transaction.set_rollback(True)
+		sweep = [query["sql"] for query in sweep]
+
+		return {
+			"guest_history": self.pick(guest_history, f"SELECT {bookings}", "LIMIT 21"),
+			"hotel_history": self.pick(hotel_history, f"SELECT {bookings}", "LIMIT 21"),
+			"notification_menu": self.pick(guest_history, f"SELECT {notifications}", "LIMIT 8"),
+			"hotel_rooms": self.pick(hotel_page, f"SELECT {rooms}"),
+			"eligible_booking": self.pick(hotel_page, f"SELECT {bookings}", "LIMIT 1"),
+			"hotel_reviews": self.pick(hotel_page, 'SELECT "bookings_bookingreview"', '"bookings_booking"."status" IN'),
+			"search_all_count": self.pick(search_all, "SELECT COUNT(*)"),
+			"search_all_page": self.pick(search_all, f"SELECT {rooms}.\"id\" AS", "LIMIT"),
+			"search_hotels_count": self.pick(search_hotels, "SELECT COUNT(*)"),
+			"search_hotels_page": self.pick(search_hotels, f"SELECT {rooms}.\"id\" AS", "LIMIT"),
+			"search_dated_count": self.pick(search_dated, "SELECT COUNT(*)"),
+			"search_dated_page": self.pick(search_dated, f"SELECT {rooms}.\"id\" AS", "LIMIT"),
+			"reserve_nights": self.pick(checkout, 'UPDATE "rooms_roomnight"'),
+			"overdue_sweep": self.pick(sweep, f"SELECT {bookings}", "payment_due_at", "LIMIT 5"),
+			"checkout_sweep": self.pick(sweep, f"SELECT {bookings}", "completes_on", "LIMIT 5"),
+		}
+
+	def slow_steps(self, sql: str) -> list[str]:
+		with connection.cursor() as cursor:
+			cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+			return [row[-1] for row in cursor.fetchall() if self.SLOW_STEP.search(row[-1])]
+
+	def test_hot_queries_seek_their_indexes(self):
+		for name, sql in self.hot_queries().items():
+			with self.subTest(query=name):
+				slow = [step for step in self.slow_steps(sql) if step not in self.ALLOWED_STEPS.get(name, ())]
+				self.assertEqual(slow, [], sql)
+
+	def test_plan_check_catches_index_walks_and_sorts(self):
+		self.assertTrue(self.slow_steps('SELECT "id" FROM "rooms_room" ORDER BY "capacity"'))
+		self.assertEqual(
+			self.slow_steps('SELECT "id" FROM "rooms_room" WHERE "available_rooms" > 0 ORDER BY "rate_per_night"'),
+			["SCAN rooms_room USING INDEX room_open_rate_idx"],
+		)
+
+	def test_releasing_nights_seeks_on_the_ledger(self):
+		bookings = Booking.objects.filter(status=Booking.Status.CONFIRMED).order_by("id")[:3]
+		with CaptureQueriesContext(connection) as queries, transaction.atomic():
+			Booking.objects.filter(id__in=[booking.id for booking in bookings]).release_room_nights()
+			transaction.set_rollback(True)
+
+		updates = [query["sql"] for query in queries if query["sql"].startswith('UPDATE "rooms_roomnight"')]
+		self.assertEqual(len(updates), 1)
+		self.assertEqual(self.slow_steps(updates[0]), [])
@@ -0,0 +1,63 @@
+import sqlite3
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Profile
+
+from ..management.commands.sync_replica import copy_database
+
+
+@override_settings(REPLICA_READS_ENABLED=True)
+class ReplicaRoutingTests(TransactionTestCase):
+	databases = {"default", "replica"}
+
+	def setUp(self):
+		self.guest = get_user_model().objects.create_user(username="replica_guest", password="pass1234")
+		self.client.force_login(self.guest)
+
+	def replica_queries(self, url: str) -> int:
+		with CaptureQueriesContext(connections["replica"]) as queries:
+			self.assertEqual(self.client.get(url).status_code, 200)
+		return len(queries)
+
+	def test_read_only_views_use_the_replica_until_the_session_writes(self):
+		hotel = get_user_model().objects.create_user(username="replica_hotel", password="pass1234").profile
+		hotel.account_type = Profile.AccountType.HOTEL
+		hotel.save(update_fields=["account_type"])
+		hotel_page = reverse("guest_hotel_profile", args=[hotel.id])
+
+		self.assertGreater(self.replica_queries(hotel_page), 0)
+		# Views without the opt-in stay on the primary.
+		self.assertEqual(self.replica_queries(reverse("booking_history")), 0)
+
+		self.client.post(reverse("booking_cancel", args=[1]))
+		self.assertEqual(self.replica_queries(hotel_page), 0)
+
+		with override_settings(REPLICA_PIN_SECONDS=-1):
+			self.client.post(reverse("booking_cancel", args=[1]))
+		self.assertGreater(self.replica_queries(hotel_page), 0)
+
+	def test_search_pages_read_from_the_replica_are_not_cached(self):
+		search = f"{reverse('home')}?hotel_name=hotel"
+		self.assertGreater(self.replica_queries(search), 0)
+
+		self.client.post(reverse("booking_cancel", args=[1]))
+		with CaptureQueriesContext(connections["default"]) as queries:
+			self.client.get(search)
+		self.assertTrue(any('"rooms_room"' in query["sql"] for query in queries))
+
+	def test_sync_replica_copies_the_primary_file(self):
+		with tempfile.TemporaryDirectory() as directory:
+			primary, replica = Path(directory) / "primary.sqlite3", Path(directory) / "replica.sqlite3"
+			with closing(sqlite3.connect(primary)) as source:
+				source.executescript("CREATE TABLE rooms (id INTEGER); INSERT INTO rooms VALUES (1), (2);")
+			copy_database(str(primary), str(replica))
+			with closing(sqlite3.connect(replica)) as target:
+				self.assertEqual(target.execute("SELECT COUNT(*) FROM rooms").fetchone(), (2,))
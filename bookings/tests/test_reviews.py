@@ -0,0 +1,187 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from ..models import Booking, BookingNotification, BookingReview, HotelRatingSummary
+from .base import BookingFixtureTestCase
+
+
+class BookingReviewTests(BookingFixtureTestCase):
+	def test_guest_can_edit_existing_hotel_review(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+		review = BookingReview.objects.create(
+			booking=booking,
+			rating=2,
+			comment="Old review",
+		)
+
+		self.client.login(username="guest_user", password="pass1234")
+		response = self.client.post(
+			reverse("guest_hotel_profile", kwargs={"hotel_id": self.hotel_profile.id}),
+			{
+				f"hotel-review-{self.hotel_profile.id}-rating": 5,
+				f"hotel-review-{self.hotel_profile.id}-comment": "Updated review",
+			},
+		)
+
+		self.assertEqual(response.status_code, 302)
+		review.refresh_from_db()
+		self.assertEqual(review.rating, 5)
+		self.assertEqual(review.comment, "Updated review")
+		self.assertEqual(BookingReview.objects.filter(booking__room__hotel=self.hotel_profile).count(), 1)
+		notification = BookingNotification.objects.get(
+			recipient=self.hotel_profile,
+			booking=booking,
+			status=BookingNotification.Type.REVIEW_UPDATED,
+		)
+		self.assertFalse(notification.is_read)
+
+	def test_rating_summary_follows_review_changes_and_rebuilds(self):
+		bookings = [
+			Booking.objects.create(
+				guest=self.guest_profile,
+				room=self.room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				guest_phone="1234567890",
+				payment_option=Booking.PaymentOption.PAY_NOW,
+			)
+			for _ in range(3)
+		]
+		reviews = [
+			BookingReview.objects.create(booking=booking, rating=rating, comment="Stay")
+			for booking, rating in zip(bookings, (5, 4, 4))
+		]
+		reviews[1].rating = 2
+		reviews[1].save()
+		bookings[2].delete()
+
+		summary = HotelRatingSummary.objects.get(hotel=self.hotel_profile)
+		self.assertEqual((summary.review_count, summary.rating_sum), (2, 7))
+		self.assertEqual(summary.rating_counts, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+		self.assertEqual(summary.avg_rating, 3.5)
+
+		self.client.login(username="hotel_user", password="pass1234")
+		response = self.client.get(reverse("hotel_reviews"))
+		self.assertEqual(response.context["avg_rating"], 3.5)
+		self.assertEqual(response.context["review_count"], 2)
+		self.assertEqual(
+			[rating_filter["count"] for rating_filter in response.context["rating_filters"]],
+			[1, 0, 0, 1, 0],
+		)
+
+		HotelRatingSummary.objects.filter(hotel=self.hotel_profile).update(review_count=9, rating_4=3)
+		output = StringIO()
+		call_command("rebuild_rating_summaries", stdout=output)
+		self.assertIn("Rebuilt 1 hotel rating summaries", output.getvalue())
+		summary.refresh_from_db()
+		self.assertEqual((summary.review_count, summary.rating_sum, summary.rating_4), (2, 7, 0))
+
+	def test_guest_rating_submission_notifies_hotel_immediately(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+
+		self.client.login(username="guest_user", password="pass1234")
+		response = self.client.post(
+			reverse("guest_hotel_profile", kwargs={"hotel_id": self.hotel_profile.id}),
+			{
+				f"hotel-review-{self.hotel_profile.id}-rating": 4,
+				f"hotel-review-{self.hotel_profile.id}-comment": "Great stay",
+			},
+		)
+
+		self.assertEqual(response.status_code, 302)
+		notification = BookingNotification.objects.get(
+			recipient=self.hotel_profile,
+			booking=booking,
+			status=BookingNotification.Type.REVIEW_ADDED,
+		)
+		self.assertFalse(notification.is_read)
+		self.assertEqual(notification.message, "A guest submitted a new rating and review.")
+
+	def test_hotel_review_notification_link_targets_reviews_page(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+		notification = BookingNotification.objects.create(
+			recipient=self.hotel_profile,
+			booking=booking,
+			status=BookingNotification.Type.REVIEW_ADDED,
+			message="A guest submitted a new rating and review.",
+		)
+
+		self.client.login(username="hotel_user", password="pass1234")
+		response = self.client.get(reverse("hotel_home"))
+
+		self.assertEqual(response.status_code, 200)
+		links = [item.history_url for item in response.context["booking_notifications"]]
+		self.assertIn(
+			f"{reverse('hotel_reviews')}?notification={notification.id}",
+			links,
+		)
+
+	def test_hotel_reviews_page_marks_review_notification_as_read(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+		notification = BookingNotification.objects.create(
+			recipient=self.hotel_profile,
+			booking=booking,
+			status=BookingNotification.Type.REVIEW_UPDATED,
+			message="A guest updated their rating and review.",
+		)
+
+		self.client.login(username="hotel_user", password="pass1234")
+		response = self.client.get(
+			f"{reverse('hotel_reviews')}?notification={notification.id}"
+		)
+
+		self.assertEqual(response.status_code, 200)
+		notification.refresh_from_db()
+		self.assertTrue(notification.is_read)
+
+	def test_hotel_reviews_page_lists_guest_reviews(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+		BookingReview.objects.create(
+			booking=booking,
+			rating=4,
+			comment="Great stay",
+		)
+
+		self.client.login(username="hotel_user", password="pass1234")
+		response = self.client.get(reverse("hotel_reviews"))
+
+		self.assertEqual(response.status_code, 200)
+		self.assertContains(response, "Ratings &amp; Reviews")
+		self.assertContains(response, "Great stay")
@@ -0,0 +1,278 @@
+import datetime
+import os
+import subprocess
+import sys
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Profile
+from accounts.search import SEARCH_CACHE_PREFIX, search_cache_stats
+from rooms.models import Room, RoomNight, RoomType
+
+from ..models import Booking, BookingReview
+from .base import BookingFixtureTestCase
+
+
+class RoomSearchTests(BookingFixtureTestCase):
+	def test_search_by_dates_uses_per_night_availability(self):
+		self.room.checkout_date = self.room.checkin_date + datetime.timedelta(days=2)
+		self.room.save(update_fields=["checkout_date"])
+		RoomNight.objects.filter(room=self.room, night=self.room.checkin_date).update(available_rooms=0)
+		second_night = self.room.checkin_date + datetime.timedelta(days=1)
+
+		self.client.login(username="guest_user", password="pass1234")
+		booked_out = self.client.get(
+			reverse("home"),
+			{"checkin": self.room.checkin_date.isoformat(), "checkout": self.room.checkout_date.isoformat()},
+		)
+		still_free = self.client.get(
+			reverse("home"),
+			{"checkin": second_night.isoformat(), "checkout": self.room.checkout_date.isoformat()},
+		)
+
+		self.assertEqual(booked_out.context["rooms"], [])
+		self.assertEqual(still_free.context["rooms"], [self.room])
+
+	def test_search_matches_hotel_name_and_location_tokens_by_prefix(self):
+		self.hotel_profile.location = "Chiang Mai Old Town"
+		self.hotel_profile.save(update_fields=["location"])
+		self.client.login(username="guest_user", password="pass1234")
+
+		def search(**params):
+			return self.client.get(reverse("home"), params).context["rooms"]
+
+		self.assertEqual(search(location="chiang"), [self.room])
+		self.assertEqual(search(location="old mai"), [self.room])
+		self.assertEqual(search(location="hot"), [self.room])
+		self.assertEqual(search(hotel_name="use"), [self.room])
+		self.assertEqual(search(hotel_name="chiang"), [])
+		self.assertEqual(search(location="bangkok"), [])
+
+		self.hotel_profile.location = "Bangkok"
+		self.hotel_profile.save()
+		self.assertEqual(search(location="bang"), [self.room])
+		self.assertEqual(search(location="chiang"), [])
+
+	def test_rebuild_hotel_search_reindexes_profiles_changed_without_save(self):
+		self.client.login(username="guest_user", password="pass1234")
+
+		def search(**params):
+			return self.client.get(reverse("home"), params).context["rooms"]
+
+		Profile.objects.filter(pk=self.hotel_profile.pk).update(location="Chiang Mai")
+		self.assertEqual(search(location="chiang"), [])
+
+		output = StringIO()
+		call_command("rebuild_hotel_search", stdout=output)
+		self.assertIn("Indexed 1 hotels", output.getvalue())
+		self.assertEqual(search(location="chiang"), [self.room])
+
+	def test_search_loads_two_newest_reviews_per_hotel_in_one_query(self):
+		reviews = []
+		for rating in (3, 4, 5):
+			booking = Booking.objects.create(
+				guest=self.guest_profile,
+				room=self.room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				guest_phone="1234567890",
+				payment_option=Booking.PaymentOption.PAY_NOW,
+			)
+			reviews.append(BookingReview.objects.create(booking=booking, rating=rating, comment="Stay"))
+		self.client.login(username="guest_user", password="pass1234")
+
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(reverse("home"), {"hotel_name": "hotel"})
+		review_queries = [query for query in queries if "bookings_bookingreview" in query["sql"]]
+
+		self.assertEqual(len(review_queries), 1)
+		self.assertIn("ROW_NUMBER", review_queries[0]["sql"])
+		(room,) = response.context["rooms"]
+		self.assertEqual(room.hotel_recent_reviews, [reviews[2], reviews[1]])
+		with self.assertNumQueries(0):
+			self.assertEqual(room.hotel_recent_reviews[0].booking.guest, self.guest_profile)
+
+	def test_search_cache_is_dropped_only_for_affected_hotels(self):
+		other_user = get_user_model().objects.create_user(
+			username="other_hotel",
+			email="other@example.com",
+			password="pass1234",
+		)
+		other_hotel = other_user.profile
+		other_hotel.full_name = "Riverside Inn"
+		other_hotel.account_type = Profile.AccountType.HOTEL
+		other_hotel.save(update_fields=["full_name", "account_type"])
+		other_room = Room.objects.create(
+			hotel=other_hotel,
+			room_type=self.room_type,
+			capacity=2,
+			rate_per_night="90.00",
+			available_rooms=1,
+			checkin_date=self.room.checkin_date,
+			checkout_date=self.room.checkout_date,
+		)
+		self.client.login(username="guest_user", password="pass1234")
+
+		def search(**params):
+			with CaptureQueriesContext(connection) as queries:
+				response = self.client.get(reverse("home"), params)
+			ledger_queries = [query for query in queries if "rooms_roomnight" in query["sql"]]
+			return response.context["rooms"], bool(ledger_queries)
+
+		checkin = self.room.checkin_date.isoformat()
+		checkout = self.room.checkout_date.isoformat()
+		self.assertEqual(search(location="riverside", checkin=checkin, checkout=checkout), ([other_room], True))
+		self.assertEqual(search(location="hotel user", checkin=checkin, checkout=checkout), ([self.room], True))
+		self.assertEqual(search(location="Riverside ", checkin=checkin, checkout=checkout), ([other_room], False))
+
+		self.room.reserve_nights(1, self.room.checkin_date, self.room.checkout_date)
+		self.assertEqual(search(location="riverside", checkin=checkin, checkout=checkout), ([other_room], False))
+		self.assertEqual(search(location="hotel user", checkin=checkin, checkout=checkout), ([self.room], True))
+
+		other_room.reserve_nights(1, other_room.checkin_date, other_room.checkout_date)
+		self.assertEqual(search(location="riverside", checkin=checkin, checkout=checkout), ([], True))
+
+		stats = search_cache_stats(reset=True)
+		self.assertEqual((stats["hits"], stats["misses"]), (2, 4))
+		self.assertEqual(search_cache_stats()["hits"], 0)
+
+	def test_search_cache_misses_once_a_tag_is_evicted(self):
+		self.client.login(username="guest_user", password="pass1234")
+		search_cache_stats(reset=True)
+
+		def search():
+			return self.client.get(reverse("home"), {"hotel_name": "hotel"}).context["rooms"]
+
+		self.assertEqual(search(), [self.room])
+		self.assertEqual(search(), [self.room])
+		# An evicted tag is reseeded with a new version, never the one the entry recorded.
+		cache.delete(f"{SEARCH_CACHE_PREFIX}:tag:hotel:{self.hotel_profile.id}")
+		self.assertEqual(search(), [self.room])
+		self.assertEqual(search(), [self.room])
+		stats = search_cache_stats()
+		self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+
+	def test_dated_search_survives_other_hotels_taking_rooms_and_counts_across_processes(self):
+		other_user = get_user_model().objects.create_user(username="other_hotel", password="pass1234")
+		other_hotel = other_user.profile
+		other_hotel.full_name = "Riverside Inn"
+		other_hotel.account_type = Profile.AccountType.HOTEL
+		other_hotel.save(update_fields=["full_name", "account_type"])
+		other_room = Room.objects.create(
+			hotel=other_hotel,
+			room_type=self.room_type,
+			capacity=1,
+			rate_per_night="90.00",
+			available_rooms=2,
+			checkin_date=self.room.checkin_date,
+			checkout_date=self.room.checkout_date,
+		)
+		self.client.login(username="guest_user", password="pass1234")
+		search_cache_stats(reset=True)
+
+		def search():
+			response = self.client.get(
+				reverse("home"),
+				{
+					"checkin": self.room.checkin_date.isoformat(),
+					"checkout": self.room.checkout_date.isoformat(),
+					"guests": 2,
+				},
+			)
+			return response.context["rooms"]
+
+		self.assertEqual(search(), [self.room])
+		other_room.reserve_nights(1, other_room.checkin_date, other_room.checkout_date)
+		self.assertEqual(search(), [self.room])
+		other_room.room_type = RoomType.objects.create(name="Twin")
+		other_room.save(update_fields=["room_type"])
+		self.assertEqual(search(), [self.room])
+
+		# A wider room can now join the results, so its nights' searches are dropped.
+		other_room.capacity = 2
+		other_room.save(update_fields=["capacity"])
+		self.assertEqual(search(), [other_room, self.room])
+
+		env = {**os.environ, "DJANGO_SETTINGS_MODULE": "booking.settings"}
+		if "LOCATION" in settings.CACHES["default"] and "filebased" in settings.CACHES["default"]["BACKEND"]:
+			# Point the subprocess at the suite's own cache, not the app's.
+			env.pop("BOOKING_REDIS_URL", None)
+			env["BOOKING_CACHE_DIR"] = str(settings.CACHES["default"]["LOCATION"])
+		report = subprocess.run(
+			[sys.executable, "manage.py", "search_cache_stats"],
+			cwd=settings.BASE_DIR,
+			env=env,
+			check=True,
+			capture_output=True,
+			text=True,
+		)
+		self.assertIn("Search cache: 2 hits, 2 misses", report.stdout)
+
+	def test_search_pages_are_sorted_and_cost_a_fixed_number_of_queries(self):
+		other_user = get_user_model().objects.create_user(username="other_hotel", password="pass1234")
+		other_hotel = other_user.profile
+		other_hotel.full_name = "Hotel Riverside"
+		other_hotel.account_type = Profile.AccountType.HOTEL
+		other_hotel.save(update_fields=["full_name", "account_type"])
+		other_rooms = [
+			Room.objects.create(
+				hotel=other_hotel,
+				room_type=self.room_type,
+				capacity=2,
+				rate_per_night=rate,
+				available_rooms=1,
+				checkin_date=self.room.checkin_date,
+				checkout_date=self.room.checkout_date,
+			)
+			for rate in ("80.00", "100.00", "200.00")
+		]
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=other_rooms[0],
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+		BookingReview.objects.create(booking=booking, rating=5, comment="Lovely")
+		self.client.login(username="guest_user", password="pass1234")
+
+		def search(**params):
+			response = self.client.get(reverse("home"), {"hotel_name": "hotel", "per_page": 2, **params})
+			return response.context["rooms"], response.context["page"]
+
+		rooms, page = search(sort="price")
+		self.assertEqual(rooms, other_rooms[:2])
+		self.assertEqual((page.paginator.count, page.paginator.num_pages), (4, 2))
+		self.assertEqual(search(sort="price", page=2)[0], [self.room, other_rooms[2]])
+		self.assertEqual(search(sort="rating", page=2)[0], [other_rooms[2], self.room])
+		with CaptureQueriesContext(connection) as queries:
+			self.assertEqual(search(sort="relevance")[0], other_rooms[:2])
+		(ordered_page,) = [
+			query["sql"]
+			for query in queries
+			if query["sql"].startswith('SELECT "rooms_room"."id" AS "id", "rooms_room"."hotel_id" AS "hotel_id"')
+		]
+		# Text scores are looked up in the index per row, not inlined per matching hotel.
+		self.assertIn("bm25(accounts_hotel_search)", ordered_page)
+		self.assertNotIn("CASE WHEN", ordered_page)
+		self.assertIn("LIMIT 2", ordered_page)
+		self.assertEqual(search(sort="relevance", hotel_name="user")[0], [self.room])
+		self.assertEqual(search(sort="price", per_page=1000)[1].paginator.per_page, settings.ROOM_SEARCH_MAX_PAGE_SIZE)
+
+		# A cached page loads its rooms, images and reviews; rating cards come from the cache.
+		with CaptureQueriesContext(connection) as queries:
+			search(sort="price", page=2)
+		search_queries = [
+			query
+			for query in queries
+			if "rooms_room" in query["sql"] or "bookings_" in query["sql"] or "facilityimage" in query["sql"]
+		]
+		self.assertEqual(len(search_queries), 3)
@@ -1,52 +1,21 @@
 import datetime
+from io import StringIO
 
-from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.template.defaultfilters import date as date_filter
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from accounts.models import Profile
-from rooms.models import Room, RoomType
+from rooms.models import Room
 
-from .models import Booking, BookingNotification, BookingReview
+from ..models import Booking, BookingNotification, BookingReview
+from .base import BookingFixtureTestCase
 
 
-class BookingStatusRulesTests(TestCase):
-	def setUp(self):
-		user_model = get_user_model()
-		guest_user = user_model.objects.create_user(
-			username="guest_user",
-			email="guest@example.com",
-			password="pass1234",
-		)
-		hotel_user = user_model.objects.create_user(
-			username="hotel_user",
-			email="hotel@example.com",
-			password="pass1234",
-		)
-
-		self.guest_profile = guest_user.profile
-		self.guest_profile.full_name = "Guest User"
-		self.guest_profile.account_type = Profile.AccountType.GUEST
-		self.guest_profile.save(update_fields=["full_name", "account_type"])
-
-		self.hotel_profile = hotel_user.profile
-		self.hotel_profile.full_name = "Hotel User"
-		self.hotel_profile.account_type = Profile.AccountType.HOTEL
-		self.hotel_profile.save(update_fields=["full_name", "account_type"])
-
-		self.room_type = RoomType.objects.create(name="Deluxe")
-		today = datetime.date.today()
-		self.room = Room.objects.create(
-			hotel=self.hotel_profile,
-			room_type=self.room_type,
-			capacity=2,
-			rate_per_night="150.00",
-			available_rooms=2,
-			checkin_date=today + datetime.timedelta(days=1),
-			checkout_date=today + datetime.timedelta(days=2),
-		)
-
+class BookingStatusRulesTests(BookingFixtureTestCase):
 	def test_pay_later_booking_starts_pending(self):
 		booking = Booking.objects.create(
 			guest=self.guest_profile,
@@ -89,13 +58,16 @@ class BookingStatusRulesTests(TestCase):
 			hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS,
 			minutes=1,
 		)
-		Booking.objects.filter(id=booking.id).update(created_at=old_created_at)
+		payment_due_at = old_created_at + datetime.timedelta(hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS)
+		Booking.objects.filter(id=booking.id).update(created_at=old_created_at, payment_due_at=payment_due_at)
 		booking.refresh_from_db()
 
 		booking.refresh_status(now=timezone.now(), save=True)
 		booking.refresh_from_db()
 
 		self.assertEqual(booking.status, Booking.Status.EXPIRED)
+		# The expired booking keeps the deadline it missed for the history pages.
+		self.assertEqual(booking.payment_due_at, payment_due_at)
 
 	def test_pending_pay_later_remains_pending_before_twelve_hours(self):
 		booking = Booking.objects.create(
@@ -177,8 +149,11 @@ class BookingStatusRulesTests(TestCase):
 		)
 
 		self.assertEqual(response.status_code, 302)
+		self.assertEqual(self.room.available_rooms_for(self.room.checkin_date, self.room.checkout_date), 0)
+		# The checkout refreshes the headline with the ledger, so the sweep has nothing to catch up.
 		self.room.refresh_from_db()
 		self.assertEqual(self.room.available_rooms, 0)
+		self.assertEqual(Room.refresh_available_rooms(), 0)
 		self.assertEqual(Booking.objects.filter(room=self.room).count(), 1)
 		booking = Booking.objects.get(room=self.room)
 		self.assertEqual(booking.rooms_count, 2)
@@ -231,8 +206,7 @@ class BookingStatusRulesTests(TestCase):
 
 		self.assertEqual(second_response.status_code, 302)
 		self.assertEqual(Booking.objects.filter(room=self.room).count(), 2)
-		self.room.refresh_from_db()
-		self.assertEqual(self.room.available_rooms, 0)
+		self.assertEqual(self.room.available_rooms_for(self.room.checkin_date, self.room.checkout_date), 0)
 
 	def test_expired_pending_booking_releases_room_inventory(self):
 		booking = Booking.objects.create(
@@ -251,16 +225,257 @@ class BookingStatusRulesTests(TestCase):
 			hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS,
 			minutes=1,
 		)
-		Booking.objects.filter(id=booking.id).update(created_at=old_created_at)
+		Booking.objects.filter(id=booking.id).update(
+			created_at=old_created_at,
+			payment_due_at=old_created_at + datetime.timedelta(hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS),
+		)
 
-		self.client.login(username="guest_user", password="pass1234")
-		self.client.get(reverse("booking_history"))
+		call_command("sweep_bookings", "--once", stdout=StringIO())
 
 		booking.refresh_from_db()
 		self.room.refresh_from_db()
 		self.assertEqual(booking.status, Booking.Status.EXPIRED)
 		self.assertEqual(self.room.available_rooms, 2)
 
+	def test_bulk_expire_overdue_transitions_all_rows_in_constant_queries(self):
+		self.room.available_rooms = 0
+		self.room.save(update_fields=["available_rooms"])
+		Booking.objects.bulk_create(
+			[
+				Booking(
+					guest=self.guest_profile,
+					room=self.room,
+					guest_name="Guest User",
+					guest_email="guest@example.com",
+					checkin_date=self.room.checkin_date,
+					checkout_date=self.room.checkout_date,
+				)
+				for _ in range(2)
+			]
+		)
+		Booking.objects.update(payment_due_at=timezone.now() - datetime.timedelta(hours=1))
+
+		with self.assertNumQueries(13):
+			expired = Booking.objects.filter(room=self.room).expire_overdue()
+			expired_ids = set(expired.values_list("id", flat=True))
+
+		self.assertEqual(expired_ids, set(Booking.objects.values_list("id", flat=True)))
+		self.assertFalse(Booking.objects.exclude(status=Booking.Status.EXPIRED).exists())
+		self.assertEqual(
+			BookingNotification.objects.filter(status=Booking.Status.EXPIRED).count(),
+			4,
+		)
+		self.assertEqual(self.room.available_rooms_for(self.room.checkin_date, self.room.checkout_date), 2)
+		self.assertFalse(Booking.objects.all().expire_overdue().exists())
+
+	def test_bulk_cancel_only_touches_pending_bookings(self):
+		pending = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		confirmed = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+
+		canceled = Booking.objects.filter(id__in=[pending.id, confirmed.id]).cancel()
+
+		self.assertEqual(list(canceled.values_list("id", flat=True)), [pending.id])
+		confirmed.refresh_from_db()
+		self.assertEqual(confirmed.status, Booking.Status.CONFIRMED)
+
+	def test_history_page_does_not_persist_status_transitions(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			guest_phone="1234567890",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		old_created_at = timezone.now() - datetime.timedelta(
+			hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS,
+			minutes=1,
+		)
+		Booking.objects.filter(id=booking.id).update(
+			created_at=old_created_at,
+			payment_due_at=old_created_at + datetime.timedelta(hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS),
+		)
+
+		self.client.login(username="guest_user", password="pass1234")
+		response = self.client.get(reverse("booking_history"), {"state": "expired"})
+
+		self.assertEqual([item.id for item in response.context["bookings"]], [booking.id])
+		booking.refresh_from_db()
+		self.assertEqual(booking.status, Booking.Status.PENDING)
+
+	def test_history_pages_compute_state_tabs_without_writing(self):
+		overdue = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		Booking.objects.filter(id=overdue.id).update(payment_due_at=timezone.now() - datetime.timedelta(hours=1))
+		finished = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+		Booking.objects.filter(id=finished.id).update(
+			checkout_date=datetime.date.today(),
+			completes_on=datetime.date.today(),
+		)
+
+		for username, url_name in (("guest_user", "booking_history"), ("hotel_user", "hotel_booking_history")):
+			self.client.login(username=username, password="pass1234")
+			with CaptureQueriesContext(connection) as captured:
+				response = self.client.get(reverse(url_name), {"state": "completed"})
+
+			writes = [
+				query["sql"]
+				for query in captured.captured_queries
+				if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+			]
+			self.assertEqual(writes, [])
+			tab_counts = {tab["code"]: tab["count"] for tab in response.context["state_tabs"]}
+			self.assertEqual(tab_counts["all"], 2)
+			self.assertEqual(tab_counts["expired"], 1)
+			self.assertEqual(tab_counts["completed"], 1)
+			self.assertEqual(tab_counts["pending"], 0)
+			self.assertEqual([booking.id for booking in response.context["bookings"]], [finished.id])
+
+		# The overdue booking shows the stored deadline the sweeper enforces.
+		overdue.refresh_from_db()
+		payment_due_at = timezone.localtime(overdue.payment_due_at)
+		response = self.client.get(reverse("hotel_booking_history"), {"state": "expired"})
+		self.assertContains(
+			response,
+			f"Expired at: {date_filter(payment_due_at, 'M j, Y')} at {date_filter(payment_due_at, 'g:i A')}",
+		)
+
+	@override_settings(BOOKING_HISTORY_PAGE_SIZE=2)
+	def test_history_pages_follow_keyset_cursor_within_state_tab(self):
+		created_at = timezone.now()
+		for offset in range(5):
+			booking = Booking.objects.create(
+				guest=self.guest_profile,
+				room=self.room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				payment_option=Booking.PaymentOption.PAY_NOW,
+			)
+			# Two bookings share a timestamp so the id tie-breaker is exercised.
+			Booking.objects.filter(id=booking.id).update(
+				created_at=created_at - datetime.timedelta(minutes=min(offset, 3))
+			)
+
+		self.client.login(username="guest_user", password="pass1234")
+		seen_ids = []
+		cursor = ""
+		for _ in range(3):
+			response = self.client.get(reverse("booking_history"), {"state": "confirmed", "cursor": cursor})
+			seen_ids.extend(booking.id for booking in response.context["bookings"])
+			cursor = response.context["next_cursor"]
+			tab_counts = {tab["code"]: tab["count"] for tab in response.context["state_tabs"]}
+			self.assertEqual(tab_counts["confirmed"], 5)
+
+		self.assertEqual(cursor, "")
+		self.assertEqual(
+			seen_ids,
+			list(Booking.objects.order_by("-created_at", "-id").values_list("id", flat=True)),
+		)
+
+	def test_hotel_history_page_reads_the_hotel_index_in_order(self):
+		Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			payment_option=Booking.PaymentOption.PAY_NOW,
+		)
+		self.client.login(username="hotel_user", password="pass1234")
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(reverse("hotel_booking_history"))
+		self.assertEqual(len(response.context["bookings"]), 1)
+
+		(page_sql,) = [
+			query["sql"]
+			for query in queries
+			if query["sql"].startswith('SELECT "bookings_booking"."id"') and "LIMIT 21" in query["sql"]
+		]
+		with connection.cursor() as cursor:
+			cursor.execute(f"EXPLAIN QUERY PLAN {page_sql}")
+			plan = [row[-1] for row in cursor.fetchall()]
+		self.assertTrue(any("booking_hotel_recent_idx" in step for step in plan), plan)
+		self.assertFalse(any("TEMP B-TREE" in step for step in plan), plan)
+
+	def test_deadline_columns_follow_status_changes(self):
+		booking = Booking.objects.create(
+			guest=self.guest_profile,
+			room=self.room,
+			guest_name="Guest User",
+			guest_email="guest@example.com",
+			payment_option=Booking.PaymentOption.PAY_LATER,
+		)
+		booking.refresh_from_db()
+		self.assertAlmostEqual(
+			booking.payment_due_at,
+			booking.created_at + datetime.timedelta(hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS),
+			delta=datetime.timedelta(seconds=1),
+		)
+		self.assertIsNone(booking.completes_on)
+
+		booking.payment_option = Booking.PaymentOption.PAY_NOW
+		booking.status = Booking.Status.CONFIRMED
+		booking.save(update_fields=["payment_option", "status"])
+		booking.refresh_from_db()
+		self.assertIsNone(booking.payment_due_at)
+		self.assertEqual(booking.completes_on, booking.checkout_date)
+
+		Booking.objects.filter(id=booking.id).complete_past_checkout(
+			now=timezone.now() + datetime.timedelta(days=3)
+		)
+		booking.refresh_from_db()
+		self.assertEqual(booking.status, Booking.Status.COMPLETED)
+		self.assertIsNone(booking.completes_on)
+
+	def test_sweeper_completes_confirmed_bookings_past_checkout_in_batches(self):
+		bookings = [
+			Booking.objects.create(
+				guest=self.guest_profile,
+				room=self.room,
+				guest_name="Guest User",
+				guest_email="guest@example.com",
+				guest_phone="1234567890",
+				payment_option=Booking.PaymentOption.PAY_NOW,
+			)
+			for _ in range(3)
+		]
+		yesterday = datetime.date.today() - datetime.timedelta(days=1)
+		Booking.objects.filter(id__in=[booking.id for booking in bookings]).update(
+			checkout_date=yesterday,
+			completes_on=yesterday,
+		)
+
+		output = StringIO()
+		call_command("sweep_bookings", "--once", "--batch-size", "2", stdout=output)
+
+		self.assertIn("0 expired, 3 completed", output.getvalue())
+		self.assertEqual(
+			Booking.objects.filter(status=Booking.Status.COMPLETED).count(),
+			3,
+		)
+
 	def test_guest_can_cancel_own_pending_booking(self):
 		booking = Booking.objects.create(
 			guest=self.guest_profile,
@@ -279,9 +494,8 @@ class BookingStatusRulesTests(TestCase):
 
 		self.assertEqual(response.status_code, 302)
 		booking.refresh_from_db()
-		self.room.refresh_from_db()
 		self.assertEqual(booking.status, Booking.Status.CANCELED)
-		self.assertEqual(self.room.available_rooms, 2)
+		self.assertEqual(self.room.available_rooms_for(self.room.checkin_date, self.room.checkout_date), 2)
 
 	def test_hotel_can_cancel_pending_booking_for_own_room(self):
 		booking = Booking.objects.create(
@@ -301,9 +515,8 @@ class BookingStatusRulesTests(TestCase):
 
 		self.assertEqual(response.status_code, 302)
 		booking.refresh_from_db()
-		self.room.refresh_from_db()
 		self.assertEqual(booking.status, Booking.Status.CANCELED)
-		self.assertEqual(self.room.available_rooms, 2)
+		self.assertEqual(self.room.available_rooms_for(self.room.checkin_date, self.room.checkout_date), 2)
 
 	def test_cancel_action_ignores_non_pending_booking(self):
 		booking = Booking.objects.create(
@@ -344,28 +557,6 @@ class BookingStatusRulesTests(TestCase):
 		self.assertEqual(booking.payment_option, Booking.PaymentOption.PAY_NOW)
 		self.assertEqual(booking.status, Booking.Status.CONFIRMED)
 
-	def test_status_change_creates_notifications_for_guest_and_hotel(self):
-		booking = Booking.objects.create(
-			guest=self.guest_profile,
-			room=self.room,
-			guest_name="Guest User",
-			guest_email="guest@example.com",
-			guest_phone="1234567890",
-			payment_option=Booking.PaymentOption.PAY_LATER,
-		)
-
-		booking.payment_option = Booking.PaymentOption.PAY_NOW
-		booking.status = Booking.Status.CONFIRMED
-		booking.save(update_fields=["payment_option", "status"])
-
-		self.assertEqual(
-			BookingNotification.objects.filter(
-				booking=booking,
-				status=Booking.Status.CONFIRMED,
-			).count(),
-			2,
-		)
-
 	def test_pay_now_action_ignores_non_pending_booking(self):
 		booking = Booking.objects.create(
 			guest=self.guest_profile,
@@ -384,54 +575,6 @@ class BookingStatusRulesTests(TestCase):
 		self.assertEqual(booking.payment_option, Booking.PaymentOption.PAY_NOW)
 		self.assertEqual(booking.status, Booking.Status.CONFIRMED)
 
-	def test_guest_history_marks_notification_as_read(self):
-		booking = Booking.objects.create(
-			guest=self.guest_profile,
-			room=self.room,
-			guest_name="Guest User",
-			guest_email="guest@example.com",
-			guest_phone="1234567890",
-			payment_option=Booking.PaymentOption.PAY_LATER,
-		)
-		notification = BookingNotification.objects.get(
-			recipient=self.guest_profile,
-			booking=booking,
-			status=Booking.Status.PENDING,
-		)
-
-		self.client.login(username="guest_user", password="pass1234")
-		response = self.client.get(
-			f"{reverse('booking_history')}?state=all&notification={notification.id}"
-		)
-
-		self.assertEqual(response.status_code, 200)
-		notification.refresh_from_db()
-		self.assertTrue(notification.is_read)
-
-	def test_hotel_history_marks_notification_as_read(self):
-		booking = Booking.objects.create(
-			guest=self.guest_profile,
-			room=self.room,
-			guest_name="Guest User",
-			guest_email="guest@example.com",
-			guest_phone="1234567890",
-			payment_option=Booking.PaymentOption.PAY_LATER,
-		)
-		notification = BookingNotification.objects.get(
-			recipient=self.hotel_profile,
-			booking=booking,
-			status=Booking.Status.PENDING,
-		)
-
-		self.client.login(username="hotel_user", password="pass1234")
-		response = self.client.get(
-			f"{reverse('hotel_booking_history')}?state=all&notification={notification.id}"
-		)
-
-		self.assertEqual(response.status_code, 200)
-		notification.refresh_from_db()
-		self.assertTrue(notification.is_read)
-
 	def test_checkout_pay_now_credit_card_confirms_booking(self):
 		self.client.login(username="guest_user", password="pass1234")
 		response = self.client.post(
@@ -495,139 +638,47 @@ class BookingStatusRulesTests(TestCase):
 		self.assertEqual(booking.payment_option, Booking.PaymentOption.PAY_NOW)
 		self.assertEqual(booking.status, Booking.Status.CONFIRMED)
 
-	def test_guest_can_edit_existing_hotel_review(self):
-		booking = Booking.objects.create(
-			guest=self.guest_profile,
-			room=self.room,
-			guest_name="Guest User",
-			guest_email="guest@example.com",
-			guest_phone="1234567890",
-			payment_option=Booking.PaymentOption.PAY_NOW,
-		)
-		review = BookingReview.objects.create(
-			booking=booking,
-			rating=2,
-			comment="Old review",
-		)
-
-		self.client.login(username="guest_user", password="pass1234")
-		response = self.client.post(
-			reverse("guest_hotel_profile", kwargs={"hotel_id": self.hotel_profile.id}),
-			{
-				f"hotel-review-{self.hotel_profile.id}-rating": 5,
-				f"hotel-review-{self.hotel_profile.id}-comment": "Updated review",
-			},
-		)
-
-		self.assertEqual(response.status_code, 302)
-		review.refresh_from_db()
-		self.assertEqual(review.rating, 5)
-		self.assertEqual(review.comment, "Updated review")
-		self.assertEqual(BookingReview.objects.filter(booking__room__hotel=self.hotel_profile).count(), 1)
-		notification = BookingNotification.objects.get(
-			recipient=self.hotel_profile,
-			booking=booking,
-			status=BookingNotification.Type.REVIEW_UPDATED,
-		)
-		self.assertFalse(notification.is_read)
-
-	def test_guest_rating_submission_notifies_hotel_immediately(self):
-		booking = Booking.objects.create(
-			guest=self.guest_profile,
-			room=self.room,
-			guest_name="Guest User",
-			guest_email="guest@example.com",
-			guest_phone="1234567890",
-			payment_option=Booking.PaymentOption.PAY_NOW,
-		)
-
-		self.client.login(username="guest_user", password="pass1234")
-		response = self.client.post(
-			reverse("guest_hotel_profile", kwargs={"hotel_id": self.hotel_profile.id}),
-			{
-				f"hotel-review-{self.hotel_profile.id}-rating": 4,
-				f"hotel-review-{self.hotel_profile.id}-comment": "Great stay",
-			},
-		)
-
-		self.assertEqual(response.status_code, 302)
-		notification = BookingNotification.objects.get(
-			recipient=self.hotel_profile,
-			booking=booking,
-			status=BookingNotification.Type.REVIEW_ADDED,
-		)
-		self.assertFalse(notification.is_read)
-		self.assertEqual(notification.message, "A guest submitted a new rating and review.")
-
-	def test_hotel_review_notification_link_targets_reviews_page(self):
-		booking = Booking.objects.create(
-			guest=self.guest_profile,
-			room=self.room,
-			guest_name="Guest User",
-			guest_email="guest@example.com",
-			guest_phone="1234567890",
-			payment_option=Booking.PaymentOption.PAY_NOW,
-		)
-		notification = BookingNotification.objects.create(
-			recipient=self.hotel_profile,
-			booking=booking,
-			status=BookingNotification.Type.REVIEW_ADDED,
-			message="A guest submitted a new rating and review.",
-		)
-
-		self.client.login(username="hotel_user", password="pass1234")
-		response = self.client.get(reverse("hotel_home"))
-
-		self.assertEqual(response.status_code, 200)
-		links = [item.history_url for item in response.context["booking_notifications"]]
-		self.assertIn(
-			f"{reverse('hotel_reviews')}?notification={notification.id}",
-			links,
-		)
-
-	def test_hotel_reviews_page_marks_review_notification_as_read(self):
+	def test_saves_compare_against_loaded_values_without_reselecting(self):
 		booking = Booking.objects.create(
 			guest=self.guest_profile,
 			room=self.room,
 			guest_name="Guest User",
 			guest_email="guest@example.com",
 			guest_phone="1234567890",
-			payment_option=Booking.PaymentOption.PAY_NOW,
-		)
-		notification = BookingNotification.objects.create(
-			recipient=self.hotel_profile,
-			booking=booking,
-			status=BookingNotification.Type.REVIEW_UPDATED,
-			message="A guest updated their rating and review.",
+			payment_option=Booking.PaymentOption.PAY_LATER,
 		)
-
-		self.client.login(username="hotel_user", password="pass1234")
-		response = self.client.get(
-			f"{reverse('hotel_reviews')}?notification={notification.id}"
+		review = BookingReview.objects.create(booking=booking, rating=3, comment="Fine")
+
+		booking = Booking.objects.select_related("room").get(id=booking.id)
+		with self.assertNumQueries(1):
+			booking.save(update_fields=["guest_phone"])
+		with self.assertNumQueries(4):
+			booking.status = Booking.Status.CONFIRMED
+			booking.save(update_fields=["status"])
+		with self.assertNumQueries(1):
+			booking.save(update_fields=["status"])
+
+		review = BookingReview.objects.get(id=review.id)
+		with self.assertNumQueries(1):
+			review.save()
+		self.assertFalse(
+			BookingNotification.objects.filter(
+				booking=booking,
+				status=BookingNotification.Type.REVIEW_UPDATED,
+			).exists()
 		)
 
-		self.assertEqual(response.status_code, 200)
-		notification.refresh_from_db()
-		self.assertTrue(notification.is_read)
-
-	def test_hotel_reviews_page_lists_guest_reviews(self):
-		booking = Booking.objects.create(
+		unloaded = Booking(
+			id=booking.id,
 			guest=self.guest_profile,
 			room=self.room,
-			guest_name="Guest User",
-			guest_email="guest@example.com",
-			guest_phone="1234567890",
-			payment_option=Booking.PaymentOption.PAY_NOW,
+			checkout_date=booking.checkout_date,
+			status=Booking.Status.CANCELED,
 		)
-		BookingReview.objects.create(
-			booking=booking,
-			rating=4,
-			comment="Great stay",
+		unloaded._state.adding = False
+		with self.assertNumQueries(5):
+			unloaded.save(update_fields=["status"])
+		self.assertEqual(
+			BookingNotification.objects.filter(booking=booking, status=Booking.Status.CANCELED).count(),
+			2,
 		)
-
-		self.client.login(username="hotel_user", password="pass1234")
-		response = self.client.get(reverse("hotel_reviews"))
-
-		self.assertEqual(response.status_code, 200)
-		self.assertContains(response, "Ratings &amp; Reviews")
-		self.assertContains(response, "Great stay")
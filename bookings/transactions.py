@@ -0,0 +1,87 @@
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.02
+RETRY_MAX_DELAY = 0.5
+
+_retry_counts = Counter()
+_retry_counts_lock = threading.Lock()
+
+
+def _count_retry(name: str):
+	with _retry_counts_lock:
+		_retry_counts[name] += 1
+
+
+def retry_stats(*, reset: bool = False) -> dict:
+	"""Return this process's transaction ``retries`` and ``exhausted`` retry loops."""
+	with _retry_counts_lock:
+		stats = {name: _retry_counts[name] for name in ("retries", "exhausted")}
+		if reset:
+			_retry_counts.clear()
+	return stats
+
+
+def retry_delay(attempt: int, *, base_delay: float = RETRY_BASE_DELAY) -> float:
+	"""Exponential backoff with full jitter, capped at ``RETRY_MAX_DELAY``."""
+	return random.uniform(0, min(base_delay * (2**attempt), RETRY_MAX_DELAY))
+
+
+@contextmanager
+def write_atomic(using=None):
+	"""``atomic()`` that takes the write lock when the transaction begins.
+
+	A deferred SQLite transaction that reads before it writes has to upgrade
+	its lock mid-way, and fails at once if another writer got there first.
+	``BEGIN IMMEDIATE`` queues on the busy timeout instead. Other backends,
+	and blocks nested in an open transaction, get a plain ``atomic()``.
+	"""
+	connection = transaction.get_connection(using)
+	if not settings.SQLITE_IMMEDIATE_WRITES or connection.vendor != "sqlite" or connection.in_atomic_block:
+		with transaction.atomic(using=using):
+			yield
+		return
+
+	# The backend reads transaction_mode from OPTIONS when it connects.
+	connection.ensure_connection()
+	transaction_mode = connection.transaction_mode
+	connection.transaction_mode = "IMMEDIATE"
+	try:
+		with transaction.atomic(using=using):
+			connection.transaction_mode = transaction_mode
+			yield
+	finally:
+		connection.transaction_mode = transaction_mode
+
+
+def run_in_transaction(
+	func,
+	*,
+	attempts: int = RETRY_ATTEMPTS,
+	base_delay: float = RETRY_BASE_DELAY,
+	immediate: bool = False,
+):
+	"""Run ``func`` in its own transaction, retrying when the database is contended.
+
+	Lock timeouts, deadlocks and serialization failures surface as
+	``OperationalError``; the whole transaction is replayed after a short
+	backoff so the caller never has to hold a row lock while it waits.
+	``immediate`` opens it with ``write_atomic()``.
+	"""
+	for attempt in range(attempts):
+		try:
+			with write_atomic() if immediate else transaction.atomic():
+				return func()
+		except OperationalError:
+			if attempt == attempts - 1:
+				_count_retry("exhausted")
+				raise
+			_count_retry("retries")
+			time.sleep(retry_delay(attempt, base_delay=base_delay))
@@ -19,4 +19,10 @@ urlpatterns = [
         views.hotel_cancel_booking_view,
         name="hotel_booking_cancel",
     ),
+    path(
+        "notifications/mark-all-read/",
+        views.mark_all_notifications_read_view,
+        name="notifications_mark_all_read",
+    ),
+    path("notifications/stream/", views.notification_stream_view, name="notifications_stream"),
 ]
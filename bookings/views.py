@@ -1,17 +1,28 @@
 import datetime
+import json
+import time
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.db import transaction
-from django.db.models import F
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection
+from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.utils import timezone
+from django.utils import dateformat, timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.encoding import force_str
+from django.utils.http import url_has_allowed_host_and_scheme, urlsafe_base64_decode, urlsafe_base64_encode
 
 from accounts.models import Profile
 from rooms.models import Room
 
 from .forms import BookingCheckoutForm, BookingReviewForm
-from .models import Booking, BookingNotification, BookingReview
+from .inbox_events import InboxSubscription
+from .models import Booking, BookingNotification, BookingReview, NotificationInbox
+from .writer import run_write
 
 
 BOOKING_STATE_LABELS = {
@@ -24,26 +35,68 @@ BOOKING_STATE_LABELS = {
 }
 
 
-def resolve_booking_state(booking: Booking) -> str:
-	booking.refresh_status(now=timezone.now(), save=True)
-	return booking.status
+def encode_history_cursor(booking: Booking) -> str:
+	return urlsafe_base64_encode(f"{booking.created_at.isoformat()}|{booking.id}".encode())
 
 
-def expire_overdue_pending_bookings(queryset):
-	expiry_cutoff = timezone.now() - datetime.timedelta(hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS)
-	overdue_bookings = list(
-		queryset.select_related("room").filter(
-		status=Booking.Status.PENDING,
-		payment_option=Booking.PaymentOption.PAY_LATER,
-		created_at__lte=expiry_cutoff,
-		)
-	)
-	for booking in overdue_bookings:
-		booking.status = Booking.Status.EXPIRED
-		booking.save(update_fields=["status"])
-		Room.objects.filter(id=booking.room_id).update(
-			available_rooms=F("available_rooms") + booking.rooms_count
+def decode_history_cursor(value: str):
+	try:
+		created_at_value, booking_id = force_str(urlsafe_base64_decode(value)).split("|")
+		created_at = parse_datetime(created_at_value)
+		return (created_at, int(booking_id)) if created_at else None
+	except (TypeError, ValueError):
+		return None
+
+
+def paginate_bookings(bookings_qs, cursor_value: str):
+	"""Return one page of bookings, newest first, and the cursor of the next page.
+
+	Pages are keyed on (created_at, id) so page N costs the same index range
+	scan as page 1.
+	"""
+	page_size = settings.BOOKING_HISTORY_PAGE_SIZE
+	bookings_qs = bookings_qs.order_by("-created_at", "-id")
+	cursor = decode_history_cursor(cursor_value) if cursor_value else None
+	if cursor is not None:
+		created_at, booking_id = cursor
+		bookings_qs = bookings_qs.filter(
+			Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=booking_id)
 		)
+	page = list(bookings_qs[: page_size + 1])
+	next_cursor = encode_history_cursor(page[page_size - 1]) if len(page) > page_size else ""
+	return page[:page_size], next_cursor
+
+
+def booking_state_tabs(bookings, selected_state: str, available_states: list[str]) -> list[dict]:
+	state_counts = bookings.effective_state_counts()
+	state_counts["all"] = sum(state_counts.values())
+	return [
+		{
+			"code": state,
+			"label": BOOKING_STATE_LABELS[state],
+			"count": state_counts.get(state, 0),
+			"is_active": selected_state == state,
+		}
+		for state in available_states
+	]
+
+
+def requested_stay(room: Room, data) -> tuple[datetime.date, datetime.date]:
+	def parse_stay_date(value):
+		try:
+			return parse_date((value or "").strip())
+		except ValueError:
+			return None
+
+	checkin_date = parse_stay_date(data.get("checkin_date") or data.get("checkin")) or room.checkin_date
+	checkout_date = parse_stay_date(data.get("checkout_date") or data.get("checkout")) or room.checkout_date
+	if (
+		checkin_date < room.checkin_date
+		or checkout_date > room.checkout_date
+		or checkout_date < checkin_date
+	):
+		return room.checkin_date, room.checkout_date
+	return checkin_date, checkout_date
 
 
 @login_required
@@ -63,75 +116,78 @@ def checkout_view(request, room_id: int):
 		id=room_id,
 	)
 	account_email = (request.user.email or "").strip().lower()
-	expire_overdue_pending_bookings(Booking.objects.filter(room=room))
-	room.refresh_from_db(fields=["available_rooms"])
+	stay_checkin, stay_checkout = requested_stay(
+		room,
+		request.POST if request.method == "POST" else request.GET,
+	)
+	max_rooms_available = room.available_rooms_for(stay_checkin, stay_checkout)
 
 	initial_data = {
 		"guest_name": profile.full_name or request.user.username,
 		"guest_email": account_email,
 		"guest_phone": profile.phone_number,
+		"checkin_date": stay_checkin,
+		"checkout_date": stay_checkout,
 		"payment_option": Booking.PaymentOption.PAY_LATER,
 	}
 	form = BookingCheckoutForm(
 		request.POST or None,
 		initial=initial_data,
 		fixed_email=account_email,
-		max_rooms_available=room.available_rooms,
+		max_rooms_available=max_rooms_available,
+		stay_window=(room.checkin_date, room.checkout_date),
 	)
 
 	if request.method == "POST" and form.is_valid():
 		guest_name = form.cleaned_data["guest_name"].strip()
 		guest_phone = form.cleaned_data["guest_phone"]
 		rooms_count = form.cleaned_data["rooms_count"]
+		checkin_date = form.cleaned_data["checkin_date"]
+		checkout_date = form.cleaned_data["checkout_date"]
 		payment_option = form.cleaned_data["payment_option"]
 		payment_method = form.cleaned_data.get("payment_method")
 
-		expire_overdue_pending_bookings(Booking.objects.filter(guest=profile, room=room))
-		room.refresh_from_db(fields=["available_rooms"])
-
-		with transaction.atomic():
-			locked_room = (
-				Room.objects.select_for_update()
-				.select_related("hotel", "room_type")
-				.filter(id=room_id)
-				.first()
+		effective_payment_option = payment_option
+		if (
+			payment_option == Booking.PaymentOption.PAY_NOW
+			and payment_method == BookingCheckoutForm.PAYMENT_METHOD_DIGITAL_PAYMENT
+		):
+			effective_payment_option = Booking.PaymentOption.PAY_LATER
+
+		def reserve_and_book():
+			if not room.reserve_nights(rooms_count, checkin_date, checkout_date):
+				return None
+			booking = Booking.objects.create(
+				guest=profile,
+				room=room,
+				guest_name=guest_name,
+				guest_email=account_email,
+				guest_phone=guest_phone,
+				rooms_count=rooms_count,
+				checkin_date=checkin_date,
+				checkout_date=checkout_date,
+				payment_option=effective_payment_option,
 			)
-			if locked_room is None or locked_room.available_rooms < rooms_count:
-				form.add_error(None, "Requested number of rooms is no longer available.")
-			else:
-				effective_payment_option = payment_option
-				if (
-					payment_option == Booking.PaymentOption.PAY_NOW
-					and payment_method == BookingCheckoutForm.PAYMENT_METHOD_DIGITAL_PAYMENT
-				):
-					effective_payment_option = Booking.PaymentOption.PAY_LATER
-
-				booking = Booking.objects.create(
-					guest=profile,
-					room=locked_room,
-					guest_name=guest_name,
-					guest_email=account_email,
-					guest_phone=guest_phone,
-					rooms_count=rooms_count,
-					payment_option=effective_payment_option,
-				)
-				Room.objects.filter(id=locked_room.id).update(
-					available_rooms=F("available_rooms") - rooms_count
-				)
 
-				if guest_name:
-					profile.full_name = guest_name
-				profile.phone_number = guest_phone
-				profile.save(update_fields=["full_name", "phone_number"])
+			if guest_name:
+				profile.full_name = guest_name
+			profile.phone_number = guest_phone
+			profile.save(update_fields=["full_name", "phone_number"])
+			return booking
 
-				if (
-					payment_option == Booking.PaymentOption.PAY_NOW
-					and payment_method == BookingCheckoutForm.PAYMENT_METHOD_DIGITAL_PAYMENT
-				):
-					return redirect("booking_mock_digital_payment", booking_id=booking.id)
-
-				return redirect("home")
+		booking = run_write(reserve_and_book)
+		if booking is None:
+			form.add_error(None, "Requested number of rooms is no longer available.")
+		else:
+			if (
+				payment_option == Booking.PaymentOption.PAY_NOW
+				and payment_method == BookingCheckoutForm.PAYMENT_METHOD_DIGITAL_PAYMENT
+			):
+				return redirect("booking_mock_digital_payment", booking_id=booking.id)
+
+			return redirect("home")
 	room.refresh_from_db(fields=["available_rooms"])
+	max_rooms_available = room.available_rooms_for(stay_checkin, stay_checkout)
 
 	return render(
 		request,
@@ -139,6 +195,7 @@ def checkout_view(request, room_id: int):
 		{
 			"room": room,
 			"form": form,
+			"max_rooms_available": max_rooms_available,
 		},
 	)
 
@@ -197,27 +254,29 @@ def history_view(request):
 		BookingNotification.objects.filter(
 			id=int(notification_id),
 			recipient=profile,
-			is_read=False,
-		).update(is_read=True)
+		).mark_read()
 
 	available_states = ["all", "pending", "confirmed", "completed", "canceled", "expired"]
 	selected_state = (request.GET.get("state") or "all").strip().lower()
 	if selected_state not in available_states:
 		selected_state = "all"
 
-	expire_overdue_pending_bookings(Booking.objects.filter(guest=profile))
+	guest_bookings = Booking.objects.filter(guest=profile)
+	state_tabs = booking_state_tabs(guest_bookings, selected_state, available_states)
 
-	bookings = list(
-		Booking.objects.select_related("room", "room__hotel", "room__room_type", "review")
-		.filter(guest=profile)
-		.order_by("-created_at")
+	bookings_qs = guest_bookings.with_effective_state().select_related(
+		"room",
+		"room__hotel",
+		"room__room_type",
+		"review",
 	)
+	if selected_state != "all":
+		bookings_qs = bookings_qs.filter(effective_state=selected_state)
+	cursor = (request.GET.get("cursor") or "").strip()
+	filtered_bookings, next_cursor = paginate_bookings(bookings_qs, cursor)
 
-	state_counts = {state: 0 for state in available_states}
-	filtered_bookings = []
-
-	for booking in bookings:
-		computed_state = resolve_booking_state(booking)
+	for booking in filtered_bookings:
+		computed_state = booking.effective_state
 		booking.review_obj = None
 		try:
 			booking.review_obj = booking.review
@@ -229,25 +288,8 @@ def history_view(request):
 				prefix=f"review-{booking.id}",
 				instance=booking.review_obj,
 			)
-		booking.payment_expires_at = booking.created_at + datetime.timedelta(
-			hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS
-		)
-		state_counts["all"] += 1
-		state_counts[computed_state] += 1
 		booking.computed_state = computed_state
 		booking.computed_state_label = BOOKING_STATE_LABELS[computed_state]
-		if selected_state == "all" or selected_state == computed_state:
-			filtered_bookings.append(booking)
-
-	state_tabs = [
-		{
-			"code": state,
-			"label": BOOKING_STATE_LABELS[state],
-			"count": state_counts[state],
-			"is_active": selected_state == state,
-		}
-		for state in available_states
-	]
 
 	return render(
 		request,
@@ -257,6 +299,8 @@ def history_view(request):
 			"bookings": filtered_bookings,
 			"state_tabs": state_tabs,
 			"selected_state": selected_state,
+			"cursor": cursor,
+			"next_cursor": next_cursor,
 		},
 	)
 
@@ -299,7 +343,7 @@ def booking_review_view(request, booking_id: int):
 	if form.is_valid():
 		review = form.save(commit=False)
 		review.booking = booking
-		review.save()
+		run_write(review.save)
 
 	return redirect(f"{reverse('booking_history')}?state=completed#booking-{booking.id}")
 
@@ -321,51 +365,30 @@ def hotel_history_view(request):
 		BookingNotification.objects.filter(
 			id=int(notification_id),
 			recipient=profile,
-			is_read=False,
-		).update(is_read=True)
+		).mark_read()
 
 	available_states = ["all", "pending", "confirmed", "completed", "canceled", "expired"]
 	selected_state = (request.GET.get("state") or "all").strip().lower()
 	if selected_state not in available_states:
 		selected_state = "all"
 
-	expire_overdue_pending_bookings(Booking.objects.filter(room__hotel=profile))
+	hotel_bookings = Booking.objects.filter(hotel=profile)
+	state_tabs = booking_state_tabs(hotel_bookings, selected_state, available_states)
 
-	bookings = list(
-		Booking.objects.select_related(
-			"room",
-			"room__hotel",
-			"room__room_type",
-			"guest",
-		)
-		.filter(room__hotel=profile)
-		.order_by("-created_at")
+	bookings_qs = hotel_bookings.with_effective_state().select_related(
+		"room",
+		"room__hotel",
+		"room__room_type",
+		"guest",
 	)
+	if selected_state != "all":
+		bookings_qs = bookings_qs.filter(effective_state=selected_state)
+	cursor = (request.GET.get("cursor") or "").strip()
+	filtered_bookings, next_cursor = paginate_bookings(bookings_qs, cursor)
 
-	state_counts = {state: 0 for state in available_states}
-	filtered_bookings = []
-
-	for booking in bookings:
-		computed_state = resolve_booking_state(booking)
-		booking.payment_expires_at = booking.created_at + datetime.timedelta(
-			hours=Booking.PENDING_PAYMENT_EXPIRY_HOURS
-		)
-		state_counts["all"] += 1
-		state_counts[computed_state] += 1
-		booking.computed_state = computed_state
-		booking.computed_state_label = BOOKING_STATE_LABELS[computed_state]
-		if selected_state == "all" or selected_state == computed_state:
-			filtered_bookings.append(booking)
-
-	state_tabs = [
-		{
-			"code": state,
-			"label": BOOKING_STATE_LABELS[state],
-			"count": state_counts[state],
-			"is_active": selected_state == state,
-		}
-		for state in available_states
-	]
+	for booking in filtered_bookings:
+		booking.computed_state = booking.effective_state
+		booking.computed_state_label = BOOKING_STATE_LABELS[booking.effective_state]
 
 	return render(
 		request,
@@ -375,6 +398,8 @@ def hotel_history_view(request):
 			"bookings": filtered_bookings,
 			"state_tabs": state_tabs,
 			"selected_state": selected_state,
+			"cursor": cursor,
+			"next_cursor": next_cursor,
 		},
 	)
 
@@ -394,7 +419,7 @@ def cancel_booking_view(request, booking_id: int):
 	if profile.account_type != Profile.AccountType.GUEST:
 		return redirect("hotel_home")
 
-	with transaction.atomic():
+	def cancel_pending_booking():
 		booking = (
 			Booking.objects.select_for_update()
 			.select_related("room")
@@ -402,18 +427,12 @@ def cancel_booking_view(request, booking_id: int):
 			.first()
 		)
 		if booking is None:
-			return redirect("booking_history")
-
+			return
 		booking.refresh_status(now=timezone.now(), save=True)
-		if booking.status != Booking.Status.PENDING:
-			return redirect("booking_history")
-
-		booking.status = Booking.Status.CANCELED
-		booking.save(update_fields=["status"])
-		Room.objects.filter(id=booking.room_id).update(
-			available_rooms=F("available_rooms") + booking.rooms_count
-		)
+		if booking.status == Booking.Status.PENDING:
+			Booking.objects.filter(id=booking.id).cancel()
 
+	run_write(cancel_pending_booking)
 	return redirect("booking_history")
 
 
@@ -432,25 +451,25 @@ def pay_now_booking_view(request, booking_id: int):
 	if profile.account_type != Profile.AccountType.GUEST:
 		return redirect("hotel_home")
 
-	with transaction.atomic():
+	def pay_pending_booking():
 		booking = (
 			Booking.objects.select_for_update()
 			.filter(id=booking_id, guest=profile)
 			.first()
 		)
 		if booking is None:
-			return redirect("booking_history")
-
+			return
 		booking.refresh_status(now=timezone.now(), save=True)
 		if booking.status != Booking.Status.PENDING:
-			return redirect("booking_history")
+			return
 		if booking.payment_option != Booking.PaymentOption.PAY_LATER:
-			return redirect("booking_history")
+			return
 
 		booking.payment_option = Booking.PaymentOption.PAY_NOW
 		booking.status = Booking.Status.CONFIRMED
 		booking.save(update_fields=["payment_option", "status"])
 
+	run_write(pay_pending_booking)
 	return redirect("booking_history")
 
 
@@ -469,24 +488,164 @@ def hotel_cancel_booking_view(request, booking_id: int):
 	if profile.account_type != Profile.AccountType.HOTEL:
 		return redirect("home")
 
-	with transaction.atomic():
+	def cancel_pending_booking():
 		booking = (
 			Booking.objects.select_for_update()
 			.select_related("room")
-			.filter(id=booking_id, room__hotel=profile)
+			.filter(id=booking_id, hotel=profile)
 			.first()
 		)
 		if booking is None:
-			return redirect("hotel_booking_history")
-
+			return
 		booking.refresh_status(now=timezone.now(), save=True)
-		if booking.status != Booking.Status.PENDING:
-			return redirect("hotel_booking_history")
-
-		booking.status = Booking.Status.CANCELED
-		booking.save(update_fields=["status"])
-		Room.objects.filter(id=booking.room_id).update(
-			available_rooms=F("available_rooms") + booking.rooms_count
-		)
+		if booking.status == Booking.Status.PENDING:
+			Booking.objects.filter(id=booking.id).cancel()
 
+	run_write(cancel_pending_booking)
 	return redirect("hotel_booking_history")
+
+
+@login_required
+def mark_all_notifications_read_view(request):
+	profile, _ = Profile.objects.get_or_create(
+		user=request.user,
+		defaults={
+			"full_name": request.user.get_full_name() or request.user.username,
+			"account_type": Profile.AccountType.GUEST,
+		},
+	)
+	if request.method == "POST":
+		NotificationInbox.mark_all_read(profile.id)
+
+	next_url = request.POST.get("next") or request.GET.get("next") or ""
+	if url_has_allowed_host_and_scheme(
+		next_url,
+		allowed_hosts={request.get_host()},
+		require_https=request.is_secure(),
+	):
+		return redirect(next_url)
+	if profile.account_type == Profile.AccountType.HOTEL:
+		return redirect("hotel_home")
+	return redirect("home")
+
+
+def notification_event(event: str, data: dict, event_id: int | None = None) -> str:
+	lines = [f"id: {event_id}"] if event_id is not None else []
+	lines.append(f"event: {event}")
+	lines.append(f"data: {json.dumps(data)}")
+	return "\n".join(lines) + "\n\n"
+
+
+@sync_to_async
+def read_notification_inbox(profile_id: int, last_event_id: int | None) -> tuple[dict, list]:
+	"""Read the inbox row and any notifications after ``last_event_id``.
+
+	The connection is closed afterwards, so a stream waiting between reads
+	holds no database connection.
+	"""
+	try:
+		inbox = NotificationInbox.objects.filter(recipient_id=profile_id).values(
+			"last_notification_id",
+			"unread_count",
+		).first() or {"last_notification_id": 0, "unread_count": 0}
+		new_notifications = []
+		if last_event_id is not None and inbox["last_notification_id"] > last_event_id:
+			new_notifications = list(
+				BookingNotification.objects.filter(
+					recipient_id=profile_id,
+					id__gt=last_event_id,
+					is_read=False,
+				).order_by("id")
+			)
+		return inbox, new_notifications
+	finally:
+		connection.close()
+
+
+async def notification_events(profile: Profile, last_event_id: int | None, *, long_poll: bool):
+	"""Yield server-sent events for notifications after ``last_event_id``.
+
+	Each pass reads only the recipient's inbox row; notification rows are
+	fetched when the inbox shows something newer than the last event sent.
+	Between passes the stream waits on an ``InboxSubscription``, woken when
+	this process commits a change to the inbox. Another process's changes
+	arrive with the next keepalive, when the inbox is read again.
+
+	A stream stays open for ``BOOKING_NOTIFICATION_STREAM_MAX_AGE``. A
+	``long_poll`` instead ends as soon as it has sent a new notification or
+	a change in the unread count, or after ``BOOKING_NOTIFICATION_STREAM_LONG_POLL``.
+	"""
+	yield f"retry: {settings.BOOKING_NOTIFICATION_STREAM_RETRY_MS}\n\n"
+	unread_count = None
+	opened_at = last_sent_at = time.monotonic()
+	max_age = settings.BOOKING_NOTIFICATION_STREAM_LONG_POLL if long_poll else settings.BOOKING_NOTIFICATION_STREAM_MAX_AGE
+	with InboxSubscription(profile.id) as inbox_changes:
+		while True:
+			inbox, new_notifications = await read_notification_inbox(profile.id, last_event_id)
+			if last_event_id is None:
+				last_event_id = inbox["last_notification_id"]
+
+			changed = sent = bool(new_notifications)
+			for notification in new_notifications:
+				yield notification_event(
+					"notification",
+					{
+						"id": notification.id,
+						"message": notification.message,
+						"created_at": dateformat.format(timezone.localtime(notification.created_at), "M j, g:i A"),
+						"history_url": notification.history_url_for(profile.account_type),
+					},
+					event_id=notification.id,
+				)
+			last_event_id = max(last_event_id, inbox["last_notification_id"])
+
+			if inbox["unread_count"] != unread_count:
+				# The first count only tells the page where it stands.
+				changed = changed or unread_count is not None
+				unread_count = inbox["unread_count"]
+				yield notification_event("unread", {"unread_count": unread_count})
+				sent = True
+			if sent:
+				last_sent_at = time.monotonic()
+			if long_poll and changed:
+				return
+
+			while True:
+				now = time.monotonic()
+				closes_in = max_age - (now - opened_at)
+				if closes_in <= 0:
+					return
+				keepalive_in = settings.BOOKING_NOTIFICATION_STREAM_KEEPALIVE - (now - last_sent_at)
+				if keepalive_in <= 0:
+					if not long_poll:
+						yield ": keepalive\n\n"
+					last_sent_at = time.monotonic()
+					break
+				if await inbox_changes.wait(min(keepalive_in, closes_in)):
+					break
+
+
+@login_required
+async def notification_stream_view(request):
+	user = await request.auser()
+	profile = await Profile.objects.filter(user_id=user.pk).only("id", "account_type").afirst()
+	if profile is None:
+		# 204 tells EventSource to stop reconnecting.
+		return HttpResponse(status=204)
+
+	last_event_id = (request.headers.get("Last-Event-ID") or request.GET.get("last_event_id") or "").strip()
+	last_event_id = int(last_event_id) if last_event_id.isdigit() else None
+	if not isinstance(request, ASGIRequest):
+		# WSGI cannot stream an async iterator, and a stream would pin a
+		# worker thread. Hold a bounded long-poll instead and answer once,
+		# and the browser reconnects after ``retry``.
+		events = notification_events(profile, last_event_id, long_poll=True)
+		response = HttpResponse("".join([event async for event in events]), content_type="text/event-stream")
+	else:
+		response = StreamingHttpResponse(
+			notification_events(profile, last_event_id, long_poll=False),
+			content_type="text/event-stream",
+		)
+	response["Cache-Control"] = "no-cache"
+	response["X-Accel-Buffering"] = "no"
+	return response
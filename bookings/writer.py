@@ -0,0 +1,195 @@
+"""Optional single-writer queue for booking mutations.
+
+With ``BOOKING_SINGLE_WRITER`` on, ``run_write()`` hands each mutation to
+one dedicated thread instead of running it on the caller's connection. The
+thread drains whatever is queued (up to ``BOOKING_WRITER_MAX_BATCH``) into
+one ``write_atomic()`` transaction, with each mutation in its own
+savepoint. Callers block on a future for their own result or exception;
+a caller that gives up cancels its future, and a cancelled mutation is
+skipped instead of committing after the caller has already failed.
+SQLite then sees a single writer committing groups of mutations, instead
+of many writers queuing on the lock. Reads stay on the callers' connections.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, connection, transaction
+
+from .transactions import RETRY_ATTEMPTS, _count_retry, retry_delay, run_in_transaction, write_atomic
+
+logger = logging.getLogger(__name__)
+
+_writer_counts = Counter()
+_writer_counts_lock = threading.Lock()
+
+
+class BookingWriter:
+	def __init__(self, *, max_batch: int, max_wait: float):
+		self.max_batch = max_batch
+		self.max_wait = max_wait
+		self._queue = queue.SimpleQueue()
+		self._thread = threading.Thread(target=self._run, name="booking-writer", daemon=True)
+		self._thread.start()
+
+	@property
+	def ident(self):
+		return self._thread.ident
+
+	def is_alive(self) -> bool:
+		return self._thread.is_alive()
+
+	def submit(self, func) -> Future:
+		future = Future()
+		self._queue.put((func, future))
+		return future
+
+	def stop(self, timeout: float | None = None):
+		self._queue.put(None)
+		self._thread.join(timeout)
+
+	def drain(self) -> list:
+		"""Take every mutation still queued, for a replacement writer to run."""
+		items = []
+		while True:
+			try:
+				item = self._queue.get_nowait()
+			except queue.Empty:
+				return items
+			if item is not None:
+				items.append(item)
+
+	def _next_group(self):
+		first = self._queue.get()
+		if first is None:
+			return None
+		group = [first]
+		deadline = time.monotonic() + self.max_wait
+		while len(group) < self.max_batch:
+			try:
+				item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+			except queue.Empty:
+				break
+			if item is None:
+				# Finish this group, then stop.
+				self._queue.put(None)
+				break
+			group.append(item)
+		return group
+
+	def _run(self):
+		try:
+			while (group := self._next_group()) is not None:
+				# Claim each future; those whose callers gave up are skipped.
+				group = [(func, future) for func, future in group if future.set_running_or_notify_cancel()]
+				if not group:
+					continue
+				close_old_connections()
+				self._commit(group)
+		except Exception:
+			logger.exception("Booking writer thread stopped")
+			raise
+		finally:
+			connection.close()
+
+	def _commit(self, group):
+		for attempt in range(RETRY_ATTEMPTS):
+			outcomes = []
+			try:
+				with write_atomic():
+					for func, _ in group:
+						try:
+							with transaction.atomic():
+								outcomes.append((True, func()))
+						except OperationalError:
+							# A locked database fails the whole group, which is retried.
+							raise
+						except Exception as error:
+							outcomes.append((False, error))
+			except OperationalError as error:
+				if attempt < RETRY_ATTEMPTS - 1:
+					_count_retry("retries")
+					time.sleep(retry_delay(attempt))
+					continue
+				_count_retry("exhausted")
+				outcomes = [(False, error)] * len(group)
+			except Exception as error:
+				logger.exception("Booking writer group failed to commit")
+				outcomes = [(False, error)] * len(group)
+			break
+
+		with _writer_counts_lock:
+			_writer_counts["mutations"] += len(group)
+			_writer_counts["groups"] += 1
+			_writer_counts["largest_group"] = max(_writer_counts["largest_group"], len(group))
+		for (_, future), (succeeded, value) in zip(group, outcomes):
+			if succeeded:
+				future.set_result(value)
+			else:
+				future.set_exception(value)
+
+
+_writer: BookingWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> BookingWriter:
+	"""Return the running writer, starting one if there is none or its thread died."""
+	global _writer
+	with _writer_lock:
+		if _writer is None or not _writer.is_alive():
+			stranded = _writer.drain() if _writer is not None else []
+			_writer = BookingWriter(
+				max_batch=settings.BOOKING_WRITER_MAX_BATCH,
+				max_wait=settings.BOOKING_WRITER_MAX_WAIT,
+			)
+			for func, future in stranded:
+				_writer._queue.put((func, future))
+		return _writer
+
+
+def stop_writer(timeout: float | None = None):
+	global _writer
+	with _writer_lock:
+		writer, _writer = _writer, None
+	if writer is not None:
+		writer.stop(timeout)
+
+
+def writer_stats(*, reset: bool = False) -> dict:
+	"""Return the ``mutations`` and ``groups`` the writer committed and its ``largest_group``."""
+	with _writer_counts_lock:
+		stats = {name: _writer_counts[name] for name in ("mutations", "groups", "largest_group")}
+		if reset:
+			_writer_counts.clear()
+	return stats
+
+
+def run_write(func):
+	"""Run the mutation ``func`` in a write transaction and return its result.
+
+	Runs on the single writer thread when ``BOOKING_SINGLE_WRITER`` is on.
+	If it has not started within ``BOOKING_WRITER_TIMEOUT`` it is cancelled
+	and ``concurrent.futures.TimeoutError`` (not the builtin one before
+	Python 3.11) is raised; once started, its outcome is awaited.
+	Otherwise, or when the caller already holds a transaction (whose
+	uncommitted rows the writer could not see), it runs here through
+	``run_in_transaction(..., immediate=True)``.
+	"""
+	if not settings.BOOKING_SINGLE_WRITER or connection.in_atomic_block:
+		return run_in_transaction(func, immediate=True)
+	writer = get_writer()
+	if threading.get_ident() == writer.ident:
+		return func()
+	future = writer.submit(func)
+	try:
+		return future.result(timeout=settings.BOOKING_WRITER_TIMEOUT)
+	except FutureTimeoutError:
+		if future.cancel():
+			raise
+		# Already running in a group: its commit or rollback is imminent.
+		return future.result()
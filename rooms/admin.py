@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Room, RoomType
+from .models import Room, RoomNight, RoomType
 
 
 @admin.register(RoomType)
@@ -22,3 +22,10 @@ class RoomAdmin(admin.ModelAdmin):
 	)
 	list_filter = ("room_type", "checkin_date", "checkout_date")
 	search_fields = ("hotel__full_name",)
+
+
+@admin.register(RoomNight)
+class RoomNightAdmin(admin.ModelAdmin):
+	list_display = ("room", "night", "available_rooms")
+	list_filter = ("night",)
+	search_fields = ("room__hotel__full_name",)
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:05
+
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_room_nights(apps, schema_editor):
+    room_model = apps.get_model("rooms", "Room")
+    room_night_model = apps.get_model("rooms", "RoomNight")
+    for room in room_model.objects.iterator(chunk_size=500):
+        nights_count = max((room.checkout_date - room.checkin_date).days, 1)
+        room_night_model.objects.bulk_create(
+            [
+                room_night_model(
+                    room_id=room.id,
+                    night=room.checkin_date + datetime.timedelta(days=offset),
+                    available_rooms=room.available_rooms,
+                )
+                for offset in range(nights_count)
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0002_seed_room_types'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('night', models.DateField()),
+                ('available_rooms', models.PositiveIntegerField()),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='rooms.room')),
+            ],
+            options={
+                'ordering': ('room', 'night'),
+                'indexes': [models.Index(fields=['night', 'available_rooms'], name='room_night_availability_idx')],
+                'constraints': [models.UniqueConstraint(fields=('room', 'night'), name='unique_room_night')],
+            },
+        ),
+        migrations.RunPython(build_room_nights, reverse_code=migrations.RunPython.noop),
+    ]
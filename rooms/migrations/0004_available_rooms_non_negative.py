@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_profile_hotel_license_image'),
+        ('rooms', '0003_roomnight'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='room',
+            constraint=models.CheckConstraint(condition=models.Q(('available_rooms__gte', 0)), name='room_available_rooms_non_negative'),
+        ),
+        migrations.AddConstraint(
+            model_name='roomnight',
+            constraint=models.CheckConstraint(condition=models.Q(('available_rooms__gte', 0)), name='room_night_available_rooms_non_negative'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_hotel_search_index'),
+        ('rooms', '0004_available_rooms_non_negative'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('available_rooms__gt', 0)), fields=['hotel', 'rate_per_night'], name='room_open_hotel_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('available_rooms__gt', 0)), fields=['rate_per_night', 'capacity'], name='room_open_rate_idx'),
+        ),
+    ]
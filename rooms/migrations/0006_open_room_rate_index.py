@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0005_open_room_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='room',
+            name='room_open_rate_idx',
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('available_rooms__gt', 0)), fields=['rate_per_night'], name='room_open_rate_idx'),
+        ),
+    ]
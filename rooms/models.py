@@ -1,6 +1,11 @@
-from django.db import models
+import datetime
+
+from django.db import models, transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
 
 from accounts.models import Profile
+from accounts.search import invalidate_hotel_searches
 
 
 class RoomType(models.Model):
@@ -11,6 +16,10 @@ class RoomType(models.Model):
 
 
 class Room(models.Model):
+	INVENTORY_FIELDS = {"available_rooms", "checkin_date", "checkout_date"}
+	# Changing any of these can add, drop or move the room in searches that list other hotels.
+	LISTING_FIELDS = INVENTORY_FIELDS | {"capacity", "rate_per_night"}
+
 	hotel = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="rooms")
 	room_type = models.ForeignKey(RoomType, on_delete=models.PROTECT)
 	capacity = models.PositiveIntegerField()
@@ -20,5 +29,216 @@ class Room(models.Model):
 	checkout_date = models.DateField()
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		constraints = [
+			models.CheckConstraint(
+				condition=models.Q(available_rooms__gte=0),
+				name="room_available_rooms_non_negative",
+			)
+		]
+		# Search and the hotel page only list rooms with something left to book.
+		indexes = [
+			models.Index(
+				fields=["hotel", "rate_per_night"],
+				condition=models.Q(available_rooms__gt=0),
+				name="room_open_hotel_rate_idx",
+			),
+			# Ends in the rowid, so a price-then-id listing walks it without sorting.
+			models.Index(
+				fields=["rate_per_night"],
+				condition=models.Q(available_rooms__gt=0),
+				name="room_open_rate_idx",
+			),
+		]
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		instance._saved_available_rooms = dict(zip(field_names, values)).get("available_rooms")
+		return instance
+
+	def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+		super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+		if fields is None or "available_rooms" in fields:
+			self._saved_available_rooms = self.available_rooms
+
+	def save(self, *args, **kwargs):
+		saved_available_rooms = None
+		if not self._state.adding:
+			saved_available_rooms = getattr(self, "_saved_available_rooms", None)
+			if saved_available_rooms is None:
+				saved_available_rooms = (
+					Room.objects.filter(pk=self.pk).values_list("available_rooms", flat=True).first()
+				)
+		super().save(*args, **kwargs)
+		update_fields = kwargs.get("update_fields")
+		if update_fields is None or self.INVENTORY_FIELDS.intersection(update_fields):
+			added_rooms = 0
+			if saved_available_rooms is not None:
+				added_rooms = self.available_rooms - saved_available_rooms
+			self.sync_nights(added_rooms=added_rooms)
+		self._saved_available_rooms = self.available_rooms
+		changed_nights = None
+		if update_fields is None or self.LISTING_FIELDS.intersection(update_fields):
+			changed_nights = self.night_dates(self.checkin_date, self.checkout_date)
+		invalidate_hotel_searches([self.hotel_id], changed_nights=changed_nights)
+
+	def delete(self, *args, **kwargs):
+		hotel_id = self.hotel_id
+		nights = self.night_dates(self.checkin_date, self.checkout_date)
+		deleted = super().delete(*args, **kwargs)
+		invalidate_hotel_searches([hotel_id], changed_nights=nights)
+		return deleted
+
+	@staticmethod
+	def night_dates(checkin_date, checkout_date) -> list[datetime.date]:
+		# A same-day stay still occupies its check-in night.
+		nights_count = max((checkout_date - checkin_date).days, 1)
+		return [checkin_date + datetime.timedelta(days=offset) for offset in range(nights_count)]
+
+	@classmethod
+	def refresh_available_rooms(cls, room_ids=None) -> int:
+		"""Set each stale room's headline count to its scarcest night in the ledger.
+
+		Reservations and releases call this for their rooms in the same
+		transaction; the room row is only written when its scarcest night
+		moved, so most buyers never queue on it. ``sweep_bookings`` runs it
+		over every room to catch up writes that bypassed the ledger helpers.
+		Returns how many rooms changed.
+		"""
+		scarcest_night = (
+			RoomNight.objects.filter(room_id=OuterRef("pk"))
+			.order_by()
+			.values("room_id")
+			.annotate(min_available=Min("available_rooms"))
+			.values("min_available")
+		)
+		scarcest_available = Coalesce(Subquery(scarcest_night), 0)
+		stale_rooms = cls.objects.annotate(scarcest_available=scarcest_available).exclude(
+			available_rooms=F("scarcest_available")
+		)
+		if room_ids is not None:
+			stale_rooms = stale_rooms.filter(id__in=room_ids)
+		stale = list(stale_rooms.values_list("id", "hotel_id", "available_rooms", "scarcest_available"))
+		if not stale:
+			return 0
+		cls.objects.filter(id__in=[room_id for room_id, *_ in stale]).update(available_rooms=scarcest_available)
+		# Undated searches filter on the headline being positive, so only a
+		# room opening or closing moves other hotels' rooms on those pages.
+		opened_or_closed = any((old > 0) != (new > 0) for *_, old, new in stale)
+		invalidate_hotel_searches(
+			{hotel_id for _, hotel_id, *_ in stale},
+			changed_nights=() if opened_or_closed else None,
+		)
+		return len(stale)
+
+	def sync_nights(self, *, added_rooms: int = 0):
+		"""Align the per-night ledger with the room's window and apply ``added_rooms`` to it.
+
+		A change in the headline count is applied to every night as a delta, so
+		each night keeps its booking deductions; a count of 0 closes every night.
+		Nights added to the window start with as many rooms as the most open
+		existing night.
+		"""
+		nights = self.night_dates(self.checkin_date, self.checkout_date)
+		with transaction.atomic():
+			ledger = self.nights.aggregate(
+				first_night=Min("night"),
+				last_night=Max("night"),
+				nights_count=Count("id"),
+				most_available=Max("available_rooms"),
+			)
+			window_unchanged = (
+				ledger["first_night"] == nights[0]
+				and ledger["last_night"] == nights[-1]
+				and ledger["nights_count"] == len(nights)
+			)
+			if window_unchanged and not added_rooms and self.available_rooms:
+				return
+
+			self.nights.exclude(night__range=(nights[0], nights[-1])).delete()
+			if not self.available_rooms:
+				self.nights.update(available_rooms=0)
+			elif added_rooms:
+				self.nights.update(available_rooms=Greatest(F("available_rooms") + added_rooms, 0))
+
+			if not self.available_rooms or ledger["most_available"] is None:
+				unbooked_rooms = self.available_rooms
+			else:
+				unbooked_rooms = max(ledger["most_available"] + added_rooms, 0)
+			existing_nights = set(self.nights.values_list("night", flat=True))
+			RoomNight.objects.bulk_create(
+				[
+					RoomNight(room=self, night=night, available_rooms=unbooked_rooms)
+					for night in nights
+					if night not in existing_nights
+				]
+			)
+
+	def available_rooms_for(self, checkin_date, checkout_date) -> int:
+		nights = self.night_dates(checkin_date, checkout_date)
+		stay = RoomNight.objects.filter(room_id=self.id, night__range=(nights[0], nights[-1])).aggregate(
+			nights_count=Count("id"),
+			min_available=Min("available_rooms"),
+		)
+		if stay["nights_count"] != len(nights):
+			return 0
+		return stay["min_available"] or 0
+
+	def reserve_nights(self, rooms_count: int, checkin_date, checkout_date) -> bool:
+		"""Take ``rooms_count`` rooms off every night of the stay.
+
+		The decrement is a single conditional UPDATE: only nights that still
+		have enough rooms match, and the stay is reserved when every night
+		matched. Otherwise the partial decrement is rolled back to a savepoint,
+		so no row lock is ever taken up front. The room's headline count is
+		then refreshed, which only writes the room row when the stay took
+		rooms off its scarcest night. Searches listing other hotels are only
+		dropped for nights that sold out.
+		"""
+		nights = self.night_dates(checkin_date, checkout_date)
+		with transaction.atomic():
+			reserved_nights = RoomNight.objects.filter(
+				room_id=self.id,
+				night__range=(nights[0], nights[-1]),
+				available_rooms__gte=rooms_count,
+			).update(available_rooms=F("available_rooms") - rooms_count)
+			if reserved_nights != len(nights):
+				transaction.set_rollback(True)
+				return False
+		sold_out_nights = RoomNight.objects.filter(
+			room_id=self.id,
+			night__range=(nights[0], nights[-1]),
+			available_rooms=0,
+		).values_list("night", flat=True)
+		invalidate_hotel_searches([self.hotel_id], changed_nights=list(sold_out_nights) or None)
+		Room.refresh_available_rooms([self.id])
+		return True
+
 	def __str__(self) -> str:
 		return f"{self.room_type} ({self.capacity} guests)"
+
+
+class RoomNight(models.Model):
+	room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="nights")
+	night = models.DateField()
+	available_rooms = models.PositiveIntegerField()
+
+	class Meta:
+		ordering = ("room", "night")
+		constraints = [
+			models.UniqueConstraint(
+				fields=["room", "night"],
+				name="unique_room_night",
+			),
+			models.CheckConstraint(
+				condition=models.Q(available_rooms__gte=0),
+				name="room_night_available_rooms_non_negative",
+			),
+		]
+		indexes = [
+			models.Index(fields=["night", "available_rooms"], name="room_night_availability_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.room} on {self.night}: {self.available_rooms} left"